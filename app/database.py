@@ -1,17 +1,121 @@
 """
 Database connection and session management.
+
+Both a synchronous engine (SessionLocal/get_db) and an asynchronous engine
+(AsyncSessionLocal/get_async_db) are configured from the same DATABASE_URL.
+The async engine swaps in asyncpg for PostgreSQL and aiosqlite for SQLite.
+
+Each uvicorn worker owns both engines, so with DB_MAX_CONNECTIONS set the
+connection budget is split evenly across WEB_CONCURRENCY workers and their
+engines. Pools are instrumented for /db/pool (see app.utils.pool_stats).
+
+SQLite only enforces foreign keys when asked to on each connection, so
+every SQLite engine turns them on; deleting a user then cascades to their
+calculations in the database, as it does on PostgreSQL.
 """
-from sqlalchemy import create_engine
+import math
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from app.config import settings
+from app.config import Settings, settings
+from app.utils.pool_stats import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+
+# Async driver per database backend
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """
+    Return url with the async driver for its database backend.
+    """
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {parsed.get_backend_name()}")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+# Sync and async engine in every worker process
+ENGINES_PER_WORKER = 2
+
+
+def pool_sizing(config: Settings) -> tuple:
+    """
+    Return (pool_size, max_overflow) for one engine.
+
+    Without DB_MAX_CONNECTIONS the configured values are used as-is. With it,
+    each engine gets an equal share of the budget, half kept open as the pool
+    and the rest allowed as overflow.
+    """
+    if not config.DB_MAX_CONNECTIONS:
+        return config.DB_POOL_SIZE, config.DB_MAX_OVERFLOW
+    per_engine = config.DB_MAX_CONNECTIONS // (config.WEB_CONCURRENCY * ENGINES_PER_WORKER)
+    if per_engine < 1:
+        raise ValueError(
+            f"DB_MAX_CONNECTIONS={config.DB_MAX_CONNECTIONS} is too small for "
+            f"{config.WEB_CONCURRENCY} workers with {ENGINES_PER_WORKER} engines each"
+        )
+    pool_size = math.ceil(per_engine / 2)
+    return pool_size, per_engine - pool_size
+
+
+def engine_options(url: str, config: Settings = settings, is_async: bool = False) -> dict:
+    """
+    Return pool keyword arguments for create_engine/create_async_engine.
+
+    SQLite keeps SQLAlchemy's default pool for its URL type.
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    pool_size, max_overflow = pool_sizing(config)
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+    }
+
+
+def enable_sqlite_foreign_keys(engine: Engine) -> None:
+    """
+    Run PRAGMA foreign_keys=ON on every new connection of a SQLite engine
+    (for an async engine pass its sync_engine); other backends are left alone.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _foreign_keys_on(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
 
 # Create database engine
-engine = create_engine(settings.DATABASE_URL)
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+enable_sqlite_foreign_keys(engine)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Create async database engine and session factory
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, is_async=True)
+)
+enable_sqlite_foreign_keys(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 # Base class for all models
 Base = declarative_base()
 
@@ -25,3 +129,18 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    Dependency function to get an async database session.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def init_db():
+    """
+    Create any tables that do not exist yet.
+    """
+    Base.metadata.create_all(bind=engine)
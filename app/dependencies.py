@@ -0,0 +1,56 @@
+"""
+Shared FastAPI dependencies.
+"""
+import uuid
+from typing import Optional
+
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.models.user import User
+from app.utils.tokens import InvalidTokenError, decode_access_token, token_cache
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(status_code=401, detail=detail, headers={"WWW-Authenticate": "Bearer"})
+
+
+async def current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    """
+    Resolve the bearer token to its User.
+
+    Cached tokens skip both signature verification and the users lookup; the
+    returned User is detached, so only its loaded columns may be used.
+    """
+    if credentials is None:
+        raise _unauthorized("Not authenticated")
+    token = credentials.credentials
+
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached[1]
+
+    try:
+        claims = decode_access_token(token)
+    except InvalidTokenError:
+        raise _unauthorized("Invalid or expired token")
+    user = await db.get(User, claims["sub"])
+    if user is None:
+        raise _unauthorized("User no longer exists")
+    db.expunge(user)
+    token_cache.put(token, claims, user)
+    return user
+
+
+async def authorized_user_id(user_id: uuid.UUID, user: User = Depends(current_user)) -> uuid.UUID:
+    """The {user_id} path parameter, if it names the authenticated user"""
+    if user_id != user.id:
+        raise HTTPException(status_code=403, detail="Not allowed to access another user's calculations")
+    return user_id
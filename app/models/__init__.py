@@ -9,8 +9,11 @@ from app.models.calculation import (
     Addition,
     Subtraction,
     Multiplication,
-    Division
+    Division,
+    Expression
 )
+from app.models.calculation_stats import CalculationStat
+from app.models.calculation_dependency import CalculationDependency
 
 __all__ = [
     "User",
@@ -18,5 +21,8 @@ __all__ = [
     "Addition",
     "Subtraction",
     "Multiplication",
-    "Division"
+    "Division",
+    "Expression",
+    "CalculationStat",
+    "CalculationDependency"
 ]
\ No newline at end of file
@@ -6,10 +6,13 @@ Date: October 18, 2025
 from datetime import datetime
 import uuid
 from typing import List
-from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Float
+from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Float, Index, event, inspect
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship, declared_attr
 from app.database import Base
+from app.operations.expression import compile_expression
+from app.operations.vectorized import sum_inputs, subtract_inputs, multiply_inputs, divide_inputs
+from app.utils.cache import result_cache
 
 
 class AbstractCalculation:
@@ -37,6 +40,7 @@ class AbstractCalculation:
 
     @declared_attr
     def result(cls):
+        # Filled in by the before_insert/before_update listeners below
         return Column(Float, nullable=True)
 
     @declared_attr
@@ -54,13 +58,7 @@ class AbstractCalculation:
     @classmethod
     def create(cls, calculation_type: str, user_id: uuid.UUID, inputs: List[float]):
         """Factory method to create calculations"""
-        calculation_classes = {
-            'addition': Addition,
-            'subtraction': Subtraction,
-            'multiplication': Multiplication,
-            'division': Division,
-        }
-        calculation_class = calculation_classes.get(calculation_type.lower())
+        calculation_class = CALCULATION_CLASSES.get(calculation_type.lower())
         if not calculation_class:
             raise ValueError(f"Unsupported calculation type: {calculation_type}")
         return calculation_class(user_id=user_id, inputs=inputs)
@@ -69,12 +67,25 @@ class AbstractCalculation:
         """Compute calculation result"""
         raise NotImplementedError("Subclasses must implement get_result()")
 
+    def _checked_inputs(self) -> List[float]:
+        """Return inputs after checking they are a list of at least two numbers"""
+        if not isinstance(self.inputs, list):
+            raise ValueError("Inputs must be a list of numbers")
+        if len(self.inputs) < 2:
+            raise ValueError(f"{type(self).__name__} requires at least two numbers")
+        return self.inputs
+
     def __repr__(self):
         return f"<Calculation(type={self.type}, inputs={self.inputs})>"
 
 
 class Calculation(Base, AbstractCalculation):
     """Base calculation model with polymorphic mapping"""
+    __table_args__ = (
+        # Keyset pagination over a user's history, newest first, optionally by type
+        Index("ix_calculations_user_created_id", "user_id", "created_at", "id"),
+        Index("ix_calculations_user_type_created_id", "user_id", "type", "created_at", "id"),
+    )
     __mapper_args__ = {
         "polymorphic_on": "type",
         "polymorphic_identity": "calculation",
@@ -86,11 +97,7 @@ class Addition(Calculation):
     __mapper_args__ = {"polymorphic_identity": "addition"}
 
     def get_result(self) -> float:
-        if not isinstance(self.inputs, list):
-            raise ValueError("Inputs must be a list of numbers")
-        if len(self.inputs) < 2:
-            raise ValueError("Addition requires at least two numbers")
-        return float(sum(self.inputs))
+        return result_cache.get_or_compute(self.type, self._checked_inputs(), sum_inputs)
 
 
 class Subtraction(Calculation):
@@ -98,14 +105,7 @@ class Subtraction(Calculation):
     __mapper_args__ = {"polymorphic_identity": "subtraction"}
 
     def get_result(self) -> float:
-        if not isinstance(self.inputs, list):
-            raise ValueError("Inputs must be a list of numbers")
-        if len(self.inputs) < 2:
-            raise ValueError("Subtraction requires at least two numbers")
-        result = float(self.inputs[0])
-        for value in self.inputs[1:]:
-            result -= value
-        return result
+        return result_cache.get_or_compute(self.type, self._checked_inputs(), subtract_inputs)
 
 
 class Multiplication(Calculation):
@@ -113,14 +113,7 @@ class Multiplication(Calculation):
     __mapper_args__ = {"polymorphic_identity": "multiplication"}
 
     def get_result(self) -> float:
-        if not isinstance(self.inputs, list):
-            raise ValueError("Inputs must be a list of numbers")
-        if len(self.inputs) < 2:
-            raise ValueError("Multiplication requires at least two numbers")
-        result = 1.0
-        for value in self.inputs:
-            result *= value
-        return result
+        return result_cache.get_or_compute(self.type, self._checked_inputs(), multiply_inputs)
 
 
 class Division(Calculation):
@@ -128,13 +121,38 @@ class Division(Calculation):
     __mapper_args__ = {"polymorphic_identity": "division"}
 
     def get_result(self) -> float:
-        if not isinstance(self.inputs, list):
-            raise ValueError("Inputs must be a list of numbers")
-        if len(self.inputs) < 2:
-            raise ValueError("Division requires at least two numbers")
-        result = float(self.inputs[0])
-        for value in self.inputs[1:]:
-            if value == 0:
-                raise ValueError("Cannot divide by zero")
-            result /= value
-        return result
+        return result_cache.get_or_compute(self.type, self._checked_inputs(), divide_inputs)
+
+
+class Expression(Calculation):
+    """Formula over named variables; inputs are {"expression": ..., "variables": {...}}"""
+    __mapper_args__ = {"polymorphic_identity": "expression"}
+
+    def get_result(self) -> float:
+        inputs = self.inputs
+        if not isinstance(inputs, dict) or not isinstance(inputs.get("expression"), str):
+            raise ValueError("Expression inputs must be an object with expression and variables")
+        return compile_expression(inputs["expression"]).evaluate(inputs.get("variables", {}))
+
+
+# Calculation type -> model class, used by Calculation.create and app.operations.registry
+CALCULATION_CLASSES = {
+    'addition': Addition,
+    'subtraction': Subtraction,
+    'multiplication': Multiplication,
+    'division': Division,
+    'expression': Expression,
+}
+
+
+@event.listens_for(Calculation, "before_insert", propagate=True)
+def compute_result_on_insert(mapper, connection, target):
+    """Store the result when a calculation row is inserted"""
+    target.result = target.get_result()
+
+
+@event.listens_for(Calculation, "before_update", propagate=True)
+def recompute_result_on_update(mapper, connection, target):
+    """Recompute the stored result when inputs were reassigned"""
+    if inspect(target).attrs.inputs.history.has_changes():
+        target.result = target.get_result()
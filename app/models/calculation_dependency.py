@@ -0,0 +1,27 @@
+"""
+Dependency edges between calculations.
+
+An expression calculation can bind variables to other calculations'
+results. Each binding is stored twice: in the calculation's inputs
+(references, with the current value copied into variables, so the result
+can always be computed from the row alone), and as a row here, so a
+calculation's dependents can be found with an index lookup instead of
+scanning inputs. app.services.dependencies keeps the two in step.
+"""
+from sqlalchemy import Column, ForeignKey, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.database import Base
+from app.operations.expression import MAX_EXPRESSION_LENGTH
+
+
+class CalculationDependency(Base):
+    """Edge from a calculation to a calculation whose result one of its variables uses"""
+    __tablename__ = "calculation_dependencies"
+
+    dependent_id = Column(UUID(as_uuid=True), ForeignKey('calculations.id', ondelete='CASCADE'), primary_key=True)
+    variable = Column(String(MAX_EXPRESSION_LENGTH), primary_key=True)
+    dependency_id = Column(UUID(as_uuid=True), ForeignKey('calculations.id'), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<CalculationDependency({self.variable} -> {self.dependency_id})>"
@@ -0,0 +1,250 @@
+"""
+Rollup of calculation aggregates per (user_id, type, day).
+
+The calculation_stats table is kept current by Session flush events, so any
+ORM write to calculations (sync or async session) updates it in the same
+transaction:
+
+- Inserted calculations are added with one upsert per bucket that
+  increments the counts and sum and widens min, max and last_activity.
+  count includes rows without a result; result_count does not, and is the
+  divisor for averages (as AVG(result) would skip NULLs). sum_result stays
+  NULL while result_count is 0, as SUM(result) would.
+- Updated or deleted calculations can shrink min/max, so their buckets are
+  recomputed from the live rows. That query is a range scan on the
+  (user_id, type, created_at, id) index covering a single day; the result
+  is written with the same kind of upsert (or the row deleted when the
+  bucket is empty), so concurrent writers never race to INSERT one bucket.
+
+Writes that bypass the ORM (Core inserts/updates) must report their rows
+through record_inserted_rows or recompute_buckets; app.services.ingest and
+app.services.consistency do. app.services.rollup rebuilds and verifies the
+table from scratch.
+"""
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import (
+    Column, Date, DateTime, Float, ForeignKey, Integer, String,
+    case, event, func, inspect, or_, select,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models.calculation import Calculation
+
+BucketKey = Tuple  # (user_id, type, day)
+
+# Session.info key used to carry state from before_flush to after_flush
+_STALE_BUCKETS = "calculation_stats_stale_buckets"
+
+# Calculation attributes that determine its bucket
+_BUCKET_ATTRIBUTES = ("user_id", "type", "created_at")
+
+# Columns a recompute overwrites
+_AGGREGATE_COLUMNS = ("count", "result_count", "sum_result", "min_result", "max_result", "last_activity")
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE
+_UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+class CalculationStat(Base):
+    """Aggregates of one user's calculations of one type on one day"""
+    __tablename__ = "calculation_stats"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    type = Column(String(50), primary_key=True)
+    day = Column(Date, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    result_count = Column(Integer, nullable=False, default=0)
+    sum_result = Column(Float, nullable=True)
+    min_result = Column(Float, nullable=True)
+    max_result = Column(Float, nullable=True)
+    last_activity = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<CalculationStat(type={self.type}, day={self.day}, count={self.count})>"
+
+
+@dataclass
+class BucketIncrement:
+    """Aggregates of rows added to one bucket"""
+    count: int = 0
+    result_count: int = 0
+    sum_result: Optional[float] = None
+    min_result: Optional[float] = None
+    max_result: Optional[float] = None
+    last_activity: Optional[datetime] = None
+
+    def add(self, result: Optional[float], created_at: datetime) -> None:
+        self.count += 1
+        if result is not None:
+            self.result_count += 1
+            self.sum_result = (self.sum_result or 0.0) + result
+            self.min_result = result if self.min_result is None else min(self.min_result, result)
+            self.max_result = result if self.max_result is None else max(self.max_result, result)
+        self.last_activity = created_at if self.last_activity is None else max(self.last_activity, created_at)
+
+
+def bucket_key(user_id, calculation_type: str, created_at: datetime) -> BucketKey:
+    """Return the rollup bucket a calculation belongs to"""
+    return (user_id, calculation_type, created_at.date())
+
+
+def record_inserted_rows(connection: Connection, rows: Iterable[dict]) -> None:
+    """Add newly inserted calculation rows (column dicts) to the rollup"""
+    increments: Dict[BucketKey, BucketIncrement] = {}
+    for row in rows:
+        key = bucket_key(row["user_id"], row["type"], row["created_at"])
+        increments.setdefault(key, BucketIncrement()).add(row["result"], row["created_at"])
+    apply_increments(connection, increments)
+
+
+def apply_increments(connection: Connection, increments: Dict[BucketKey, BucketIncrement]) -> None:
+    """Merge increments into their buckets with one upsert statement"""
+    if not increments:
+        return
+    make_insert = _UPSERT_INSERTS.get(connection.dialect.name)
+    if make_insert is None:
+        recompute_buckets(connection, increments)
+        return
+
+    table = CalculationStat.__table__
+    statement = make_insert(table)
+    new = statement.excluded
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.type, table.c.day],
+        set_={
+            "count": table.c.count + new.count,
+            "result_count": table.c.result_count + new.result_count,
+            # NULL + x is NULL, so this falls back to whichever side has a sum
+            "sum_result": func.coalesce(table.c.sum_result + new.sum_result, table.c.sum_result, new.sum_result),
+            "min_result": case(
+                (or_(table.c.min_result.is_(None), new.min_result < table.c.min_result), new.min_result),
+                else_=table.c.min_result,
+            ),
+            "max_result": case(
+                (or_(table.c.max_result.is_(None), new.max_result > table.c.max_result), new.max_result),
+                else_=table.c.max_result,
+            ),
+            "last_activity": case(
+                (or_(table.c.last_activity.is_(None), new.last_activity > table.c.last_activity), new.last_activity),
+                else_=table.c.last_activity,
+            ),
+        },
+    )
+    connection.execute(statement, [
+        {
+            "user_id": user_id, "type": calculation_type, "day": day,
+            "count": increment.count, "result_count": increment.result_count,
+            "sum_result": increment.sum_result,
+            "min_result": increment.min_result, "max_result": increment.max_result,
+            "last_activity": increment.last_activity,
+        }
+        for (user_id, calculation_type, day), increment in increments.items()
+    ])
+
+
+def recompute_buckets(connection: Connection, keys: Iterable[BucketKey]) -> None:
+    """Replace each bucket with an aggregate of its live calculation rows"""
+    calculations = Calculation.__table__
+    table = CalculationStat.__table__
+    for user_id, calculation_type, day in set(keys):
+        start = datetime.combine(day, time.min)
+        live = connection.execute(
+            select(
+                func.count().label("count"),
+                func.count(calculations.c.result).label("result_count"),
+                func.sum(calculations.c.result).label("sum_result"),
+                func.min(calculations.c.result).label("min_result"),
+                func.max(calculations.c.result).label("max_result"),
+                func.max(calculations.c.created_at).label("last_activity"),
+            )
+            .where(calculations.c.user_id == user_id)
+            .where(calculations.c.type == calculation_type)
+            .where(calculations.c.created_at >= start)
+            .where(calculations.c.created_at < start + timedelta(days=1))
+        ).one()
+        values = {"user_id": user_id, "type": calculation_type, "day": day, **live._mapping}
+        make_insert = _UPSERT_INSERTS.get(connection.dialect.name)
+        if live.count and make_insert is not None:
+            # Upsert, so concurrent transactions recomputing the same new
+            # bucket do not both INSERT it and fail on the primary key
+            statement = make_insert(table).values(**values)
+            connection.execute(statement.on_conflict_do_update(
+                index_elements=[table.c.user_id, table.c.type, table.c.day],
+                set_={name: statement.excluded[name] for name in _AGGREGATE_COLUMNS},
+            ))
+            continue
+        connection.execute(
+            table.delete()
+            .where(table.c.user_id == user_id)
+            .where(table.c.type == calculation_type)
+            .where(table.c.day == day)
+        )
+        if live.count:
+            connection.execute(table.insert().values(**values))
+
+
+def _stored_bucket_keys(session: Session, calculations) -> Set[BucketKey]:
+    """Buckets the given calculations occupy in the database, before this flush"""
+    ids = [obj.id for obj in calculations]
+    if not ids:
+        return set()
+    table = Calculation.__table__
+    rows = session.connection().execute(
+        select(table.c.user_id, table.c.type, table.c.created_at).where(table.c.id.in_(ids))
+    )
+    return {bucket_key(*row) for row in rows}
+
+
+@event.listens_for(Session, "before_flush")
+def collect_stale_buckets(session, flush_context, instances):
+    """
+    Note buckets that lose rows in this flush while the old rows still exist.
+
+    Attribute history does not hold the previous value of an expired
+    attribute that was reassigned, so moved calculations (new user_id, type
+    or created_at) have their current bucket read from the database.
+    """
+    stale = {
+        bucket_key(obj.user_id, obj.type, obj.created_at)
+        for obj in session.deleted
+        if isinstance(obj, Calculation)
+    }
+    moved = [
+        obj for obj in session.dirty
+        if isinstance(obj, Calculation) and any(
+            inspect(obj).attrs[name].history.has_changes() for name in _BUCKET_ATTRIBUTES
+        )
+    ]
+    stale |= _stored_bucket_keys(session, moved)
+    session.info[_STALE_BUCKETS] = stale
+
+
+@event.listens_for(Session, "after_flush")
+def update_rollup(session, flush_context):
+    """Apply this flush's calculation changes to calculation_stats"""
+    recompute: Set[BucketKey] = session.info.pop(_STALE_BUCKETS, set())
+    for obj in session.dirty:
+        if isinstance(obj, Calculation) and session.is_modified(obj):
+            recompute.add(bucket_key(obj.user_id, obj.type, obj.created_at))
+
+    increments: Dict[BucketKey, BucketIncrement] = {}
+    for obj in session.new:
+        if isinstance(obj, Calculation):
+            key = bucket_key(obj.user_id, obj.type, obj.created_at)
+            if key not in recompute:
+                increments.setdefault(key, BucketIncrement()).add(obj.result, obj.created_at)
+
+    if increments or recompute:
+        connection = session.connection()
+        apply_increments(connection, increments)
+        recompute_buckets(connection, recompute)
@@ -9,7 +9,13 @@ from sqlalchemy import Column, String, DateTime
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.database import Base
-import bcrypt
+from app.utils.security import (
+    hash_password,
+    hash_password_async,
+    password_hasher,
+    verify_password,
+    verify_password_async,
+)
 
 
 class User(Base):
@@ -23,19 +29,35 @@ class User(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
     # Relationship to calculations - NEW for Assignment 11
-    calculations = relationship("Calculation", back_populates="user", cascade="all, delete-orphan")
+    # Write-only: a user's history is never loaded whole; page through it with
+    # GET /users/{id}/calculations. Deletes cascade in the database.
+    calculations = relationship(
+        "Calculation",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        lazy="write_only",
+        passive_deletes=True,
+    )
     
     def set_password(self, password: str) -> None:
         """Hash and set password using bcrypt"""
-        salt = bcrypt.gensalt()
-        self.password_hash = bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+        self.password_hash = hash_password(password)
     
     def verify_password(self, password: str) -> bool:
         """Verify password against hash"""
-        return bcrypt.checkpw(
-            password.encode('utf-8'),
-            self.password_hash.encode('utf-8')
-        )
+        return verify_password(password, self.password_hash)
     
+    async def set_password_async(self, password: str) -> None:
+        """Hash and set password without blocking the event loop"""
+        self.password_hash = await hash_password_async(password)
+
+    async def verify_password_async(self, password: str) -> bool:
+        """Verify password without blocking the event loop"""
+        return await verify_password_async(password, self.password_hash)
+
+    def password_needs_rehash(self) -> bool:
+        """True when the stored hash uses a lower bcrypt cost than the current one"""
+        return password_hasher.needs_rehash(self.password_hash)
+
     def __repr__(self):
         return f"<User(username='{self.username}', email='{self.email}')>"
\ No newline at end of file
@@ -0,0 +1,287 @@
+"""
+Module: expression.py
+
+Arithmetic formulas over named variables, such as "(a + b) * c / d".
+
+Parsing:
+Formulas are tokenized and parsed by a small recursive-descent parser; no
+Python eval or compile is involved, so a formula can only ever do
+arithmetic. The grammar is numbers, variable names, parentheses, unary + and
+-, and the binary operators + - * / with the usual precedence, evaluated
+left to right. Formula length and parenthesis nesting are bounded.
+
+Compiling:
+The parse tree is compiled once into nested closures. Runs of + and - (or *
+and /) at one level become a single node evaluated in a loop, so long flat
+formulas do not nest deeply. compile_expression keeps compiled formulas in
+an LRU cache keyed by the source text, so evaluating a formula again, with
+any variable values, skips parsing.
+
+Evaluation:
+CompiledExpression.evaluate computes one result from a mapping of variable
+values and raises ValueError on division by zero, like divide.
+evaluate_columns computes one result per row from columns of values in a
+single NumPy pass when NumPy is installed; rows that divide by zero are
+reported in an error mask instead of failing, as in evaluate_batch.
+"""
+
+import operator
+import re
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, List, Mapping, Sequence, Tuple
+
+from app.config import settings
+from app.operations.vectorized import BatchResult
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+MAX_EXPRESSION_LENGTH = 1000
+MAX_NESTING = 50
+
+_TOKEN = re.compile(
+    r"\s*(?:"
+    r"(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)"
+    r"|(?P<name>[A-Za-z_][A-Za-z0-9_]*)"
+    r"|(?P<symbol>[-+*/()])"
+    r")"
+)
+
+# Division is passed in at evaluation time: it raises for scalars and
+# records an error mask for columns
+_OPERATORS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+}
+
+# A compiled node: (variable values, division function) -> value
+Node = Callable[[Mapping[str, object], Callable], object]
+
+
+class ExpressionError(ValueError):
+    """The formula is malformed or cannot be evaluated with the given variables"""
+
+
+def _tokenize(source: str) -> List[Tuple[str, str]]:
+    tokens = []
+    position = 0
+    source = source.rstrip()
+    while position < len(source):
+        match = _TOKEN.match(source, position)
+        if match is None or match.end() == position:
+            character = source[position:].lstrip()[:1]
+            raise ExpressionError(f"Unexpected character {character!r} in expression")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser producing compiled nodes"""
+
+    def __init__(self, source: str):
+        self.tokens = _tokenize(source)
+        self.position = 0
+        self.depth = 0
+        self.variables: Dict[str, None] = {}  # insertion-ordered set
+
+    def parse(self) -> Node:
+        if not self.tokens:
+            raise ExpressionError("Expression is empty")
+        node = self._sum()
+        if self.position < len(self.tokens):
+            raise ExpressionError(f"Unexpected {self.tokens[self.position][1]!r} in expression")
+        return node
+
+    def _peek(self) -> str:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position][1]
+        return ""
+
+    def _chain(self, operators: str, operand: Callable[[], Node]) -> Node:
+        """Parse operand (op operand)* for the given operators into one node"""
+        first = operand()
+        rest = []
+        while (symbol := self._peek()) and symbol in operators:
+            self.position += 1
+            rest.append((_OPERATORS.get(symbol), operand()))
+        if not rest:
+            return first
+
+        def chain(values, divide):
+            result = first(values, divide)
+            for apply, node in rest:
+                result = (apply or divide)(result, node(values, divide))
+            return result
+        return chain
+
+    def _sum(self) -> Node:
+        return self._chain("+-", self._product)
+
+    def _product(self) -> Node:
+        return self._chain("*/", self._unary)
+
+    def _unary(self) -> Node:
+        symbol = self._peek()
+        if symbol in ("+", "-"):
+            self.position += 1
+            with self._nested():
+                operand = self._unary()
+            if symbol == "+":
+                return operand
+            return lambda values, divide: -operand(values, divide)
+        return self._atom()
+
+    def _atom(self) -> Node:
+        if self.position >= len(self.tokens):
+            raise ExpressionError("Expression ends unexpectedly")
+        kind, text = self.tokens[self.position]
+        self.position += 1
+        if kind == "number":
+            value = float(text)
+            return lambda values, divide: value
+        if kind == "name":
+            self.variables[text] = None
+            return lambda values, divide: values[text]
+        if text == "(":
+            with self._nested():
+                node = self._sum()
+            if self._peek() != ")":
+                raise ExpressionError("Missing closing parenthesis")
+            self.position += 1
+            return node
+        raise ExpressionError(f"Unexpected {text!r} in expression")
+
+    @contextmanager
+    def _nested(self):
+        self.depth += 1
+        if self.depth > MAX_NESTING:
+            raise ExpressionError(f"Expression nests deeper than {MAX_NESTING} levels")
+        try:
+            yield
+        finally:
+            self.depth -= 1
+
+
+def _divide_scalar(a: float, b: float) -> float:
+    if b == 0:
+        raise ValueError("Cannot divide by zero")
+    return a / b
+
+
+@dataclass(frozen=True)
+class CompiledExpression:
+    """A parsed formula, reusable across any number of evaluations"""
+    source: str
+    variables: Tuple[str, ...]
+    _evaluate: Node
+
+    def evaluate(self, values: Mapping[str, float]) -> float:
+        """
+        Evaluate the formula with one value per variable.
+
+        Raises:
+        - ExpressionError: If a variable has no value.
+        - ValueError: If the formula divides by zero.
+
+        Example:
+        >>> compile_expression("(a + b) * c / d").evaluate({"a": 1, "b": 2, "c": 4, "d": 3})
+        4.0
+        """
+        self._check_variables(values)
+        return float(self._evaluate(values, _divide_scalar))
+
+    def evaluate_columns(self, columns: Mapping[str, Sequence[float]]) -> BatchResult:
+        """
+        Evaluate the formula once per row of equally long variable columns.
+        A formula without variables evaluates as a single row.
+
+        Returns:
+        - tuple: (results, error_mask). results[i] is None when row i divides by zero.
+
+        Raises:
+        - ExpressionError: If a variable has no column or the columns differ in length.
+
+        Example:
+        >>> compile_expression("a / b").evaluate_columns({"a": [1, 4], "b": [2, 0]})
+        ([0.5, None], [False, True])
+        """
+        self._check_variables(columns)
+        lengths = {len(columns[name]) for name in self.variables}
+        if len(lengths) > 1:
+            raise ExpressionError("Variable columns must have the same length")
+        rows = lengths.pop() if lengths else 1
+
+        if np is None:
+            return self._evaluate_columns_python(columns, rows)
+        return self._evaluate_columns_numpy(columns, rows)
+
+    def _evaluate_columns_numpy(self, columns: Mapping[str, Sequence[float]], rows: int) -> BatchResult:
+        """Evaluate every row at once; division records zero divisors in a mask."""
+        values = {name: np.asarray(columns[name], dtype=np.float64) for name in self.variables}
+        error_mask = np.zeros(rows, dtype=bool)
+
+        def divide(a, b):
+            zero = np.equal(b, 0)
+            error_mask[...] |= zero
+            return np.divide(a, np.where(zero, 1.0, b))
+
+        with np.errstate(over="ignore", invalid="ignore"):
+            out = np.broadcast_to(np.asarray(self._evaluate(values, divide), dtype=np.float64), (rows,))
+
+        results = out.tolist()
+        for index in np.flatnonzero(error_mask).tolist():
+            results[index] = None
+        return results, error_mask.tolist()
+
+    def _evaluate_columns_python(self, columns: Mapping[str, Sequence[float]], rows: int) -> BatchResult:
+        """Evaluate row by row with the scalar evaluator."""
+        results, error_mask = [], []
+        for row in range(rows):
+            try:
+                results.append(self.evaluate({name: float(columns[name][row]) for name in self.variables}))
+                error_mask.append(False)
+            except ValueError:
+                results.append(None)
+                error_mask.append(True)
+        return results, error_mask
+
+    def missing_variables(self, values: Mapping[str, object]) -> List[str]:
+        """Return the variables that have no entry in values"""
+        return [name for name in self.variables if name not in values]
+
+    def _check_variables(self, values: Mapping[str, object]) -> None:
+        missing = self.missing_variables(values)
+        if missing:
+            raise ExpressionError(f"No value for variable(s): {', '.join(missing)}")
+
+
+@lru_cache(maxsize=settings.EXPRESSION_CACHE_SIZE)
+def compile_expression(source: str) -> CompiledExpression:
+    """
+    Parse and compile a formula, reusing the compiled form for repeated sources.
+
+    Raises:
+    - ExpressionError: If the formula is too long or malformed.
+
+    Example:
+    >>> compile_expression("x * (y - 1)").variables
+    ('x', 'y')
+    """
+    if len(source) > MAX_EXPRESSION_LENGTH:
+        raise ExpressionError(f"Expression is longer than {MAX_EXPRESSION_LENGTH} characters")
+    parser = _Parser(source)
+    node = parser.parse()
+    return CompiledExpression(source, tuple(parser.variables), node)
+
+
+def expression_cache_stats() -> dict:
+    """Hit, miss and size counters of the compiled expression cache"""
+    info = compile_expression.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
@@ -0,0 +1,67 @@
+"""
+Module: registry.py
+
+Table of the calculator's operations.
+
+Each operation is registered once, under its route name, with everything the
+app needs to dispatch it:
+
+- function: the scalar function from app.operations (add, subtract, ...)
+- calculation_type: the ArithmeticType literal and polymorphic identity
+- model: the Calculation subclass that stores it
+- compute: applies function to an (a, b) pair, the shape the result cache
+  passes, so routes need no per-request lambda
+
+Lookups are plain dict accesses. The registry is checked at import against
+the ArithmeticType literal and CALCULATION_CLASSES so the three cannot
+drift apart. The expression type has no (a, b) operation and is not
+registered; CalculationType and CALCULATION_CLASSES must still agree on it.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Literal, Sequence, Type, get_args
+
+from app.models.calculation import CALCULATION_CLASSES, Calculation
+from app.operations import Number, add, subtract, multiply, divide
+from app.schemas.calculation import ArithmeticType, CalculationType
+
+
+@dataclass(frozen=True)
+class Operation:
+    """One registered operation"""
+    name: str
+    function: Callable[[Number, Number], Number]
+    calculation_type: str
+    model: Type[Calculation]
+
+    def compute(self, pair: Sequence[float]) -> float:
+        """Apply the operation to an (a, b) pair"""
+        return self.function(pair[0], pair[1])
+
+
+def _register(*operations: Operation) -> Dict[str, Operation]:
+    registry = {operation.name: operation for operation in operations}
+    types = {operation.calculation_type for operation in operations}
+    if types != set(get_args(ArithmeticType)):
+        raise RuntimeError("Operation registry does not match ArithmeticType")
+    if set(get_args(CalculationType)) != set(CALCULATION_CLASSES):
+        raise RuntimeError("CalculationType does not match CALCULATION_CLASSES")
+    for operation in operations:
+        if CALCULATION_CLASSES[operation.calculation_type] is not operation.model:
+            raise RuntimeError(f"{operation.name} is registered with the wrong model")
+    return registry
+
+
+OPERATIONS: Dict[str, Operation] = _register(
+    Operation("add", add, "addition", CALCULATION_CLASSES["addition"]),
+    Operation("subtract", subtract, "subtraction", CALCULATION_CLASSES["subtraction"]),
+    Operation("multiply", multiply, "multiplication", CALCULATION_CLASSES["multiplication"]),
+    Operation("divide", divide, "division", CALCULATION_CLASSES["division"]),
+)
+
+# Route names as a Literal, for validating path parameters
+OperationName = Literal[tuple(OPERATIONS)]
+
+OPERATIONS_BY_TYPE: Dict[str, Operation] = {
+    operation.calculation_type: operation for operation in OPERATIONS.values()
+}
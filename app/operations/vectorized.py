@@ -0,0 +1,189 @@
+"""
+Module: vectorized.py
+
+Vectorized evaluation of the arithmetic operations in app.operations.
+
+Batches:
+A batch is three parallel columns: operation names (as registered in
+app.operations.registry), left operands and right operands. Each row is
+evaluated exactly like the matching scalar function (add, subtract, multiply,
+divide), but the whole batch is processed in one NumPy pass instead of one
+Python call per row. Rows that would raise in the scalar functions (division
+by zero) are reported in an error mask instead of failing the batch.
+
+Folds:
+sum_inputs, subtract_inputs, multiply_inputs and divide_inputs reduce a whole
+list of inputs left-to-right, as the Calculation models do, without a Python
+loop per value. Addition and subtraction use compensated summation
+(math.fsum), so the result is correctly rounded regardless of input length.
+Multiplication and division use math.prod for lists and NumPy ufunc
+reductions for arrays. Converting a list to an array costs about as much as
+looping over it, so arrays are only used when the caller already has one.
+
+NumPy is used when it is installed; otherwise pure-Python code paths produce
+the same results.
+"""
+
+import math
+import operator
+import sys
+from functools import reduce
+from itertools import chain, islice
+from typing import List, Mapping, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+BatchResult = Tuple[List[Optional[float]], List[bool]]
+
+
+def evaluate_batch(ops: Sequence[str], a: Sequence[float], b: Sequence[float]) -> BatchResult:
+    """
+    Evaluate a batch of binary operations.
+
+    Parameters:
+    - ops (sequence of str): Operation name per row ('add', 'subtract', 'multiply', 'divide').
+    - a (sequence of float): Left operand per row.
+    - b (sequence of float): Right operand per row.
+
+    Returns:
+    - tuple: (results, error_mask). results[i] is None when error_mask[i] is True.
+
+    Raises:
+    - ValueError: If the columns differ in length or an operation name is unknown.
+
+    Example:
+    >>> evaluate_batch(["add", "divide"], [1, 4], [2, 0])
+    ([3.0, None], [False, True])
+    """
+    # Imported here: the registry imports the Calculation models, which import this module
+    from app.operations.registry import OPERATIONS
+
+    if not (len(ops) == len(a) == len(b)):
+        raise ValueError("ops, a and b must have the same length")
+    unknown = set(ops).difference(OPERATIONS)
+    if unknown:
+        raise ValueError(f"Unsupported operation(s): {', '.join(sorted(unknown))}")
+
+    if np is None:
+        return _evaluate_batch_python(ops, a, b, OPERATIONS)
+    return _evaluate_batch_numpy(ops, a, b, OPERATIONS)
+
+
+def _evaluate_batch_numpy(
+    ops: Sequence[str], a: Sequence[float], b: Sequence[float], operations: Mapping
+) -> BatchResult:
+    """Evaluate a batch with one masked ufunc call per operation."""
+    op_codes = {name: code for code, name in enumerate(operations)}
+    codes = np.fromiter((op_codes[op] for op in ops), dtype=np.int8, count=len(ops))
+    left = np.asarray(a, dtype=np.float64)
+    right = np.asarray(b, dtype=np.float64)
+    out = np.zeros(len(codes), dtype=np.float64)
+
+    error_mask = (codes == op_codes["divide"]) & (right == 0)
+
+    with np.errstate(over="ignore", invalid="ignore"):
+        np.add(left, right, out=out, where=codes == op_codes["add"])
+        np.subtract(left, right, out=out, where=codes == op_codes["subtract"])
+        np.multiply(left, right, out=out, where=codes == op_codes["multiply"])
+        np.divide(left, right, out=out, where=(codes == op_codes["divide"]) & ~error_mask)
+
+    results = out.tolist()
+    for index in np.flatnonzero(error_mask).tolist():
+        results[index] = None
+    return results, error_mask.tolist()
+
+
+def _evaluate_batch_python(
+    ops: Sequence[str], a: Sequence[float], b: Sequence[float], operations: Mapping
+) -> BatchResult:
+    """Evaluate a batch row by row with the scalar functions."""
+    results: List[Optional[float]] = []
+    error_mask: List[bool] = []
+    for op, left, right in zip(ops, a, b):
+        try:
+            results.append(float(operations[op].function(left, right)))
+            error_mask.append(False)
+        except ValueError:
+            results.append(None)
+            error_mask.append(True)
+    return results, error_mask
+
+
+def sum_inputs(values: Sequence[float]) -> float:
+    """
+    Return the correctly rounded sum of values.
+
+    Example:
+    >>> sum_inputs([0.1] * 10)
+    1.0
+    """
+    return math.fsum(_as_list(values))
+
+
+def subtract_inputs(values: Sequence[float]) -> float:
+    """
+    Return values[0] - values[1] - ... - values[-1], correctly rounded.
+
+    Computed as -(-values[0] + values[1] + ...), which is exact up to the
+    single rounding done by math.fsum because negation never rounds.
+
+    Example:
+    >>> subtract_inputs([1.0, 0.1, 0.2])
+    0.7
+    """
+    values = _as_list(values)
+    return -math.fsum(chain((-values[0],), islice(values, 1, None)))
+
+
+def multiply_inputs(values: Sequence[float]) -> float:
+    """
+    Return the product of values.
+
+    Example:
+    >>> multiply_inputs([2.0, 3.0, 4.0])
+    24.0
+    """
+    if _is_array(values):
+        return float(np.multiply.reduce(values, dtype=np.float64))
+    return float(math.prod(values))
+
+
+def divide_inputs(values: Sequence[float]) -> float:
+    """
+    Return values[0] / values[1] / ... / values[-1].
+
+    Lists are divided once by the product of the divisors; if that product
+    overflows or underflows, the sequential left fold is used instead.
+
+    Raises:
+    - ValueError: If any divisor is zero.
+
+    Example:
+    >>> divide_inputs([24.0, 2.0, 3.0])
+    4.0
+    """
+    if _is_array(values):
+        if not values[1:].all():
+            raise ValueError("Cannot divide by zero")
+        return float(np.divide.reduce(values, dtype=np.float64))
+
+    if not all(islice(values, 1, None)):
+        raise ValueError("Cannot divide by zero")
+    dividend = float(values[0])
+    divisor = math.prod(islice(values, 1, None))
+    if math.isfinite(divisor) and abs(divisor) >= sys.float_info.min:
+        return dividend / divisor
+    return float(reduce(operator.truediv, islice(values, 1, None), dividend))
+
+
+def _is_array(values: Sequence[float]) -> bool:
+    """Return True when values is a NumPy array and the ufunc path applies."""
+    return np is not None and isinstance(values, np.ndarray)
+
+
+def _as_list(values: Sequence[float]) -> Sequence[float]:
+    """Return arrays as lists of Python floats; math.fsum iterates those fastest."""
+    return values.tolist() if _is_array(values) else values
@@ -0,0 +1,157 @@
+"""
+Calculation API routes.
+
+CRUD routes run on the async session (get_async_db) so database I/O never
+blocks the event loop. The bulk ingest route is a plain function that
+FastAPI runs in its threadpool on a sync session; its JSON array is parsed
+and validated in full before ingest starts, so it is capped at
+BULK_MAX_ITEMS rows (larger uploads go through the streaming NDJSON
+import).
+
+Every route requires a bearer token; users only see and change their own
+calculations. Calculations of other users answer 404, as if absent.
+
+Creating, updating and deleting go through app.services.dependencies (run
+on the async session's sync side), which maintains references between
+expression calculations and recomputes dependents in the same commit.
+"""
+import uuid
+from typing import List, Optional
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import get_async_db, get_db
+from app.dependencies import current_user
+from app.models.calculation import Calculation
+from app.models.user import User
+from app.schemas.calculation import (
+    CalculationBulkItem,
+    CalculationCreate,
+    CalculationRead,
+    CalculationUpdate,
+    BulkIngestResponse,
+)
+from app.services.dependencies import (
+    DependencyError,
+    delete_calculation as delete_with_dependencies,
+    reject_references,
+    save_calculation,
+)
+from app.services.ingest import bulk_ingest
+
+router = APIRouter(prefix="/calculations", tags=["calculations"])
+
+
+async def _save_or_400(db: AsyncSession, calculation: Calculation) -> None:
+    """
+    Save the calculation with its references and dependents, then commit; a
+    result that cannot be computed, here or downstream, becomes a 400
+    """
+    try:
+        await db.run_sync(save_calculation, calculation)
+        await db.commit()
+    except ValueError as e:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def _get_calculation_or_404(db: AsyncSession, calculation_id: uuid.UUID, user: User) -> Calculation:
+    calculation = await db.get(Calculation, calculation_id)
+    if calculation is None or calculation.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Calculation not found")
+    return calculation
+
+
+@router.post("", response_model=CalculationRead, status_code=201)
+async def create_calculation(
+    calculation_in: CalculationCreate,
+    user_id: Optional[uuid.UUID] = Query(None, description="ID of user who owns the calculation (defaults to the caller)"),
+    user: User = Depends(current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Create a calculation; its result is computed and stored on insert.
+    """
+    if user_id is not None and user_id != user.id:
+        raise HTTPException(status_code=403, detail="Not allowed to create calculations for another user")
+    calculation = Calculation.create(calculation_in.type, user.id, calculation_in.inputs)
+    await _save_or_400(db, calculation)
+    return calculation
+
+
+@router.get("/{calculation_id}", response_model=CalculationRead)
+async def read_calculation(
+    calculation_id: uuid.UUID,
+    user: User = Depends(current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Get a calculation by ID.
+    """
+    return await _get_calculation_or_404(db, calculation_id, user)
+
+
+@router.put("/{calculation_id}", response_model=CalculationRead)
+async def update_calculation(
+    calculation_id: uuid.UUID,
+    calculation_in: CalculationUpdate,
+    user: User = Depends(current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Replace a calculation's inputs; the stored result is recomputed on update,
+    and so are the results of calculations that depend on it.
+    """
+    calculation = await _get_calculation_or_404(db, calculation_id, user)
+    calculation.inputs = calculation_in.inputs
+    await _save_or_400(db, calculation)
+    return calculation
+
+
+@router.delete("/{calculation_id}", status_code=204)
+async def delete_calculation(
+    calculation_id: uuid.UUID,
+    user: User = Depends(current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Delete a calculation; one that other calculations reference answers 409.
+    """
+    calculation = await _get_calculation_or_404(db, calculation_id, user)
+    try:
+        await db.run_sync(delete_with_dependencies, calculation)
+    except DependencyError as e:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail=str(e))
+    await db.commit()
+    return Response(status_code=204)
+
+
+@router.post("/bulk", response_model=BulkIngestResponse, status_code=201)
+def bulk_ingest_route(
+    items: List[CalculationBulkItem] = Body(..., max_length=settings.BULK_MAX_ITEMS),
+    chunk_size: Optional[int] = Query(None, ge=1, description="Rows per committed chunk"),
+    user: User = Depends(current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Insert up to BULK_MAX_ITEMS calculations, computing results and
+    committing in chunks. Expressions with references are rejected before
+    anything is written.
+    """
+    if any(item.user_id != user.id for item in items):
+        raise HTTPException(status_code=403, detail="Not allowed to create calculations for another user")
+    for position, item in enumerate(items):
+        try:
+            reject_references(item.type, item.inputs)
+        except DependencyError as e:
+            raise HTTPException(status_code=400, detail=f"Row {position}: {e}")
+    rows = ((item.type, item.user_id, item.inputs) for item in items)
+    try:
+        summary = bulk_ingest(db, rows, chunk_size=chunk_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return BulkIngestResponse(inserted=summary.inserted, chunks=summary.chunks)
@@ -0,0 +1,32 @@
+"""
+Liveness and readiness probes.
+"""
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.database import async_engine, engine
+from app.services.readiness import ReadinessCheck
+
+router = APIRouter(tags=["health"])
+
+readiness_check = ReadinessCheck(async_engine, [engine])
+
+
+@router.get("/health")
+async def health():
+    """
+    Liveness: the process is up and serving requests. Never touches I/O.
+    """
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def ready():
+    """
+    Readiness: database reachable and connection pools not saturated.
+
+    The result is cached briefly, so frequent probes cost no database work.
+    Answers 503 when not ready.
+    """
+    status = await readiness_check.status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
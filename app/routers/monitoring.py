@@ -0,0 +1,76 @@
+"""
+Operational endpoints: runtime statistics for the app's shared resources.
+"""
+from fastapi import APIRouter, Response
+
+from app.database import async_engine, engine
+from app.operations.expression import expression_cache_stats
+from app.utils.cache import result_cache
+from app.utils.logging_config import logging_stats
+from app.utils.metrics import render_metrics
+from app.utils.pool_stats import pool_status
+from app.utils.security import password_hash_pool
+from app.utils.tokens import token_cache
+
+router = APIRouter(tags=["monitoring"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """
+    Request counts, latency histograms and in-flight gauges in Prometheus text
+    format, aggregated across workers in multiprocess mode.
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+@router.get("/db/pool")
+async def database_pool_stats():
+    """
+    Live connection pool usage and checkout telemetry for this worker.
+    """
+    return {
+        "sync": pool_status(engine.pool),
+        "async": pool_status(async_engine.sync_engine.pool),
+    }
+
+
+@router.get("/cache/stats")
+async def result_cache_stats():
+    """
+    Hit, miss and eviction counters of the calculation result cache for this worker.
+    """
+    return result_cache.stats()
+
+
+@router.get("/cache/expressions")
+async def compiled_expression_cache_stats():
+    """
+    Hit, miss and size counters of the compiled expression cache for this worker.
+    """
+    return expression_cache_stats()
+
+
+@router.get("/auth/hash-pool")
+async def password_hash_pool_stats():
+    """
+    Queue depth, wait times and rejections of the password hashing pool for this worker.
+    """
+    return password_hash_pool.stats()
+
+
+@router.get("/auth/token-cache")
+async def token_cache_stats():
+    """
+    Hit, miss and eviction counters of the verified-token cache for this worker.
+    """
+    return token_cache.stats()
+
+
+@router.get("/logging/stats")
+async def logging_pipeline_stats():
+    """
+    Queue depth and dropped/rate-limited record counts of the logging pipeline for this worker.
+    """
+    return logging_stats()
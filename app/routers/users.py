@@ -0,0 +1,199 @@
+"""
+User API routes.
+"""
+import uuid
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database import get_async_db, get_db
+from app.dependencies import authorized_user_id
+from app.models.calculation import Calculation
+from app.models.user import User
+from app.schemas.calculation import (
+    CalculationPage,
+    CalculationStats,
+    CalculationType,
+    CalculationTypeStats,
+    ImportLineError,
+    ImportSummaryResponse,
+)
+from app.services.export import ENCODERS, MEDIA_TYPES, gzip_chunks, iter_calculation_batches
+from app.services.imports import import_ndjson
+from app.schemas.user import Token, UserCreate, UserLogin, UserRead
+from app.services.stats import get_user_stats
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.responses import model_response
+from app.utils.security import PasswordHasherBusy, verify_dummy_password_async
+from app.utils.tokens import create_access_token
+
+router = APIRouter(prefix="/users", tags=["users"])
+
+
+def _decode_cursor_or_400(cursor: Optional[str]):
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _hasher_busy_503(e: PasswordHasherBusy) -> HTTPException:
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
+
+@router.post("/register", response_model=UserRead, status_code=201)
+async def register_user(user_in: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Create a user. The password is hashed on the bounded hashing pool, so a
+    burst of registrations queues there instead of stalling other routes.
+    """
+    existing = await db.scalar(
+        select(User.id).where(or_(User.username == user_in.username, User.email == user_in.email))
+    )
+    if existing is not None:
+        raise HTTPException(status_code=400, detail="Username or email already registered")
+
+    user = User(username=user_in.username, email=user_in.email)
+    try:
+        await user.set_password_async(user_in.password)
+    except PasswordHasherBusy as e:
+        raise _hasher_busy_503(e)
+    db.add(user)
+    await db.commit()
+    await db.refresh(user)
+    return user
+
+
+@router.post("/login", response_model=Token)
+async def login(credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    """
+    Exchange a username and password for a bearer access token.
+
+    A password hash made with an outdated bcrypt cost is replaced by one at
+    the current cost while the plain password is at hand.
+    """
+    user = await db.scalar(select(User).where(User.username == credentials.username))
+    try:
+        if user is None:
+            # Unknown usernames cost one bcrypt check too, like wrong passwords
+            valid = await verify_dummy_password_async(credentials.password)
+        else:
+            valid = await user.verify_password_async(credentials.password)
+    except PasswordHasherBusy as e:
+        raise _hasher_busy_503(e)
+    if not valid:
+        raise HTTPException(status_code=401, detail="Incorrect username or password",
+                            headers={"WWW-Authenticate": "Bearer"})
+
+    if user.password_needs_rehash():
+        try:
+            await user.set_password_async(credentials.password)
+        except PasswordHasherBusy:
+            pass  # upgrading can wait for the next login; don't fail this one
+        else:
+            await db.commit()
+    access_token, expires_at = create_access_token(user.id)
+    return Token(access_token=access_token, expires_at=expires_at)
+
+
+@router.get("/{user_id}/calculations", response_model=CalculationPage)
+async def list_user_calculations(
+    user_id: uuid.UUID = Depends(authorized_user_id),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=500),
+    type: Optional[CalculationType] = Query(None, description="Only return this calculation type"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Page through a user's calculations, newest first.
+
+    Uses keyset pagination on (created_at, id) backed by a composite index,
+    so deep pages cost the same as the first one.
+    """
+    query = select(Calculation).where(Calculation.user_id == user_id)
+    if type is not None:
+        query = query.where(Calculation.type == type)
+    position = _decode_cursor_or_400(cursor)
+    if position is not None:
+        query = query.where(tuple_(Calculation.created_at, Calculation.id) < position)
+    query = query.order_by(Calculation.created_at.desc(), Calculation.id.desc()).limit(limit + 1)
+
+    rows = (await db.scalars(query)).all()
+    items = rows[:limit]
+    next_cursor = encode_cursor(items[-1].created_at, items[-1].id) if len(rows) > limit else None
+    return model_response(CalculationPage(items=items, next_cursor=next_cursor))
+
+
+@router.get("/{user_id}/calculations/export")
+def export_user_calculations(
+    user_id: uuid.UUID = Depends(authorized_user_id),
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    gzip: bool = Query(False, description="Compress the stream with gzip"),
+    cursor: Optional[str] = Query(None, description="Resume after the row with this cursor"),
+    db: Session = Depends(get_db),
+):
+    """
+    Stream a user's full calculation history, oldest first.
+
+    Each row includes a cursor; pass the last one received to resume.
+    """
+    position = _decode_cursor_or_400(cursor)
+    batches = iter_calculation_batches(db.get_bind(), user_id, after=position)
+    body = ENCODERS[format](batches)
+    filename = f"calculations-{user_id}.{format}"
+    media_type = MEDIA_TYPES[format]
+    if gzip:
+        body = gzip_chunks(body)
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post("/{user_id}/calculations/import", response_model=ImportSummaryResponse)
+async def import_user_calculations(
+    request: Request,
+    user_id: uuid.UUID = Depends(authorized_user_id),
+    chunk_size: Optional[int] = Query(None, ge=1, description="Rows per committed chunk"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Import calculations from an NDJSON body, one CalculationCreate per line.
+
+    The body is parsed as it streams in; valid lines are committed in chunks
+    and invalid ones are listed in the summary.
+    """
+    summary = await import_ndjson(db, user_id, request.stream(), chunk_size=chunk_size)
+    return ImportSummaryResponse(
+        lines=summary.lines,
+        inserted=summary.inserted,
+        failed=summary.failed,
+        errors=[ImportLineError(line=line, error=error) for line, error in summary.errors],
+        errors_truncated=summary.errors_truncated,
+    )
+
+
+@router.get("/{user_id}/calculations/stats", response_model=CalculationStats)
+async def user_calculation_stats(
+    user_id: uuid.UUID = Depends(authorized_user_id),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Count, min, max, avg and sum of results per calculation type, plus latest activity.
+    """
+    types = [CalculationTypeStats(**row._mapping) for row in await get_user_stats(db, user_id)]
+    return model_response(CalculationStats(
+        user_id=user_id,
+        total_count=sum(stats.count for stats in types),
+        last_activity=max((stats.last_activity for stats in types), default=None),
+        types=types,
+    ))
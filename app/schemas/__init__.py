@@ -3,13 +3,35 @@ Schemas package - contains all Pydantic validation schemas.
 Author: Pruthul Patel
 Date: October 18, 2025
 """
-from app.schemas.user import UserCreate, UserRead
-from app.schemas.calculation import CalculationCreate, CalculationRead, CalculationUpdate
+from app.schemas.user import UserCreate, UserRead, UserLogin, Token
+from app.schemas.calculation import (
+    CalculationCreate,
+    CalculationRead,
+    CalculationUpdate,
+    CalculationBulkItem,
+    CalculationPage,
+    ExpressionInputs,
+    CalculationStats,
+    CalculationTypeStats,
+    BulkIngestResponse,
+    ImportLineError,
+    ImportSummaryResponse
+)
 
 __all__ = [
     "UserCreate",
     "UserRead",
+    "UserLogin",
+    "Token",
     "CalculationCreate",
     "CalculationRead",
-    "CalculationUpdate"
+    "CalculationUpdate",
+    "CalculationBulkItem",
+    "CalculationPage",
+    "ExpressionInputs",
+    "CalculationStats",
+    "CalculationTypeStats",
+    "BulkIngestResponse",
+    "ImportLineError",
+    "ImportSummaryResponse"
 ]
\ No newline at end of file
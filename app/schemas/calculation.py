@@ -4,9 +4,56 @@ Author: Pruthul Patel
 Date: October 18, 2025
 """
 import uuid
-from typing import List, Literal
+from typing import Annotated, Dict, List, Literal, Optional, Union
 from datetime import datetime
 from pydantic import BaseModel, Field, field_validator
+from typing_extensions import NotRequired, TypedDict
+from app.operations.expression import MAX_EXPRESSION_LENGTH, compile_expression
+
+
+# Types that fold a list of numbers left to right, one per registered operation
+ArithmeticType = Literal['addition', 'subtraction', 'multiplication', 'division']
+
+CalculationType = Literal[ArithmeticType, 'expression']
+
+
+class ExpressionInputs(TypedDict):
+    """
+    Inputs of an expression calculation: a formula and a value per variable.
+    Variables listed in references take the result of that calculation
+    (of the same user) and are kept up to date when it changes.
+    """
+    expression: Annotated[str, Field(min_length=1, max_length=MAX_EXPRESSION_LENGTH)]
+    variables: NotRequired[Dict[str, float]]
+    references: NotRequired[Dict[str, uuid.UUID]]
+
+
+# A list of numbers for arithmetic types, ExpressionInputs for expressions
+CalculationInputs = Union[List[float], ExpressionInputs]
+
+
+def validate_number_list(v: CalculationInputs) -> List[float]:
+    """Check inputs are a list of at least two numbers"""
+    if not isinstance(v, list):
+        raise ValueError("Inputs must be a list of numbers")
+    if len(v) < 2:
+        raise ValueError("At least two numbers are required")
+    return v
+
+
+def validate_expression_inputs(v: CalculationInputs) -> ExpressionInputs:
+    """Check the formula compiles and every variable it uses has a value"""
+    if not isinstance(v, dict):
+        raise ValueError("Expression inputs must be an object with expression and variables")
+    v.setdefault('variables', {})
+    compiled = compile_expression(v['expression'])
+    missing = compiled.missing_variables({**v['variables'], **v.get('references', {})})
+    if missing:
+        raise ValueError(f"No value for variable(s): {', '.join(missing)}")
+    unused = sorted(set(v.get('references', {})).difference(compiled.variables))
+    if unused:
+        raise ValueError(f"References to variable(s) not in the expression: {', '.join(unused)}")
+    return v
 
 
 class CalculationCreate(BaseModel):
@@ -14,22 +61,23 @@ class CalculationCreate(BaseModel):
     Schema for creating a new calculation.
     Validates input data before saving to database.
     """
-    type: Literal['addition', 'subtraction', 'multiplication', 'division'] = Field(
+    type: CalculationType = Field(
         ...,
         description="Type of calculation to perform"
     )
-    inputs: List[float] = Field(
+    inputs: CalculationInputs = Field(
         ...,
-        min_length=2,
-        description="List of numbers to calculate (minimum 2 numbers required)"
+        description="List of numbers to calculate (minimum 2 numbers required), "
+                    "or {expression, variables} for the expression type"
     )
     
     @field_validator('inputs')
     @classmethod
     def validate_inputs(cls, v, info):
         """Validate inputs based on calculation type"""
-        if len(v) < 2:
-            raise ValueError("At least two numbers are required")
+        if info.data.get('type') == 'expression':
+            return validate_expression_inputs(v)
+        validate_number_list(v)
         
         # Check for division by zero
         if info.data.get('type') == 'division':
@@ -47,15 +95,44 @@ class CalculationCreate(BaseModel):
         }
 
 
+class CalculationBulkItem(CalculationCreate):
+    """
+    Schema for one row of a bulk ingest.
+    Same validation as CalculationCreate plus the owning user.
+    """
+    user_id: uuid.UUID = Field(..., description="ID of user who owns the calculation")
+
+
+class BulkIngestResponse(BaseModel):
+    """Summary returned after a bulk ingest"""
+    inserted: int = Field(..., description="Number of calculations written")
+    chunks: int = Field(..., description="Number of committed chunks")
+
+
+class ImportLineError(BaseModel):
+    """One rejected line of an NDJSON import"""
+    line: int = Field(..., description="1-based line number in the uploaded file")
+    error: str = Field(..., description="Why the line was rejected")
+
+
+class ImportSummaryResponse(BaseModel):
+    """Summary returned after an NDJSON import"""
+    lines: int = Field(..., description="Non-blank lines read")
+    inserted: int = Field(..., description="Calculations written")
+    failed: int = Field(..., description="Lines rejected")
+    errors: List[ImportLineError] = Field(..., description="Rejected lines (capped)")
+    errors_truncated: bool = Field(..., description="True if more lines failed than are listed")
+
+
 class CalculationRead(BaseModel):
     """
     Schema for reading calculation data.
-    Returns calculation with computed result.
+    Returns calculation with the result stored when it was written.
     """
     id: uuid.UUID = Field(..., description="Unique calculation identifier")
     user_id: uuid.UUID = Field(..., description="ID of user who created the calculation")
     type: str = Field(..., description="Type of calculation")
-    inputs: List[float] = Field(..., description="Input numbers used in calculation")
+    inputs: CalculationInputs = Field(..., description="Input numbers, or expression and variables, used in calculation")
     result: float | None = Field(None, description="Calculated result")
     created_at: datetime = Field(..., description="When calculation was created")
     updated_at: datetime = Field(..., description="When calculation was last updated")
@@ -75,24 +152,54 @@ class CalculationRead(BaseModel):
         }
 
 
+class CalculationPage(BaseModel):
+    """
+    One page of a user's calculation history.
+    Pass next_cursor back as the cursor parameter to fetch the following page.
+    """
+    items: List[CalculationRead] = Field(..., description="Calculations, newest first")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
+
+
+class CalculationTypeStats(BaseModel):
+    """Aggregates for one calculation type"""
+    type: str = Field(..., description="Type of calculation")
+    count: int = Field(..., description="Number of calculations")
+    min_result: Optional[float] = Field(None, description="Smallest result")
+    max_result: Optional[float] = Field(None, description="Largest result")
+    avg_result: Optional[float] = Field(None, description="Mean result")
+    sum_result: Optional[float] = Field(None, description="Sum of results")
+    last_activity: datetime = Field(..., description="When the latest calculation was created")
+
+
+class CalculationStats(BaseModel):
+    """
+    Per-user calculation statistics.
+    Computed by a single GROUP BY query over the calculation_stats rollup.
+    """
+    user_id: uuid.UUID = Field(..., description="ID of the user")
+    total_count: int = Field(..., description="Number of calculations across all types")
+    last_activity: Optional[datetime] = Field(None, description="When the latest calculation was created")
+    types: List[CalculationTypeStats] = Field(..., description="Aggregates per calculation type")
+
+
 class CalculationUpdate(BaseModel):
     """
     Schema for updating a calculation.
     Allows updating inputs and recalculating result.
     """
-    inputs: List[float] = Field(
+    inputs: CalculationInputs = Field(
         ...,
-        min_length=2,
-        description="Updated list of numbers"
+        description="Updated list of numbers, or expression and variables for an expression"
     )
     
     @field_validator('inputs')
     @classmethod
     def validate_inputs(cls, v):
-        """Validate that we have at least 2 numbers"""
-        if len(v) < 2:
-            raise ValueError("At least two numbers are required")
-        return v
+        """Validate a list of at least 2 numbers, or a compilable expression"""
+        if isinstance(v, dict):
+            return validate_expression_inputs(v)
+        return validate_number_list(v)
     
     class Config:
         json_schema_extra = {
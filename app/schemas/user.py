@@ -2,6 +2,7 @@
 Pydantic schemas for User validation.
 """
 from datetime import datetime
+from typing import Literal
 from uuid import UUID
 from pydantic import BaseModel, EmailStr, Field
 
@@ -22,3 +23,16 @@ class UserRead(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class UserLogin(BaseModel):
+    """Schema for logging in"""
+    username: str = Field(..., min_length=1, max_length=50)
+    password: str = Field(..., min_length=1)
+
+
+class Token(BaseModel):
+    """Bearer access token issued at login"""
+    access_token: str
+    token_type: Literal["bearer"] = "bearer"
+    expires_at: datetime
@@ -0,0 +1,3 @@
+"""
+Services package - database workflows built on top of the models.
+"""
@@ -0,0 +1,161 @@
+"""
+Consistency checker for stored calculation results.
+
+Walks the calculations table in primary-key order, one chunk per query,
+recomputes every result and compares it with the stored column. NULL and
+stale results can be repaired in bulk, committing once per chunk.
+
+A repaired calculation that other calculations reference has its
+dependents recomputed (app.services.dependencies) in the same commit, since
+their copied variables still hold the old result and would otherwise look
+consistent forever. If a dependent cannot be recomputed with the repaired
+value, that repair is skipped and reported as blocked.
+
+Usage:
+    python -m app.services.consistency [--repair] [--chunk-size N]
+"""
+import argparse
+import math
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.calculation import Calculation
+from app.models.calculation_dependency import CalculationDependency
+from app.models.calculation_stats import bucket_key, recompute_buckets
+from app.services.dependencies import DependencyError, recompute_dependents
+
+# Results within this relative tolerance are considered consistent, so
+# rounding differences between summation algorithms are not reported
+RELATIVE_TOLERANCE = 1e-9
+
+
+@dataclass
+class ConsistencyReport:
+    """Counts from a consistency check"""
+    checked: int = 0
+    null: int = 0
+    stale: int = 0
+    invalid: int = 0
+    repaired: int = 0
+    dependents_recomputed: int = 0
+    invalid_ids: List[str] = field(default_factory=list)
+    blocked_ids: List[str] = field(default_factory=list)
+
+
+def check_results(db: Session, repair: bool = False, chunk_size: Optional[int] = None) -> ConsistencyReport:
+    """
+    Find, and optionally repair, NULL or stale stored results.
+
+    Rows whose inputs can no longer be computed are counted as invalid and
+    left untouched. Repairs propagate to dependent calculations; a repair
+    whose dependents cannot be recomputed is left out and listed in
+    blocked_ids.
+    """
+    chunk_size = chunk_size or settings.BULK_CHUNK_SIZE
+    table = Calculation.__table__
+    repair_statement = (
+        update(table)
+        .where(table.c.id == bindparam("row_id"))
+        .values(result=bindparam("new_result"))
+    )
+
+    report = ConsistencyReport()
+    last_id = None
+    while True:
+        query = (
+            select(table.c.id, table.c.user_id, table.c.type, table.c.inputs, table.c.result, table.c.created_at)
+            .order_by(table.c.id)
+            .limit(chunk_size)
+        )
+        if last_id is not None:
+            query = query.where(table.c.id > last_id)
+        rows = db.execute(query).all()
+        if not rows:
+            break
+
+        fixes = []
+        buckets = set()
+        for row in rows:
+            report.checked += 1
+            try:
+                expected = Calculation.create(row.type, None, row.inputs).get_result()
+            except (TypeError, ValueError):
+                report.invalid += 1
+                report.invalid_ids.append(str(row.id))
+                continue
+            if row.result is None:
+                report.null += 1
+            elif not math.isclose(row.result, expected, rel_tol=RELATIVE_TOLERANCE):
+                report.stale += 1
+            else:
+                continue
+            fixes.append({"row_id": row.id, "new_result": expected})
+            buckets.add(bucket_key(row.user_id, row.type, row.created_at))
+
+        if repair and fixes:
+            _repair_chunk(db, repair_statement, fixes, buckets, report)
+        last_id = rows[-1].id
+    return report
+
+
+def _repair_chunk(db: Session, repair_statement, fixes: List[dict], buckets: set, report: ConsistencyReport) -> None:
+    """
+    Write one chunk of fixes, recompute the dependents of the repaired rows
+    and commit. A fix whose dependents cannot be recomputed is dropped and
+    the chunk written again without it.
+    """
+    edges = CalculationDependency.__table__
+    while fixes:
+        db.execute(repair_statement, fixes)
+        referenced = set(db.scalars(
+            select(edges.c.dependency_id).where(edges.c.dependency_id.in_([fix["row_id"] for fix in fixes]))
+        ))
+        recomputed = 0
+        blocked = None
+        for fix in fixes:
+            if fix["row_id"] not in referenced:
+                continue
+            try:
+                recomputed += recompute_dependents(db, fix["row_id"], fix["new_result"])
+            except DependencyError:
+                blocked = fix
+                break
+        if blocked is not None:
+            db.rollback()
+            report.blocked_ids.append(str(blocked["row_id"]))
+            fixes = [fix for fix in fixes if fix is not blocked]
+            continue
+        recompute_buckets(db.connection(), buckets)
+        db.commit()
+        report.repaired += len(fixes)
+        report.dependents_recomputed += recomputed
+        return
+
+
+def main():
+    from app.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Check stored calculation results against their inputs.")
+    parser.add_argument("--repair", action="store_true", help="rewrite NULL and stale results")
+    parser.add_argument("--chunk-size", type=int, default=None)
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        report = check_results(db, repair=args.repair, chunk_size=args.chunk_size)
+    print(
+        f"checked={report.checked} null={report.null} stale={report.stale} "
+        f"invalid={report.invalid} repaired={report.repaired} "
+        f"dependents_recomputed={report.dependents_recomputed} blocked={len(report.blocked_ids)}"
+    )
+    for calculation_id in report.invalid_ids:
+        print(f"invalid: {calculation_id}")
+    for calculation_id in report.blocked_ids:
+        print(f"blocked: {calculation_id}")
+
+
+if __name__ == "__main__":
+    main()
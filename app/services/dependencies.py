@@ -0,0 +1,247 @@
+"""
+Dependent calculations.
+
+An expression calculation may bind variables to other calculations of the
+same user through inputs["references"] ({variable: calculation id}). The
+referenced results are copied into inputs["variables"], and every binding
+is mirrored in calculation_dependencies so dependents are found by index.
+
+save_calculation is the write path for the CRUD routes (bulk ingest and
+import reject references, see reject_references):
+
+- References are checked (same user, result present, no cycle) and their
+  current results copied in before the calculation is flushed.
+- If the flush changed the calculation's result, its downstream dependents
+  are recomputed in topological order, one level at a time. Within a level
+  the calculations are independent, so they are loaded and flushed in
+  batches of DEPENDENCY_BATCH_SIZE. A dependent is only recomputed if one
+  of its dependencies' results actually changed.
+
+Recomputed rows go through the ORM, so the result listeners and the
+calculation_stats rollup apply to them as to any other update. Nothing is
+committed here; the caller commits once, so an update and everything
+downstream of it land in a single transaction.
+"""
+import uuid
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, exists, insert, inspect, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.calculation import Calculation
+from app.models.calculation_dependency import CalculationDependency
+from app.utils.iterables import chunked
+
+# dependent id -> [(variable, dependency id)], for edges inside a downstream closure
+IncomingEdges = Dict[uuid.UUID, List[Tuple[str, uuid.UUID]]]
+
+
+class DependencyError(ValueError):
+    """A reference is invalid, would create a cycle, or a dependent cannot be recomputed"""
+
+
+def save_calculation(db: Session, calculation: Calculation, batch_size: Optional[int] = None) -> int:
+    """
+    Flush a new or changed calculation with its references, then recompute
+    its dependents if its result changed.
+
+    Returns the number of dependents recomputed.
+
+    Raises:
+    - DependencyError: If a reference is invalid or a dependent cannot be recomputed.
+    - ValueError: If the calculation's own result cannot be computed.
+    """
+    batch_size = batch_size or settings.DEPENDENCY_BATCH_SIZE
+    new = not inspect(calculation).persistent
+    # The calculation must not be flushed before its old result is read (an
+    # expired instance reloads it) or before its variables are filled in
+    with db.no_autoflush:
+        if calculation.id is None:
+            calculation.id = uuid.uuid4()
+        old_result = calculation.result
+        references = _references(calculation)
+        if references:
+            _resolve_references(db, calculation, references, batch_size, new)
+    db.add(calculation)
+    db.flush()
+    if references or not new:
+        _replace_edges(db, calculation.id, references)
+
+    # Nothing can depend on a calculation that did not exist yet
+    if new or calculation.result == old_result:
+        return 0
+    return recompute_dependents(db, calculation.id, calculation.result, batch_size)
+
+
+def recompute_dependents(db: Session, calculation_id: uuid.UUID, result: float, batch_size: Optional[int] = None) -> int:
+    """
+    Propagate a changed result to everything downstream of calculation_id.
+
+    Returns the number of dependents recomputed.
+    """
+    batch_size = batch_size or settings.DEPENDENCY_BATCH_SIZE
+    incoming = downstream_edges(db, calculation_id, batch_size)
+    changed = {calculation_id: result}
+    recomputed = 0
+    for level in _topological_levels(calculation_id, incoming):
+        stale = [node for node in level if any(dependency in changed for _, dependency in incoming[node])]
+        for chunk in chunked(stale, batch_size):
+            calculations = db.scalars(select(Calculation).where(Calculation.id.in_(chunk))).all()
+            old_results = {}
+            for calculation in calculations:
+                old_results[calculation.id] = calculation.result
+                variables = dict(calculation.inputs.get("variables", {}))
+                for variable, dependency in incoming[calculation.id]:
+                    if dependency in changed:
+                        variables[variable] = changed[dependency]
+                calculation.inputs = {**calculation.inputs, "variables": variables}
+            try:
+                db.flush()
+            except ValueError as e:
+                raise DependencyError(f"A dependent calculation cannot be recomputed: {e}") from e
+            for calculation in calculations:
+                if calculation.result != old_results[calculation.id]:
+                    changed[calculation.id] = calculation.result
+            recomputed += len(calculations)
+    return recomputed
+
+
+def downstream_edges(db: Session, calculation_id: uuid.UUID, batch_size: Optional[int] = None) -> IncomingEdges:
+    """
+    Return the edges of every calculation that depends, directly or not, on
+    calculation_id, grouped by dependent. One query per level and batch.
+    """
+    batch_size = batch_size or settings.DEPENDENCY_BATCH_SIZE
+    table = CalculationDependency.__table__
+    incoming: IncomingEdges = defaultdict(list)
+    seen = {calculation_id}
+    frontier = [calculation_id]
+    while frontier:
+        next_frontier = []
+        for chunk in chunked(frontier, batch_size):
+            rows = db.execute(
+                select(table.c.dependent_id, table.c.variable, table.c.dependency_id)
+                .where(table.c.dependency_id.in_(chunk))
+            )
+            for dependent_id, variable, dependency_id in rows:
+                incoming[dependent_id].append((variable, dependency_id))
+                if dependent_id not in seen:
+                    seen.add(dependent_id)
+                    next_frontier.append(dependent_id)
+        frontier = next_frontier
+    return incoming
+
+
+def has_dependents(db: Session, calculation_id: uuid.UUID) -> bool:
+    """Return True if any calculation references calculation_id"""
+    table = CalculationDependency.__table__
+    return db.scalar(select(exists().where(table.c.dependency_id == calculation_id)))
+
+
+def delete_calculation(db: Session, calculation: Calculation) -> None:
+    """
+    Delete a calculation and its own edges.
+
+    Raises:
+    - DependencyError: If other calculations reference it.
+    """
+    if has_dependents(db, calculation.id):
+        raise DependencyError("Calculation is referenced by other calculations")
+    _replace_edges(db, calculation.id, {})
+    db.delete(calculation)
+    db.flush()
+
+
+def reject_references(calculation_type: str, inputs) -> None:
+    """
+    Raise DependencyError if inputs reference other calculations. For write
+    paths that do not go through save_calculation (bulk ingest, import),
+    which would store neither the referenced results nor the edges.
+    """
+    if calculation_type == "expression" and isinstance(inputs, dict) and inputs.get("references"):
+        raise DependencyError("References to other calculations are only supported when creating calculations one at a time")
+
+
+def _references(calculation: Calculation) -> Dict[str, uuid.UUID]:
+    inputs = calculation.inputs
+    if calculation.type != "expression" or not isinstance(inputs, dict):
+        return {}
+    try:
+        return {variable: uuid.UUID(str(ref)) for variable, ref in (inputs.get("references") or {}).items()}
+    except ValueError as e:
+        raise DependencyError(f"Invalid calculation reference: {e}") from e
+
+
+def _resolve_references(
+    db: Session, calculation: Calculation, references: Dict[str, uuid.UUID], batch_size: int, new: bool
+) -> None:
+    """Check references and copy their results into the calculation's variables"""
+    ids = set(references.values())
+    if calculation.id in ids:
+        raise DependencyError("A calculation cannot reference itself")
+
+    results = {}
+    for chunk in chunked(list(ids), batch_size):
+        results.update(db.execute(
+            select(Calculation.id, Calculation.result)
+            .where(Calculation.id.in_(chunk))
+            .where(Calculation.user_id == calculation.user_id)
+        ).all())
+    missing = sorted(str(ref) for ref in ids - results.keys())
+    if missing:
+        raise DependencyError(f"Referenced calculation(s) not found: {', '.join(missing)}")
+    if any(result is None for result in results.values()):
+        raise DependencyError("Referenced calculations must have a result")
+
+    if not new and ids & downstream_edges(db, calculation.id, batch_size).keys():
+        raise DependencyError("References would create a dependency cycle")
+
+    inputs = calculation.inputs
+    calculation.inputs = {
+        **inputs,
+        "variables": {
+            **inputs.get("variables", {}),
+            **{variable: results[ref] for variable, ref in references.items()},
+        },
+        "references": {variable: str(ref) for variable, ref in references.items()},
+    }
+
+
+def _replace_edges(db: Session, calculation_id: uuid.UUID, references: Dict[str, uuid.UUID]) -> None:
+    table = CalculationDependency.__table__
+    db.execute(delete(table).where(table.c.dependent_id == calculation_id))
+    if references:
+        db.execute(insert(table), [
+            {"dependent_id": calculation_id, "variable": variable, "dependency_id": ref}
+            for variable, ref in references.items()
+        ])
+
+
+def _topological_levels(root: uuid.UUID, incoming: IncomingEdges) -> Iterator[List[uuid.UUID]]:
+    """
+    Yield the downstream closure of root in levels (Kahn's algorithm); every
+    calculation comes after all of its dependencies inside the closure.
+    """
+    dependents: Dict[uuid.UUID, Set[uuid.UUID]] = defaultdict(set)
+    for node, edges in incoming.items():
+        for _, dependency in edges:
+            dependents[dependency].add(node)
+    remaining = {node: len({dependency for _, dependency in edges}) for node, edges in incoming.items()}
+
+    level = [root]
+    visited = 0
+    while level:
+        next_level = []
+        for node in level:
+            for dependent in dependents[node]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    next_level.append(dependent)
+        if next_level:
+            visited += len(next_level)
+            yield next_level
+        level = next_level
+    if visited != len(incoming):
+        raise DependencyError("Dependency cycle detected")
@@ -0,0 +1,113 @@
+"""
+Streaming export of calculation history as NDJSON or CSV.
+
+Rows are read through a server-side cursor (stream_results + yield_per) in
+(created_at, id) order and encoded one partition at a time, optionally
+through an incremental gzip compressor, so memory stays flat regardless of
+how many rows a user has.
+
+Every exported row carries a `cursor` value; passing the last one received
+back as `cursor` resumes the export right after that row.
+"""
+import csv
+import io
+import json
+import uuid
+import zlib
+from typing import Iterable, Iterator, Optional, Sequence, Tuple
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.engine import Connectable, Row
+from sqlalchemy.orm import Session
+
+from app.models.calculation import Calculation
+from app.utils.pagination import encode_cursor
+
+EXPORT_FIELDS = ("id", "user_id", "type", "inputs", "result", "created_at", "updated_at", "cursor")
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# gzip container (header + trailer) around a deflate stream
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def iter_calculation_batches(
+    bind: Connectable,
+    user_id: uuid.UUID,
+    after: Optional[Tuple] = None,
+    batch_size: int = 1000,
+) -> Iterator[Sequence[Row]]:
+    """
+    Yield a user's calculations in (created_at, id) order, batch_size rows at a time.
+
+    Opens its own session on bind so it can outlive the request's session.
+    """
+    table = Calculation.__table__
+    query = (
+        select(
+            table.c.id, table.c.user_id, table.c.type, table.c.inputs,
+            table.c.result, table.c.created_at, table.c.updated_at,
+        )
+        .where(table.c.user_id == user_id)
+        .order_by(table.c.created_at, table.c.id)
+        .execution_options(stream_results=True, yield_per=batch_size)
+    )
+    if after is not None:
+        query = query.where(tuple_(table.c.created_at, table.c.id) > after)
+
+    with Session(bind=bind) as db:
+        yield from db.execute(query).partitions()
+
+
+def _row_values(row: Row) -> dict:
+    return {
+        "id": str(row.id),
+        "user_id": str(row.user_id),
+        "type": row.type,
+        "inputs": row.inputs,
+        "result": row.result,
+        "created_at": row.created_at.isoformat(),
+        "updated_at": row.updated_at.isoformat(),
+        "cursor": encode_cursor(row.created_at, row.id),
+    }
+
+
+def encode_ndjson(batches: Iterable[Sequence[Row]]) -> Iterator[bytes]:
+    """Encode each batch as newline-delimited JSON"""
+    for batch in batches:
+        yield "".join(json.dumps(_row_values(row)) + "\n" for row in batch).encode()
+
+
+def encode_csv(batches: Iterable[Sequence[Row]]) -> Iterator[bytes]:
+    """Encode a header line, then each batch as CSV rows; inputs are a JSON array"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    yield buffer.getvalue().encode()
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        for row in batch:
+            values = _row_values(row)
+            values["inputs"] = json.dumps(values["inputs"])
+            writer.writerow(values[name] for name in EXPORT_FIELDS)
+        yield buffer.getvalue().encode()
+
+
+ENCODERS = {
+    "ndjson": encode_ndjson,
+    "csv": encode_csv,
+}
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Compress a byte stream incrementally into a single gzip member"""
+    compressor = zlib.compressobj(wbits=GZIP_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
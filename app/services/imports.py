@@ -0,0 +1,128 @@
+"""
+Streaming NDJSON import of calculations.
+
+The request body is consumed chunk by chunk and split into lines as bytes
+arrive; each line is validated with CalculationCreate, created through
+Calculation.create, and committed in chunks. Only the current line, the
+current chunk of pending rows and a capped list of errors are held in
+memory.
+"""
+import uuid
+from dataclasses import dataclass, field
+from typing import AsyncIterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.calculation import Calculation
+from app.schemas.calculation import CalculationCreate
+from app.services.dependencies import reject_references
+
+
+@dataclass
+class ImportSummary:
+    """Counts and per-line errors from an import"""
+    lines: int = 0
+    inserted: int = 0
+    failed: int = 0
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+    errors_truncated: bool = False
+
+    def add_error(self, line_number: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < settings.IMPORT_MAX_ERRORS:
+            self.errors.append((line_number, message))
+        else:
+            self.errors_truncated = True
+
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[Optional[bytes]]:
+    """
+    Split a byte stream into lines without holding more than one line.
+
+    Lines longer than max_line_bytes are discarded and yielded as None so
+    the caller can still count and report them.
+    """
+    buffer = b""
+    oversized = False
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if oversized:
+                oversized = False
+                yield None
+            else:
+                yield line
+        if len(buffer) > max_line_bytes:
+            oversized = True
+            buffer = b""
+    if oversized:
+        yield None
+    elif buffer:
+        yield buffer
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'line'}: {err['msg']}" for err in error.errors()
+    )
+
+
+async def import_ndjson(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    chunks: AsyncIterator[bytes],
+    chunk_size: Optional[int] = None,
+) -> ImportSummary:
+    """
+    Import CalculationCreate-shaped NDJSON lines for user_id.
+
+    Blank lines are skipped. Invalid lines, including expressions with
+    references to other calculations, are reported with their 1-based line
+    number and do not stop the import.
+    """
+    chunk_size = chunk_size or settings.BULK_CHUNK_SIZE
+    summary = ImportSummary()
+    pending = 0
+
+    line_number = 0
+    async for line in iter_lines(chunks, settings.IMPORT_MAX_LINE_BYTES):
+        line_number += 1
+        if line is None:
+            summary.lines += 1
+            summary.add_error(line_number, f"line exceeds {settings.IMPORT_MAX_LINE_BYTES} bytes")
+            continue
+        if not line.strip():
+            continue
+        summary.lines += 1
+
+        try:
+            calculation_in = CalculationCreate.model_validate_json(line)
+            reject_references(calculation_in.type, calculation_in.inputs)
+            calculation = Calculation.create(calculation_in.type, user_id, calculation_in.inputs)
+            calculation.get_result()
+        except ValidationError as e:
+            summary.add_error(line_number, _validation_message(e))
+            continue
+        except ValueError as e:
+            summary.add_error(line_number, str(e))
+            continue
+
+        db.add(calculation)
+        pending += 1
+        if pending == chunk_size:
+            await _commit_chunk(db)
+            summary.inserted += pending
+            pending = 0
+
+    if pending:
+        await _commit_chunk(db)
+        summary.inserted += pending
+    return summary
+
+
+async def _commit_chunk(db: AsyncSession) -> None:
+    await db.commit()
+    db.expunge_all()
@@ -0,0 +1,128 @@
+"""
+Bulk ingest of calculations.
+
+Rows of (type, user_id, inputs) are consumed lazily in fixed-size chunks.
+Each chunk is turned into calculation records through the ORM factory
+(Calculation.create + get_result), written with a single statement and
+committed, so memory use depends on the chunk size and not on the total
+number of rows. That holds for bulk_ingest itself, given a lazy iterable;
+POST /calculations/bulk validates its whole JSON body first and is capped
+at BULK_MAX_ITEMS rows instead.
+
+On PostgreSQL with psycopg2 a chunk is written with COPY; every other
+database gets an executemany INSERT.
+"""
+import csv
+import io
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.calculation import Calculation
+from app.models.calculation_stats import record_inserted_rows
+from app.services.dependencies import reject_references
+from app.utils.iterables import chunked
+
+IngestRow = Tuple[str, uuid.UUID, List[float]]
+
+COLUMNS = ("id", "user_id", "type", "inputs", "result", "created_at", "updated_at")
+
+
+@dataclass
+class IngestSummary:
+    """Counts reported after a bulk ingest"""
+    inserted: int = 0
+    chunks: int = 0
+
+
+def bulk_ingest(
+    db: Session,
+    rows: Iterable[IngestRow],
+    chunk_size: Optional[int] = None,
+    use_copy: Optional[bool] = None,
+) -> IngestSummary:
+    """
+    Insert calculations from an iterable of (type, user_id, inputs) rows.
+
+    Every chunk is committed on its own, so a failing row leaves the chunks
+    before it in the database.
+
+    Raises:
+        ValueError: If chunk_size is not positive or a row is invalid; the
+            message includes the zero-based position of the row.
+    """
+    chunk_size = chunk_size or settings.BULK_CHUNK_SIZE
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    if use_copy is None:
+        use_copy = _supports_copy(db)
+
+    summary = IngestSummary()
+    for chunk in chunked(rows, chunk_size):
+        records = [_build_record(summary.inserted + offset, row) for offset, row in enumerate(chunk)]
+        if use_copy:
+            _copy_records(db, records)
+        else:
+            db.execute(insert(Calculation.__table__), records)
+        # Core writes bypass the ORM flush events that maintain the rollup
+        record_inserted_rows(db.connection(), records)
+        db.commit()
+        summary.inserted += len(records)
+        summary.chunks += 1
+    return summary
+
+
+def _build_record(position: int, row: IngestRow) -> dict:
+    """Compute one row through the ORM factory and return its column values"""
+    calculation_type, user_id, inputs = row
+    try:
+        reject_references(calculation_type, inputs)
+        calculation = Calculation.create(calculation_type, user_id, inputs)
+        result = calculation.get_result()
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Row {position}: {e}") from e
+    now = datetime.utcnow()
+    return {
+        "id": uuid.uuid4(),
+        "user_id": user_id,
+        "type": calculation.type,
+        "inputs": inputs,
+        "result": result,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def _supports_copy(db: Session) -> bool:
+    """COPY is only available through the psycopg2 driver"""
+    dialect = db.get_bind().dialect
+    return dialect.name == "postgresql" and dialect.driver == "psycopg2"
+
+
+def _copy_records(db: Session, records: List[dict]) -> None:
+    """Write records with COPY ... FROM STDIN on the session's connection"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for record in records:
+        writer.writerow([
+            record["id"],
+            record["user_id"],
+            record["type"],
+            json.dumps(record["inputs"]),
+            "" if record["result"] is None else repr(record["result"]),
+            record["created_at"].isoformat(),
+            record["updated_at"].isoformat(),
+        ])
+    buffer.seek(0)
+
+    table = Calculation.__table__.name
+    statement = f"COPY {table} ({', '.join(COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+    dbapi_connection = db.connection().connection.dbapi_connection
+    with dbapi_connection.cursor() as cursor:
+        cursor.copy_expert(statement, buffer)
@@ -0,0 +1,103 @@
+"""
+Readiness check with a cached result.
+
+Orchestrators probe /ready every few seconds from several places; running
+a database round trip per probe would add connections exactly when the
+app is busiest. ReadinessCheck therefore:
+
+- caches its result for READINESS_CACHE_TTL_SECONDS;
+- lets only one probe refresh it at a time (an asyncio.Lock), so a burst of
+  probes after expiry shares a single database round trip;
+- skips the round trip when a connection pool is already saturated, since
+  waiting for a connection is exactly what must not pile up, and reports
+  not ready instead;
+- bounds the round trip with READINESS_TIMEOUT_SECONDS.
+"""
+import asyncio
+import time
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import Pool, QueuePool
+
+from app.config import settings
+
+
+def pool_saturation(pool: Pool) -> Optional[float]:
+    """Checked-out share of a QueuePool's capacity; None for unbounded pools"""
+    if not isinstance(pool, QueuePool):
+        return None
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    return pool.checkedout() / capacity if capacity else None
+
+
+class ReadinessCheck:
+    """Cached, single-flight database readiness probe"""
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        other_engines: List[Engine] = (),
+        ttl: float = settings.READINESS_CACHE_TTL_SECONDS,
+        timeout: float = settings.READINESS_TIMEOUT_SECONDS,
+        max_saturation: float = settings.READINESS_MAX_POOL_SATURATION,
+        clock=time.monotonic,
+    ):
+        self.engine = engine
+        self.other_engines = list(other_engines)
+        self.ttl = ttl
+        self.timeout = timeout
+        self.max_saturation = max_saturation
+        self.clock = clock
+        self.probes = 0
+        self._result: Optional[dict] = None
+        self._expires_at = 0.0
+        self._checked_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        # asyncio.Lock binds to one event loop; tests and reloads may run several
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock, self._lock_loop = asyncio.Lock(), loop
+        return self._lock
+
+    async def status(self) -> dict:
+        """Return the cached result, refreshing it when older than ttl"""
+        if self._result is None or self.clock() >= self._expires_at:
+            async with self._get_lock():
+                if self._result is None or self.clock() >= self._expires_at:
+                    self._result = await self._probe()
+                    self._checked_at = self.clock()
+                    self._expires_at = self._checked_at + self.ttl
+        return {**self._result, "age_seconds": round(self.clock() - self._checked_at, 3)}
+
+    def invalidate(self) -> None:
+        """Force the next status() call to probe"""
+        self._result = None
+
+    async def _probe(self) -> dict:
+        self.probes += 1
+        pools = {"async": pool_saturation(self.engine.sync_engine.pool)}
+        for index, engine in enumerate(self.other_engines):
+            pools["sync" if index == 0 else f"sync_{index}"] = pool_saturation(engine.pool)
+        result = {"ready": True, "database": "ok", "pool_saturation": pools}
+
+        if any(value is not None and value >= self.max_saturation for value in pools.values()):
+            result.update(ready=False, database="skipped", reason="Connection pool saturated")
+            return result
+        try:
+            await asyncio.wait_for(self._ping(), self.timeout)
+        except asyncio.TimeoutError:
+            result.update(ready=False, database="unavailable", reason="Database check timed out")
+        except (SQLAlchemyError, OSError) as e:
+            result.update(ready=False, database="unavailable", reason=type(e).__name__)
+        return result
+
+    async def _ping(self) -> None:
+        async with self.engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
@@ -0,0 +1,144 @@
+"""
+Rebuild and verification of the calculation_stats rollup.
+
+rebuild_rollup replaces the table with one INSERT ... SELECT ... GROUP BY
+over calculations. verify_rollup computes the same aggregate and
+merge-joins it against the table, both ordered by (user_id, type, day), so
+neither side is loaded into memory.
+
+Usage:
+    python -m app.services.rollup rebuild
+    python -m app.services.rollup verify
+"""
+import argparse
+import math
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from sqlalchemy import Date, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.calculation import Calculation
+from app.models.calculation_stats import CalculationStat
+
+AGGREGATE_FIELDS = ("count", "result_count", "sum_result", "min_result", "max_result", "last_activity")
+
+# Report at most this many differing buckets
+MAX_REPORTED = 100
+
+
+@dataclass
+class RollupDiff:
+    """Differences between calculation_stats and the live aggregate"""
+    buckets_checked: int = 0
+    missing: int = 0
+    extra: int = 0
+    mismatched: int = 0
+    examples: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not (self.missing or self.extra or self.mismatched)
+
+    def note(self, kind: str, key) -> None:
+        setattr(self, kind, getattr(self, kind) + 1)
+        if len(self.examples) < MAX_REPORTED:
+            self.examples.append(f"{kind}: {key}")
+
+
+def live_aggregate_query():
+    """Aggregate of calculations per (user_id, type, day), ordered by the key"""
+    table = Calculation.__table__
+    day = func.date(table.c.created_at, type_=Date).label("day")
+    return (
+        select(
+            table.c.user_id,
+            table.c.type,
+            day,
+            func.count().label("count"),
+            func.count(table.c.result).label("result_count"),
+            func.sum(table.c.result).label("sum_result"),
+            func.min(table.c.result).label("min_result"),
+            func.max(table.c.result).label("max_result"),
+            func.max(table.c.created_at).label("last_activity"),
+        )
+        .group_by(table.c.user_id, table.c.type, day)
+        .order_by(table.c.user_id, table.c.type, day)
+    )
+
+
+def rebuild_rollup(db: Session) -> int:
+    """Recompute calculation_stats from scratch; returns the number of buckets"""
+    table = CalculationStat.__table__
+    db.execute(delete(table))
+    db.execute(insert(table).from_select(
+        ["user_id", "type", "day", *AGGREGATE_FIELDS],
+        live_aggregate_query().order_by(None),
+    ))
+    db.commit()
+    return db.scalar(select(func.count()).select_from(table))
+
+
+def _same(stored, live) -> bool:
+    # A NULL aggregate (no results) must not match 0.0
+    if isinstance(stored, float) and isinstance(live, float):
+        return math.isclose(stored, live, rel_tol=1e-9, abs_tol=1e-9)
+    return stored == live
+
+
+def _key(row):
+    return (row.user_id, row.type, row.day)
+
+
+def verify_rollup(db: Session) -> RollupDiff:
+    """Diff calculation_stats against the live aggregate"""
+    table = CalculationStat.__table__
+    stored_rows = db.execute(
+        select(table).order_by(table.c.user_id, table.c.type, table.c.day)
+        .execution_options(stream_results=True, yield_per=1000)
+    )
+    live_rows = db.execute(live_aggregate_query().execution_options(stream_results=True, yield_per=1000))
+
+    diff = RollupDiff()
+    stored: Optional[object] = next(stored_rows, None)
+    live: Optional[object] = next(live_rows, None)
+    while stored is not None or live is not None:
+        if live is None or (stored is not None and _key(stored) < _key(live)):
+            diff.note("extra", _key(stored))
+            stored = next(stored_rows, None)
+            continue
+        diff.buckets_checked += 1
+        if stored is None or _key(live) < _key(stored):
+            diff.note("missing", _key(live))
+            live = next(live_rows, None)
+            continue
+        if not all(_same(getattr(stored, name), getattr(live, name)) for name in AGGREGATE_FIELDS):
+            diff.note("mismatched", _key(live))
+        stored = next(stored_rows, None)
+        live = next(live_rows, None)
+    return diff
+
+
+def main():
+    from app.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Maintain the calculation_stats rollup table.")
+    parser.add_argument("command", choices=["rebuild", "verify"])
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        if args.command == "rebuild":
+            print(f"rebuilt {rebuild_rollup(db)} buckets")
+            return
+        diff = verify_rollup(db)
+    print(
+        f"checked={diff.buckets_checked} missing={diff.missing} "
+        f"extra={diff.extra} mismatched={diff.mismatched}"
+    )
+    for example in diff.examples:
+        print(example)
+    raise SystemExit(0 if diff.ok else 1)
+
+
+if __name__ == "__main__":
+    main()
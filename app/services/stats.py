@@ -0,0 +1,47 @@
+"""
+Per-user calculation statistics computed in the database.
+
+Statistics are read from the calculation_stats rollup, which holds one row
+per (user_id, type, day) and is kept current on every write (see
+app.models.calculation_stats). One aggregate query over a user's rollup rows
+returns count, min, max, avg and sum of result plus the latest activity per
+type (avg is over rows with a result, as AVG(result) would be), so the cost
+grows with the number of active days rather than the number of calculations.
+The primary key (user_id, type, day) serves the grouping without a sort. Only
+standard aggregates are used, so the SQL is identical on PostgreSQL and
+SQLite.
+"""
+import uuid
+from typing import List
+
+from sqlalchemy import Float, case, cast, func, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.calculation_stats import CalculationStat
+
+
+def user_stats_query(user_id: uuid.UUID):
+    """Return the aggregate SELECT for one user's calculations"""
+    table = CalculationStat.__table__
+    result_count = func.sum(table.c.result_count)
+    total = func.sum(table.c.sum_result)
+    return (
+        select(
+            table.c.type,
+            func.sum(table.c.count).label("count"),
+            func.min(table.c.min_result).label("min_result"),
+            func.max(table.c.max_result).label("max_result"),
+            case((result_count > 0, total / cast(result_count, Float)), else_=None).label("avg_result"),
+            total.label("sum_result"),
+            func.max(table.c.last_activity).label("last_activity"),
+        )
+        .where(table.c.user_id == user_id)
+        .group_by(table.c.user_id, table.c.type)
+        .order_by(table.c.type)
+    )
+
+
+async def get_user_stats(db: AsyncSession, user_id: uuid.UUID) -> List[Row]:
+    """Return one row of aggregates per calculation type the user has used"""
+    return (await db.execute(user_stats_query(user_id))).all()
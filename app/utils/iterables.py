@@ -0,0 +1,14 @@
+"""
+Helpers for consuming iterables in fixed-size pieces.
+"""
+from itertools import islice
+from typing import Iterable, Iterator, List, TypeVar
+
+T = TypeVar("T")
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Yield lists of at most size items without materializing the input"""
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
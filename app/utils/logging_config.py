@@ -0,0 +1,188 @@
+"""
+Non-blocking, structured logging.
+
+configure_logging() installs this pipeline on the root logger:
+
+    logger call -> RateLimitFilter -> NonBlockingQueueHandler -> queue
+        -> QueueListener thread -> StreamHandler(stderr) with JsonFormatter
+
+The calling thread (usually the event loop) only checks the rate limit and
+puts the record on an in-memory queue. Message interpolation, JSON
+encoding and the write to stderr happen on the listener thread, so a burst
+of errors costs handlers no I/O. If the queue is full the record is dropped
+and counted rather than blocking the caller.
+
+Because formatting is deferred, log arguments should be plain values
+(strings, numbers), not objects that may change or lazy-load later.
+
+Repeated records from the same call site (logger, level, message template)
+are rate limited: at most LOG_RATE_LIMIT_BURST per
+LOG_RATE_LIMIT_WINDOW_SECONDS pass, and the first record after a window
+with drops reports how many were suppressed.
+"""
+import atexit
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+
+from app.config import settings
+
+# Attributes every LogRecord has; anything else was passed via extra=
+_RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+# Call sites tracked by the rate limiter before old ones are forgotten
+MAX_RATE_LIMIT_KEYS = 10_000
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """Let through at most `burst` records per call site per `window` seconds"""
+
+    def __init__(self, burst: int, window: float, clock=time.monotonic):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self.clock = clock
+        self._lock = threading.Lock()
+        # key -> [window start, records passed, records suppressed]
+        self._sites: Dict[Tuple, list] = {}
+        self.suppressed = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.burst <= 0:
+            return True
+        key = (record.name, record.levelno, record.pathname, record.lineno, record.msg)
+        now = self.clock()
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None or now - site[0] >= self.window:
+                if len(self._sites) >= MAX_RATE_LIMIT_KEYS:
+                    self._sites.clear()
+                dropped = site[2] if site is not None else 0
+                self._sites[key] = [now, 1, 0]
+                if dropped:
+                    record.suppressed = dropped
+                return True
+            if site[1] < self.burst:
+                site[1] += 1
+                return True
+            site[2] += 1
+            self.suppressed += 1
+            return False
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that defers formatting and drops records when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stock prepare() formats the message here, in the caller's
+        # thread; the listener's handler formats it instead
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LoggingPipeline:
+    """The installed handler, filter and listener, kept for stats and shutdown"""
+
+    def __init__(self, handler: NonBlockingQueueHandler, rate_limit: RateLimitFilter, listener: QueueListener):
+        self.handler = handler
+        self.rate_limit = rate_limit
+        self.listener = listener
+
+    def stats(self) -> dict:
+        return {
+            "queued": self.handler.queue.qsize(),
+            "dropped": self.handler.dropped,
+            "suppressed": self.rate_limit.suppressed,
+        }
+
+    def stop(self) -> None:
+        """Flush queued records and stop the listener thread"""
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+
+_pipeline: Optional[LoggingPipeline] = None
+
+
+def configure_logging(config=settings, stream=None) -> LoggingPipeline:
+    """
+    Install the queue-based pipeline on the root logger.
+
+    Calling it again replaces the previous pipeline (after flushing it);
+    handlers installed by others, such as pytest's, are left alone.
+    """
+    global _pipeline
+    shutdown_logging()
+
+    if config.LOG_FORMAT == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(formatter)
+
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=config.LOG_QUEUE_SIZE))
+    rate_limit = RateLimitFilter(config.LOG_RATE_LIMIT_BURST, config.LOG_RATE_LIMIT_WINDOW_SECONDS)
+    handler.addFilter(rate_limit)
+    listener = QueueListener(handler.queue, output, respect_handler_level=True)
+
+    root = logging.getLogger()
+    root.setLevel(config.LOG_LEVEL)
+    root.addHandler(handler)
+    listener.start()
+
+    _pipeline = LoggingPipeline(handler, rate_limit, listener)
+    return _pipeline
+
+
+def shutdown_logging() -> None:
+    """Remove the pipeline from the root logger and flush what it queued"""
+    global _pipeline
+    if _pipeline is None:
+        return
+    logging.getLogger().removeHandler(_pipeline.handler)
+    _pipeline.stop()
+    _pipeline = None
+
+
+def logging_stats() -> dict:
+    """Queue depth, dropped and rate-limited record counts"""
+    if _pipeline is None:
+        return {"queued": 0, "dropped": 0, "suppressed": 0}
+    return _pipeline.stats()
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,119 @@
+"""
+Prometheus request metrics.
+
+MetricsMiddleware is a plain ASGI middleware (no BaseHTTPMiddleware task or
+body buffering) that records per request:
+
+- http_requests_total{method, route, status}
+- http_request_duration_seconds{method, route, status}, a histogram
+- http_requests_in_progress{method}, a gauge
+
+route is the route template (/calculations/{calculation_id}), taken from the
+route FastAPI matched, so label cardinality is bounded by the route table;
+unmatched paths share route="<unmatched>". The labelled children are cached
+per label set, which keeps prometheus_client's label lookup off the hot path.
+
+Multiple workers: when PROMETHEUS_MULTIPROC_DIR is set (before
+prometheus_client is imported), every worker writes its values to
+memory-mapped files in that directory and render_metrics() merges all of
+them, so any worker answering /metrics reports totals for the whole
+server. The directory must exist and be emptied before the server starts.
+"""
+import os
+import time
+from typing import Dict, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Seconds; dense below 100 ms where the arithmetic and CRUD routes land
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route and status", ["method", "route", "status"]
+)
+LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route and status",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS,
+)
+IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests being served", ["method"], multiprocess_mode="livesum"
+)
+
+
+def multiprocess_dir():
+    """The shared metrics directory, or None in single-process mode"""
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR") or os.environ.get("prometheus_multiproc_dir")
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Return (body, content type) of the Prometheus text exposition"""
+    if multiprocess_dir():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead() -> None:
+    """Drop this worker's live gauges from the shared directory on shutdown"""
+    if multiprocess_dir():
+        multiprocess.mark_process_dead(os.getpid())
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request counts, latencies and in-flight requests"""
+
+    def __init__(self, app):
+        self.app = app
+        self._series: Dict[Tuple[str, str, str], tuple] = {}
+        self._in_progress: Dict[str, object] = {}
+
+    def _children(self, method: str, route: str, status: str):
+        key = (method, route, status)
+        children = self._series.get(key)
+        if children is None:
+            children = (REQUESTS.labels(method, route, status), LATENCY.labels(method, route, status))
+            self._series[key] = children
+        return children
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        in_progress = self._in_progress.get(method)
+        if in_progress is None:
+            in_progress = self._in_progress[method] = IN_PROGRESS.labels(method)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_progress.dec()
+            # The router stores the matched route in this same scope dict
+            route = scope.get("route")
+            counter, histogram = self._children(method, getattr(route, "path", UNMATCHED_ROUTE), str(status))
+            counter.inc()
+            histogram.observe(elapsed)
@@ -0,0 +1,32 @@
+"""
+Opaque cursors for keyset pagination on (created_at, id).
+
+A cursor encodes the sort key of the last row a client has seen; the next
+page continues strictly after it, so every page costs one index range scan
+no matter how deep it is.
+"""
+import base64
+import uuid
+from datetime import datetime
+from typing import Tuple
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    """Return an opaque cursor for a (created_at, id) position"""
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """
+    Return the (created_at, id) position encoded in cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.split("|")
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
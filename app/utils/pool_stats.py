@@ -0,0 +1,108 @@
+"""
+Connection pool telemetry.
+
+InstrumentedQueuePool and InstrumentedAsyncQueuePool behave exactly like the
+SQLAlchemy pools they extend, but time every checkout into a PoolStats
+histogram. A checkout that starts while every connection is in use (pool
+and overflow exhausted) counts as a wait.
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+# Upper bounds of the checkout latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+class PoolStats:
+    """Thread-safe counters and latency histogram for pool checkouts"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.latency_seconds = 0.0
+
+    def observe(self, seconds: float, waited: bool, timed_out: bool = False) -> None:
+        """Record one checkout attempt that took seconds"""
+        bucket = bisect_left(LATENCY_BUCKETS_MS, seconds * 1000)
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self.latency_seconds += seconds
+                self.bucket_counts[bucket] += 1
+            if waited:
+                self.waits += 1
+                self.wait_seconds += seconds
+                self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def snapshot(self) -> dict:
+        """Return a copy of the counters"""
+        with self._lock:
+            buckets = {f"le_{bound}ms": count for bound, count in zip(LATENCY_BUCKETS_MS, self.bucket_counts)}
+            buckets["le_inf"] = self.bucket_counts[-1]
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "waits": self.waits,
+                "wait_seconds_total": self.wait_seconds,
+                "max_wait_seconds": self.max_wait_seconds,
+                "checkout_latency_seconds_total": self.latency_seconds,
+                "checkout_latency_histogram": buckets,
+            }
+
+
+class _InstrumentedMixin:
+    """Time Pool.connect() into a PoolStats instance"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self):
+        waited = self._max_overflow > -1 and self.checkedout() >= self.size() + self._max_overflow
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.stats.observe(time.perf_counter() - start, waited, timed_out=True)
+            raise
+        self.stats.observe(time.perf_counter() - start, waited)
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedMixin, QueuePool):
+    """QueuePool that records checkout telemetry"""
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout telemetry"""
+
+
+def pool_status(pool: Pool) -> dict:
+    """
+    Return live usage and, for instrumented pools, checkout telemetry.
+    """
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+        })
+    stats: Optional[PoolStats] = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update(stats.snapshot())
+    return status
@@ -0,0 +1,59 @@
+"""
+Fast JSON responses.
+
+FastAPI's default path for a route with a response_model dumps the returned
+object to Python data, validates that against the model again, converts it
+to JSON-compatible values and finally encodes it with json.dumps. For large
+pages of CalculationRead (UUIDs and datetimes on every row) that dominates
+the request.
+
+Two opt-in shortcuts, enabled with FAST_JSON_RESPONSES:
+
+- FastJSONResponse: an orjson-backed JSONResponse used as the app's
+  default_response_class. It still gets FastAPI's validated data, but
+  encodes it several times faster than json.dumps. orjson is optional;
+  without it this is plain JSONResponse.
+- model_response: for routes that already hold a validated Pydantic model,
+  writes it straight to bytes with pydantic-core (model_dump_json) and
+  returns a ModelResponse, which FastAPI passes through untouched.
+"""
+from typing import Union
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+from app.config import settings
+
+try:
+    from fastapi.responses import ORJSONResponse
+    import orjson  # noqa: F401 - ORJSONResponse imports it lazily
+except ImportError:  # pragma: no cover - exercised only without orjson
+    ORJSONResponse = None
+
+FastJSONResponse = ORJSONResponse or JSONResponse
+
+
+class ModelResponse(Response):
+    """Response whose body is a Pydantic model serialized by pydantic-core"""
+    media_type = "application/json"
+
+    def render(self, content: BaseModel) -> bytes:
+        # model_dump_json without the bytes -> str -> bytes round trip
+        return content.__pydantic_serializer__.to_json(content)
+
+
+def default_response_class():
+    """The app-wide response class selected by FAST_JSON_RESPONSES"""
+    return FastJSONResponse if settings.FAST_JSON_RESPONSES else JSONResponse
+
+
+def model_response(model: BaseModel, status_code: int = 200) -> Union[BaseModel, Response]:
+    """
+    Return model as a pre-serialized response when FAST_JSON_RESPONSES is on.
+
+    When it is off the model is returned unchanged for FastAPI's usual
+    validation and encoding, so routes can call this unconditionally.
+    """
+    if not settings.FAST_JSON_RESPONSES:
+        return model
+    return ModelResponse(model, status_code=status_code)
@@ -1,18 +1,268 @@
 """
 Security utilities for password hashing and verification.
+
+bcrypt is deliberately slow (hundreds of milliseconds of CPU per call), so
+async code must not call hash_password/verify_password directly: that would
+stall the event loop and every request on it. hash_password_async and
+verify_password_async run the same functions on a bounded pool of worker
+threads instead. bcrypt releases the GIL while hashing, so the threads hash
+in parallel and the event loop keeps serving other routes.
+
+The pool admits at most PASSWORD_HASH_WORKERS concurrent hashes and
+PASSWORD_HASH_MAX_QUEUE waiting ones. Beyond that, calls fail fast with
+PasswordHasherBusy instead of queueing without bound, so a login storm
+degrades authentication alone.
+
+All hashing goes through the PasswordHasher service (password_hasher), which
+owns the bcrypt cost. calibrate() times bcrypt on this host and picks the
+highest cost whose hash stays under BCRYPT_TARGET_MS, within
+BCRYPT_MIN_ROUNDS..BCRYPT_MAX_ROUNDS; BCRYPT_ROUNDS pins the cost instead.
+Hashes made with a lower cost are reported by needs_rehash, so login can
+upgrade them while it has the plain password.
 """
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
 import bcrypt
 
+from app.config import settings
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+# bcrypt's own default cost, used until calibrate() runs
+DEFAULT_ROUNDS = 12
+
+
+def hash_rounds(hashed_password: str) -> Optional[int]:
+    """Return the cost of a bcrypt hash ("$2b$12$..." -> 12), or None if unparsable"""
+    parts = hashed_password.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def calibrate_rounds(
+    target_ms: float,
+    min_rounds: int,
+    max_rounds: int,
+    timer: Callable[[], float] = time.perf_counter,
+    samples: int = 3,
+) -> int:
+    """
+    Return the highest bcrypt cost whose hash takes at most target_ms here.
+
+    Each extra round doubles the work, so only min_rounds is timed (best of
+    samples) and higher costs are extrapolated. The result never goes below
+    min_rounds, even on hosts too slow to meet the target.
+    """
+    if not 4 <= min_rounds <= max_rounds <= 31:
+        raise ValueError("bcrypt rounds must satisfy 4 <= min_rounds <= max_rounds <= 31")
+    salt = bcrypt.gensalt(rounds=min_rounds)
+    elapsed_ms = float("inf")
+    for _ in range(samples):
+        start = timer()
+        bcrypt.hashpw(b"calibration-password", salt)
+        elapsed_ms = min(elapsed_ms, (timer() - start) * 1000)
+
+    rounds = min_rounds
+    while rounds < max_rounds and elapsed_ms * 2 <= target_ms:
+        rounds += 1
+        elapsed_ms *= 2
+    if elapsed_ms > target_ms:
+        logger.warning(
+            "bcrypt cost %d takes %.0f ms, above the %.0f ms target; using the minimum",
+            rounds, elapsed_ms, target_ms,
+        )
+    return rounds
+
+
+class PasswordHasher:
+    """bcrypt hashing with a configurable or calibrated cost"""
+
+    def __init__(self, rounds: int = DEFAULT_ROUNDS):
+        self.rounds = rounds
+        self.calibrated = False
+        self._dummy_hash: Optional[str] = None
+
+    def calibrate(self, config=settings) -> int:
+        """Set the cost from BCRYPT_ROUNDS or by timing this host; returns it"""
+        if config.BCRYPT_ROUNDS is not None:
+            self.rounds = config.BCRYPT_ROUNDS
+        else:
+            self.rounds = calibrate_rounds(
+                config.BCRYPT_TARGET_MS, config.BCRYPT_MIN_ROUNDS, config.BCRYPT_MAX_ROUNDS
+            )
+        self.calibrated = True
+        self._dummy_hash = None
+        logger.info("bcrypt cost set to %d", self.rounds)
+        return self.rounds
+
+    def hash(self, password: str) -> str:
+        """Hash a password at the current cost"""
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against a hash of any cost"""
+        return bcrypt.checkpw(
+            plain_password.encode('utf-8'),
+            hashed_password.encode('utf-8')
+        )
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """True when the hash was made with a lower cost than the current one"""
+        rounds = hash_rounds(hashed_password)
+        return rounds is None or rounds < self.rounds
+
+    def dummy_hash(self) -> str:
+        """A hash at the current cost, for checks that must cost a real verify"""
+        if self._dummy_hash is None:
+            self._dummy_hash = self.hash("dummy-password")
+        return self._dummy_hash
+
+
+password_hasher = PasswordHasher()
+
 
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt"""
-    salt = bcrypt.gensalt()
-    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+    return password_hasher.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash"""
-    return bcrypt.checkpw(
-        plain_password.encode('utf-8'),
-        hashed_password.encode('utf-8')
-    )
+    return password_hasher.verify(plain_password, hashed_password)
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Raised when the hashing queue is full"""
+
+
+class PasswordHashPool:
+    """Bounded thread pool for bcrypt calls with queue-depth telemetry"""
+
+    def __init__(self, workers: int, max_queue: int):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if max_queue < 0:
+            raise ValueError("max_queue must not be negative")
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.in_flight = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+            return self._executor
+
+    def submit(self, func: Callable[..., T], *args) -> "Future[T]":
+        """
+        Queue func(*args) on the pool.
+
+        Raises:
+        - PasswordHasherBusy: If max_queue calls are already waiting.
+        """
+        executor = self._get_executor()
+        with self._lock:
+            if self.queued + self.in_flight >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise PasswordHasherBusy("Too many password hashing requests in progress")
+            self.queued += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+        submitted = time.perf_counter()
+
+        def run():
+            wait = time.perf_counter() - submitted
+            with self._lock:
+                self.queued -= 1
+                self.in_flight += 1
+                self.total_wait_seconds += wait
+                self.max_wait_seconds = max(self.max_wait_seconds, wait)
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+                    self.completed += 1
+
+        future = executor.submit(run)
+        # A call cancelled before it started never runs, so release its slot here
+        future.add_done_callback(self._release_if_cancelled)
+        return future
+
+    def _release_if_cancelled(self, future: Future) -> None:
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """Await func(*args) on the pool without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(func, *args))
+
+    def stats(self) -> dict:
+        """Snapshot of pool usage counters"""
+        with self._lock:
+            started = self.completed + self.in_flight
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "queued": self.queued,
+                "in_flight": self.in_flight,
+                "peak_queued": self.peak_queued,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_wait_ms": self.total_wait_seconds / started * 1000 if started else 0.0,
+                "max_wait_ms": self.max_wait_seconds * 1000,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker threads; the pool restarts on the next call"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+password_hash_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the bounded hashing pool"""
+    return await password_hash_pool.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the bounded hashing pool"""
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+
+def _verify_against_dummy(plain_password: str) -> bool:
+    password_hasher.verify(plain_password, password_hasher.dummy_hash())
+    return False
+
+
+async def verify_dummy_password_async(plain_password: str) -> bool:
+    """
+    Spend one verify at the current cost and return False.
+
+    Used for unknown usernames so they cost as much as a wrong password.
+    """
+    return await password_hash_pool.run(_verify_against_dummy, plain_password)
@@ -0,0 +1,134 @@
+"""
+JWT access tokens and a cache of verified tokens.
+
+Tokens are HS256 (settings.ALGORITHM) JWTs signed with settings.SECRET_KEY,
+carrying the user id in "sub" and an "exp" ACCESS_TOKEN_EXPIRE_MINUTES
+after issue.
+
+Verifying a signature and loading the user on every request is wasted work
+when the same token comes back many times a minute. VerifiedTokenCache
+keeps, per token, the decoded claims and the resolved User (detached from
+any session) until the earlier of the token's expiry and now + ttl. A
+token therefore never outlives its exp through the cache, and a deleted or
+changed user is picked up within ttl seconds, or immediately where the
+change calls invalidate_user.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+import jwt
+
+from app.config import settings
+
+
+class InvalidTokenError(ValueError):
+    """Raised for tokens that are malformed, expired or wrongly signed"""
+
+
+def create_access_token(user_id: uuid.UUID, expires_delta: Optional[timedelta] = None) -> Tuple[str, datetime]:
+    """Return a signed access token for user_id and its expiry time (UTC)"""
+    now = datetime.now(timezone.utc)
+    expires_at = now + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
+    claims = {"sub": str(user_id), "iat": now, "exp": expires_at, "jti": uuid.uuid4().hex}
+    return jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM), expires_at
+
+
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """
+    Verify a token's signature and expiry and return its claims.
+
+    Raises:
+    - InvalidTokenError: If the token cannot be trusted.
+    """
+    try:
+        claims = jwt.decode(
+            token,
+            settings.SECRET_KEY,
+            algorithms=[settings.ALGORITHM],
+            options={"require": ["sub", "exp"]},
+        )
+        claims["sub"] = uuid.UUID(claims["sub"])
+    except (jwt.PyJWTError, ValueError) as e:
+        raise InvalidTokenError(str(e)) from e
+    return claims
+
+
+class VerifiedTokenCache:
+    """Thread-safe LRU of token -> (claims, user) with per-entry expiry"""
+
+    def __init__(self, max_entries: int, ttl: float, enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, token: str, now: Optional[float] = None):
+        """Return (claims, user) for a cached, unexpired token, else None"""
+        if not self.enabled:
+            return None
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or entry[2] <= now:
+                if entry is not None:
+                    del self._entries[token]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry[0], entry[1]
+
+    def put(self, token: str, claims: Dict[str, Any], user, now: Optional[float] = None) -> None:
+        """Cache a verified token until min(exp, now + ttl)"""
+        if not self.enabled:
+            return
+        now = time.time() if now is None else now
+        expires_at = min(float(claims["exp"]), now + self.ttl)
+        if expires_at <= now:
+            return
+        with self._lock:
+            self._entries[token] = (claims, user, expires_at)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: uuid.UUID) -> None:
+        """Drop every cached token of user_id"""
+        with self._lock:
+            for token in [token for token, (claims, _, _) in self._entries.items() if claims["sub"] == user_id]:
+                del self._entries[token]
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """Return counters and current usage"""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+token_cache = VerifiedTokenCache(
+    max_entries=settings.TOKEN_CACHE_MAX_ENTRIES,
+    ttl=settings.TOKEN_CACHE_TTL_SECONDS,
+    enabled=settings.TOKEN_CACHE_ENABLED,
+)
@@ -0,0 +1,4 @@
+"""
+Benchmarks package - performance measurements for the calculator.
+Run individual modules with `python -m benchmarks.<name>` from the repository root.
+"""
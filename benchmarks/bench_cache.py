@@ -0,0 +1,54 @@
+"""
+Benchmark: result cache hits against computing the result directly.
+
+For each arithmetic fold and input length, times:
+- compute: the fold from app.operations.vectorized, uncached
+- hit:     ResultCache.get_or_compute on a key that is already cached
+           (building the float-tuple key, hashing it and taking the lock)
+
+A cache only pays off where hit is faster than compute. The result cache is
+off by default because this never happens for the arithmetic types: the key
+costs O(n) to build and hash, the same order as the fold itself, with a
+larger constant. Re-run this before enabling RESULT_CACHE_ENABLED.
+
+Usage:
+    python -m benchmarks.bench_cache [--sizes 2 10 100 1000 10000] [--number 2000]
+"""
+import argparse
+import timeit
+
+from app.operations.vectorized import divide_inputs, multiply_inputs, subtract_inputs, sum_inputs
+from app.utils.cache import ResultCache
+
+FOLDS = (
+    ("addition", sum_inputs),
+    ("subtraction", subtract_inputs),
+    ("multiplication", multiply_inputs),
+    ("division", divide_inputs),
+)
+
+
+def per_call_us(func, number, repeat=5):
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2, 10, 100, 1_000, 10_000])
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    cache = ResultCache(max_entries=1000, max_bytes=1 << 30, max_inputs=max(args.sizes))
+    print(f"{'type':<15}{'size':>8}{'compute (us)':>14}{'hit (us)':>10}{'hit/compute':>13}")
+    for kind, fold in FOLDS:
+        for size in args.sizes:
+            inputs = [1.0 + (i % 7) / 10 for i in range(size)]
+            number = max(1, args.number * 10 // max(size, 10))
+            compute = per_call_us(lambda: fold(inputs), number)
+            cache.get_or_compute(kind, inputs, fold)
+            hit = per_call_us(lambda: cache.get_or_compute(kind, inputs, fold), number)
+            print(f"{kind:<15}{size:>8}{compute:>14.2f}{hit:>10.2f}{hit / compute:>12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: sync vs async database sessions under concurrent requests.
+
+Each simulated request creates a calculation, commits, and reads it back.
+- sync:  a sync Session run through anyio.to_thread, which is what FastAPI
+         does for plain `def` routes (threadpool of 40 by default)
+- async: an AsyncSession awaited directly on the event loop
+
+Usage:
+    python -m benchmarks.bench_db_sync_vs_async [--url URL] [--requests 2000] [--concurrency 50]
+
+URL defaults to Settings.DATABASE_URL; the async URL is derived from it.
+"""
+import argparse
+import asyncio
+import time
+
+import anyio
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.database import Base, async_database_url
+from app.models.calculation import Calculation
+from app.models.user import User
+
+
+def sync_request(SessionLocal, user_id):
+    with SessionLocal() as db:
+        calculation = Calculation.create("addition", user_id, [1.0, 2.0])
+        calculation.result = calculation.get_result()
+        db.add(calculation)
+        db.commit()
+        db.get(Calculation, calculation.id)
+
+
+async def async_request(AsyncSessionLocal, user_id):
+    async with AsyncSessionLocal() as db:
+        calculation = Calculation.create("addition", user_id, [1.0, 2.0])
+        calculation.result = calculation.get_result()
+        db.add(calculation)
+        await db.commit()
+        await db.get(Calculation, calculation.id)
+
+
+async def run(total, concurrency, request):
+    """Run total requests with at most concurrency in flight; return requests/second"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await request()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return total / (time.perf_counter() - start)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=settings.DATABASE_URL)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    async_engine = create_async_engine(async_database_url(args.url))
+    SessionLocal = sessionmaker(bind=engine)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        user = User(username="bench_user", email="bench@example.com", password_hash="x")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+
+    try:
+        print(f"{'concurrency':>12}{'sync req/s':>14}{'async req/s':>14}")
+        for concurrency in args.concurrency:
+            sync_rate = await run(
+                args.requests, concurrency, lambda: anyio.to_thread.run_sync(sync_request, SessionLocal, user_id)
+            )
+            async_rate = await run(args.requests, concurrency, lambda: async_request(AsyncSessionLocal, user_id))
+            print(f"{concurrency:>12}{sync_rate:>14.0f}{async_rate:>14.0f}")
+    finally:
+        with SessionLocal() as db:
+            db.query(Calculation).filter(Calculation.user_id == user_id).delete()
+            db.query(User).filter(User.id == user_id).delete()
+            db.commit()
+        await async_engine.dispose()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
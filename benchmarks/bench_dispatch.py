@@ -0,0 +1,111 @@
+"""
+Benchmark: per-request overhead of the table-driven calculate routes.
+
+Compares, in-process over ASGI:
+- legacy: a copy of the original per-operation route (lambda built per call,
+  broad try/except) on an app with the same routers ahead of it
+- alias:  POST /add on the real app, now an alias of /calculate/add
+- calculate: POST /calculate/add on the real app
+
+and, without HTTP, the route handlers called directly (the part of a request
+this repo's code controls), plus the class lookup in Calculation.create with
+the factory dict rebuilt per call (as it was) against CALCULATION_CLASSES.
+
+Usage:
+    python -m benchmarks.bench_dispatch [--requests 5000] [--repeat 3]
+"""
+import argparse
+import asyncio
+import logging
+import time
+import timeit
+
+import httpx
+from fastapi import FastAPI, HTTPException
+
+from app.models.calculation import CALCULATION_CLASSES, Addition, Division, Multiplication, Subtraction
+from app.operations import add
+from app.routers import calculations, monitoring, users
+from app.utils.cache import result_cache
+from main import OperationRequest, OperationResponse, app, calculate_route
+
+logger = logging.getLogger(__name__)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+legacy_app = FastAPI()
+legacy_app.include_router(calculations.router)
+legacy_app.include_router(monitoring.router)
+legacy_app.include_router(users.router)
+
+
+@legacy_app.post("/add", response_model=OperationResponse)
+async def legacy_add_route(operation: OperationRequest):
+    try:
+        result = result_cache.get_or_compute('addition', (operation.a, operation.b), lambda pair: add(*pair))
+        return OperationResponse(result=result)
+    except Exception as e:
+        logger.error(f"Add Operation Error: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def legacy_lookup(calculation_type):
+    calculation_classes = {
+        'addition': Addition,
+        'subtraction': Subtraction,
+        'multiplication': Multiplication,
+        'division': Division,
+    }
+    return calculation_classes.get(calculation_type.lower())
+
+
+def registry_lookup(calculation_type):
+    return CALCULATION_CLASSES.get(calculation_type.lower())
+
+
+async def time_requests(target_app, path, requests):
+    transport = httpx.ASGITransport(app=target_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        for i in range(requests):
+            response = await client.post(path, json={"a": i % 100, "b": 3})
+            assert response.status_code == 200
+        return (time.perf_counter() - start) / requests
+
+
+def run_handler(handler, *args):
+    """Drive a coroutine handler that never awaits to completion"""
+    try:
+        handler(*args).send(None)
+    except StopIteration as done:
+        return done.value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cases = [("legacy", legacy_app, "/add"), ("alias", app, "/add"), ("calculate", app, "/calculate/add")]
+    for name, target_app, path in cases:
+        best = min(asyncio.run(time_requests(target_app, path, args.requests)) for _ in range(args.repeat))
+        print(f"{name:10s} {best * 1e6:8.1f} us/request")
+
+    request = OperationRequest(a=7, b=3)
+    number = 200_000
+    handlers = (
+        ("legacy", lambda: run_handler(legacy_add_route, request)),
+        ("calculate", lambda: run_handler(calculate_route, "add", request)),
+    )
+    for name, call in handlers:
+        best = min(timeit.repeat(call, number=number, repeat=args.repeat))
+        print(f"handler {name:9s} {best / number * 1e9:8.1f} ns/call")
+
+    number = 1_000_000
+    for name, lookup in (("legacy", legacy_lookup), ("registry", registry_lookup)):
+        best = min(timeit.repeat(lambda: lookup('addition'), number=number, repeat=args.repeat))
+        print(f"lookup {name:9s} {best / number * 1e9:8.1f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
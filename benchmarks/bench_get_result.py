@@ -0,0 +1,114 @@
+"""
+Benchmark: Calculation.get_result across input lengths.
+
+Compares the vectorized folds used by the Calculation models against the
+original one-float-at-a-time Python loops, and reports the error of each
+against an exact reference for addition and subtraction.
+
+Usage:
+    python -m benchmarks.bench_get_result [--sizes 10 1000 100000 1000000] [--repeat 5]
+"""
+import argparse
+import random
+import timeit
+import uuid
+from fractions import Fraction
+
+from app.models.calculation import Addition, Subtraction, Multiplication, Division
+from app.utils.cache import result_cache
+
+
+def loop_addition(inputs):
+    return float(sum(inputs))
+
+
+def loop_subtraction(inputs):
+    result = float(inputs[0])
+    for value in inputs[1:]:
+        result -= value
+    return result
+
+
+def loop_multiplication(inputs):
+    result = 1.0
+    for value in inputs:
+        result *= value
+    return result
+
+
+def loop_division(inputs):
+    result = float(inputs[0])
+    for value in inputs[1:]:
+        if value == 0:
+            raise ValueError("Cannot divide by zero")
+        result /= value
+    return result
+
+
+CASES = [
+    ("addition", Addition, loop_addition),
+    ("subtraction", Subtraction, loop_subtraction),
+    ("multiplication", Multiplication, loop_multiplication),
+    ("division", Division, loop_division),
+]
+
+
+def make_inputs(kind, size, rng):
+    """Values near 1.0 keep long products and quotients finite."""
+    if kind in ("multiplication", "division"):
+        return [rng.uniform(0.999, 1.001) for _ in range(size)]
+    return [rng.uniform(-1e6, 1e6) for _ in range(size)]
+
+
+def exact(kind, inputs):
+    """Exact result for addition/subtraction using rational arithmetic."""
+    values = [Fraction(value) for value in inputs]
+    if kind == "addition":
+        return float(sum(values))
+    return float(values[0] - sum(values[1:]))
+
+
+def best_of(func, repeat):
+    number = 1
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=601)
+    args = parser.parse_args()
+
+    # Time the computation, not result cache hits
+    cache_enabled = result_cache.enabled
+    result_cache.enabled = False
+    try:
+        run(args)
+    finally:
+        result_cache.enabled = cache_enabled
+
+
+def run(args):
+    rng = random.Random(args.seed)
+    user_id = uuid.uuid4()
+    print(f"{'type':<15}{'size':>10}{'loop (ms)':>14}{'vectorized (ms)':>18}{'speedup':>10}{'loop err':>12}{'vec err':>12}")
+    for kind, model, loop in CASES:
+        for size in args.sizes:
+            inputs = make_inputs(kind, size, rng)
+            calc = model(user_id=user_id, inputs=inputs)
+            loop_time = best_of(lambda: loop(inputs), args.repeat)
+            vec_time = best_of(calc.get_result, args.repeat)
+            loop_err = vec_err = ""
+            if kind in ("addition", "subtraction") and size <= 100_000:
+                reference = exact(kind, inputs)
+                loop_err = f"{abs(loop(inputs) - reference):.1e}"
+                vec_err = f"{abs(calc.get_result() - reference):.1e}"
+            print(
+                f"{kind:<15}{size:>10}{loop_time * 1e3:>14.3f}{vec_time * 1e3:>18.3f}"
+                f"{loop_time / vec_time:>9.2f}x{loop_err:>12}{vec_err:>12}"
+            )
+
+
+if __name__ == "__main__":
+    main()
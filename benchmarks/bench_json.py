@@ -0,0 +1,109 @@
+"""
+Benchmark: response serialization, FastAPI's default path vs the fast paths.
+
+Serves a prebuilt single OperationResponse and a CalculationPage of --rows
+CalculationRead rows (UUIDs and datetimes on every row) three ways:
+
+- default:   response_model + JSONResponse (validate, jsonable, json.dumps)
+- orjson:    response_model + FastJSONResponse (validate, orjson.dumps)
+- model:     model_response, pydantic-core straight to bytes
+
+Requests go through the ASGI stack in-process with httpx.
+
+Usage:
+    python -m benchmarks.bench_json [--rows 10000] [--repeat 5]
+"""
+import argparse
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from app.schemas.calculation import CalculationPage, CalculationRead
+from app.utils.responses import FastJSONResponse, ModelResponse
+from main import OperationResponse
+
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def make_page(rows):
+    user_id = uuid.uuid4()
+    start = datetime(2025, 1, 1)
+    return CalculationPage(next_cursor=None, items=[
+        CalculationRead(
+            id=uuid.uuid4(), user_id=user_id, type="addition", inputs=[float(i), 2.0], result=i + 2.0,
+            created_at=start + timedelta(seconds=i), updated_at=start + timedelta(seconds=i),
+        )
+        for i in range(rows)
+    ])
+
+
+def build_app(page, single):
+    bench_app = FastAPI()
+
+    @bench_app.get("/default/page", response_model=CalculationPage, response_class=JSONResponse)
+    async def default_page():
+        return page
+
+    @bench_app.get("/orjson/page", response_model=CalculationPage, response_class=FastJSONResponse)
+    async def orjson_page():
+        return page
+
+    @bench_app.get("/model/page", response_model=CalculationPage)
+    async def model_page():
+        return ModelResponse(page)
+
+    @bench_app.get("/default/single", response_model=OperationResponse, response_class=JSONResponse)
+    async def default_single():
+        return single
+
+    @bench_app.get("/orjson/single", response_model=OperationResponse, response_class=FastJSONResponse)
+    async def orjson_single():
+        return single
+
+    @bench_app.get("/model/single", response_model=OperationResponse)
+    async def model_single():
+        return ModelResponse(single)
+
+    return bench_app
+
+
+async def best_time(client, path, repeat, number):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            response = await client.get(path)
+            response.raise_for_status()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+async def run(args):
+    bench_app = build_app(make_page(args.rows), OperationResponse(result=42.0))
+    transport = httpx.ASGITransport(app=bench_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for kind, number in (("single", 2000), ("page", 3)):
+            baseline = None
+            for variant in ("default", "orjson", "model"):
+                elapsed = await best_time(client, f"/{variant}/{kind}", args.repeat, number)
+                baseline = baseline or elapsed
+                unit, scale = ("us", 1e6) if kind == "single" else ("ms", 1e3)
+                print(f"{kind:6s} {variant:8s} {elapsed * scale:10.1f} {unit}  ({baseline / elapsed:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark: per-user statistics from the rollup, a live SQL GROUP BY, and
+aggregating rows in Python.
+
+Fills a calculations table (and its calculation_stats rollup) with --rows
+rows spread over --users users, with --power-share of all rows belonging to
+one power user, then times the statistics query for the power user against
+a GROUP BY over the raw calculations and against fetching that user's rows
+and aggregating them in Python.
+
+Usage:
+    python -m benchmarks.bench_stats [--url URL] [--rows 10000000] [--users 1000]
+
+Filling 10M rows takes minutes; pass --keep to reuse the table on later runs.
+"""
+import argparse
+import random
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import Base
+from app.models.calculation import Calculation
+from app.models.calculation_stats import record_inserted_rows
+from app.models.user import User
+from app.services.stats import user_stats_query
+
+TYPES = ("addition", "subtraction", "multiplication", "division")
+INSERT_CHUNK = 10_000
+
+
+def populate(db, rows, users, power_share, rng):
+    """Insert users and rows with Core executemany; returns the power user's id"""
+    user_ids = [uuid.uuid4() for _ in range(users)]
+    db.execute(insert(User.__table__), [
+        {"id": user_id, "username": f"bench{i}", "email": f"bench{i}@example.com", "password_hash": "x",
+         "created_at": datetime.utcnow()}
+        for i, user_id in enumerate(user_ids)
+    ])
+    power_user = user_ids[0]
+    start = datetime(2024, 1, 1)
+    written = 0
+    while written < rows:
+        batch = []
+        for _ in range(min(INSERT_CHUNK, rows - written)):
+            owner = power_user if rng.random() < power_share else rng.choice(user_ids)
+            a, b = rng.uniform(1, 100), rng.uniform(1, 100)
+            created = start + timedelta(seconds=written)
+            batch.append({
+                "id": uuid.uuid4(), "user_id": owner, "type": rng.choice(TYPES), "inputs": [a, b],
+                "result": a + b, "created_at": created, "updated_at": created,
+            })
+            written += 1
+        db.execute(insert(Calculation.__table__), batch)
+        record_inserted_rows(db.connection(), batch)
+        db.commit()
+    return power_user
+
+
+def live_aggregate_query(user_id):
+    """The statistics query as it was before the rollup existed"""
+    table = Calculation.__table__
+    return (
+        select(
+            table.c.type,
+            func.count(),
+            func.min(table.c.result),
+            func.max(table.c.result),
+            func.avg(table.c.result),
+            func.sum(table.c.result),
+            func.max(table.c.created_at),
+        )
+        .where(table.c.user_id == user_id)
+        .group_by(table.c.user_id, table.c.type)
+    )
+
+
+def python_aggregate(db, user_id):
+    """What the endpoint would do without SQL aggregation"""
+    table = Calculation.__table__
+    groups = defaultdict(list)
+    last = {}
+    for type_, result, created_at in db.execute(
+        select(table.c.type, table.c.result, table.c.created_at).where(table.c.user_id == user_id)
+    ):
+        groups[type_].append(result)
+        last[type_] = max(last.get(type_, created_at), created_at)
+    return {
+        type_: (len(values), min(values), max(values), sum(values) / len(values), sum(values), last[type_])
+        for type_, values in groups.items()
+    }
+
+
+def timed(func_, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func_()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=settings.DATABASE_URL)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--power-share", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--keep", action="store_true", help="reuse an existing benchmark table")
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    with Session(engine) as db:
+        if not args.keep:
+            Base.metadata.drop_all(bind=engine)
+            Base.metadata.create_all(bind=engine)
+            start = time.perf_counter()
+            power_user = populate(db, args.rows, args.users, args.power_share, random.Random(601))
+            print(f"populated {args.rows} rows in {time.perf_counter() - start:.1f}s")
+        else:
+            table = Calculation.__table__
+            power_user = db.execute(
+                select(table.c.user_id).group_by(table.c.user_id).order_by(func.count().desc()).limit(1)
+            ).scalar_one()
+
+        power_rows = db.execute(
+            select(func.count()).where(Calculation.__table__.c.user_id == power_user)
+        ).scalar_one()
+        rollup_time = timed(lambda: db.execute(user_stats_query(power_user)).all(), args.repeat)
+        sql_time = timed(lambda: db.execute(live_aggregate_query(power_user)).all(), args.repeat)
+        python_time = timed(lambda: python_aggregate(db, power_user), args.repeat)
+
+    print(f"power user rows: {power_rows}")
+    print(f"Rollup:             {rollup_time * 1e3:10.1f} ms")
+    print(f"SQL GROUP BY:       {sql_time * 1e3:10.1f} ms  ({sql_time / rollup_time:.1f}x slower)")
+    print(f"Python aggregation: {python_time * 1e3:10.1f} ms  ({python_time / rollup_time:.1f}x slower)")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""
+Load generator: closed-loop asyncio clients against the app, reporting
+throughput, tail latencies and errors.
+
+By default the FastAPI app from main.py is driven in process through
+httpx.ASGITransport (its lifespan runs first, so tables exist and bcrypt is
+calibrated). With --url the same load goes to a running server instead,
+which is what deployment sizing should use.
+
+--concurrency clients each send one request at a time for --duration
+seconds, picking the next request from --mix, a comma-separated list of
+scenario=weight pairs. Scenarios:
+
+    add, subtract, multiply, divide   POST /calculate/{operation}
+    batch                             POST /batch with 100 rows
+    create                            POST /calculations
+    get                               GET /calculations/{id}
+    list                              GET /users/{id}/calculations
+    stats                             GET /users/{id}/calculations/stats
+
+The database scenarios run as a user registered for the run, with a bearer
+token from /users/login; the in-process app uses DATABASE_URL as usual.
+
+Usage:
+    python -m benchmarks.loadtest [--concurrency 32] [--duration 10]
+        [--mix add=4,divide=1,create=1,list=1] [--url http://localhost:8000]
+        [--json report.json]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+import uuid
+from collections import Counter
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+PERCENTILES = (50, 95, 99, 99.9)
+BATCH_ROWS = 100
+LOADTEST_PASSWORD = "LoadTest123!"
+
+
+@dataclass
+class Session:
+    """State shared by all clients: the HTTP client and, for DB scenarios, a user"""
+    client: httpx.AsyncClient
+    rng: random.Random
+    user_id: Optional[str] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    calculation_id: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One kind of request; build returns (method, path, json body or None)"""
+    name: str
+    build: Callable[[Session], tuple]
+    expected_status: int = 200
+    needs_user: bool = False
+
+
+def _operands(session: Session) -> dict:
+    # b stays clear of zero so divide measures the success path
+    return {"a": session.rng.uniform(-1e3, 1e3), "b": session.rng.uniform(1, 1e3)}
+
+
+def _operation(name: str) -> Scenario:
+    return Scenario(name, lambda session: ("POST", f"/calculate/{name}", _operands(session)))
+
+
+def _batch(session: Session) -> tuple:
+    rows = [_operands(session) for _ in range(BATCH_ROWS)]
+    ops = [session.rng.choice(("add", "subtract", "multiply", "divide")) for _ in rows]
+    return "POST", "/batch", {"ops": ops, "a": [row["a"] for row in rows], "b": [row["b"] for row in rows]}
+
+
+def _create(session: Session) -> tuple:
+    inputs = [session.rng.uniform(1, 100) for _ in range(session.rng.randint(2, 5))]
+    return "POST", "/calculations", {"type": session.rng.choice(("addition", "multiplication")), "inputs": inputs}
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    **{name: _operation(name) for name in ("add", "subtract", "multiply", "divide")},
+    "batch": Scenario("batch", _batch),
+    "create": Scenario("create", _create, expected_status=201, needs_user=True),
+    "get": Scenario(
+        "get", lambda session: ("GET", f"/calculations/{session.calculation_id}", None), needs_user=True
+    ),
+    "list": Scenario(
+        "list", lambda session: ("GET", f"/users/{session.user_id}/calculations?limit=50", None), needs_user=True
+    ),
+    "stats": Scenario(
+        "stats", lambda session: ("GET", f"/users/{session.user_id}/calculations/stats", None), needs_user=True
+    ),
+}
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parse 'add=4,divide=1' (a bare name has weight 1) into scenario weights"""
+    mix = {}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        name, _, weight = item.partition("=")
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix[name] = float(weight) if weight else 1.0
+        if mix[name] <= 0:
+            raise ValueError(f"Weight for {name!r} must be positive")
+    if not mix:
+        raise ValueError("The request mix is empty")
+    return mix
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))  # ceil(n * pct / 100)
+    return sorted_values[int(rank) - 1]
+
+
+@dataclass
+class Recorder:
+    """Latencies per scenario and error counts by scenario and cause"""
+    latencies: Dict[str, List[float]] = field(default_factory=dict)
+    errors: Counter = field(default_factory=Counter)
+
+    def record(self, scenario: str, seconds: float, error: Optional[str] = None) -> None:
+        self.latencies.setdefault(scenario, []).append(seconds)
+        if error is not None:
+            self.errors[(scenario, error)] += 1
+
+    def report(self, elapsed: float, concurrency: int, target: str) -> dict:
+        def summary(values: List[float], errors: int) -> dict:
+            values = sorted(values)
+            return {
+                "requests": len(values),
+                "errors": errors,
+                "throughput_rps": len(values) / elapsed if elapsed else 0.0,
+                "latency_ms": {
+                    "mean": sum(values) / len(values) * 1e3 if values else 0.0,
+                    **{f"p{pct:g}": percentile(values, pct) * 1e3 for pct in PERCENTILES},
+                    "max": values[-1] * 1e3 if values else 0.0,
+                },
+            }
+
+        error_counts = Counter()
+        for (scenario, _), count in self.errors.items():
+            error_counts[scenario] += count
+        everything = [value for values in self.latencies.values() for value in values]
+        return {
+            "target": target,
+            "concurrency": concurrency,
+            "duration_s": elapsed,
+            "total": summary(everything, sum(error_counts.values())),
+            "scenarios": {
+                name: summary(values, error_counts[name]) for name, values in sorted(self.latencies.items())
+            },
+            "errors": [
+                {"scenario": scenario, "error": error, "count": count}
+                for (scenario, error), count in self.errors.most_common()
+            ],
+        }
+
+
+async def client_loop(session: Session, mix: Dict[str, float], deadline: float, recorder: Recorder) -> None:
+    names, weights = list(mix), list(mix.values())
+    while time.perf_counter() < deadline:
+        scenario = SCENARIOS[session.rng.choices(names, weights)[0]]
+        method, path, body = scenario.build(session)
+        error = None
+        start = time.perf_counter()
+        try:
+            response = await session.client.request(method, path, json=body, headers=session.headers)
+            if response.status_code != scenario.expected_status:
+                error = f"HTTP {response.status_code}"
+        except httpx.HTTPError as e:
+            error = type(e).__name__
+        recorder.record(scenario.name, time.perf_counter() - start, error)
+
+
+async def prepare_user(session: Session) -> None:
+    """Register and log in a throwaway user, and create a calculation for 'get'"""
+    username = f"loadtest_{uuid.uuid4().hex[:12]}"
+    response = await session.client.post("/users/register", json={
+        "username": username, "email": f"{username}@example.com", "password": LOADTEST_PASSWORD,
+    })
+    response.raise_for_status()
+    session.user_id = response.json()["id"]
+    response = await session.client.post("/users/login", json={"username": username, "password": LOADTEST_PASSWORD})
+    response.raise_for_status()
+    session.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    response = await session.client.post(
+        "/calculations", json={"type": "addition", "inputs": [1.0, 2.0]}, headers=session.headers
+    )
+    response.raise_for_status()
+    session.calculation_id = response.json()["id"]
+
+
+async def run_load(
+    mix: Dict[str, float],
+    concurrency: int,
+    duration: float,
+    url: Optional[str] = None,
+    warmup: float = 1.0,
+    timeout: float = 30.0,
+    seed: Optional[int] = None,
+) -> dict:
+    """Drive the app (in process, or the server at url) and return the report"""
+    async with AsyncExitStack() as stack:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        if url is None:
+            from main import app
+
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest",
+                                       timeout=timeout, limits=limits)
+            target = "in-process"
+        else:
+            client = httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits)
+            target = url
+        await stack.enter_async_context(client)
+
+        session = Session(client=client, rng=random.Random(seed))
+        if any(SCENARIOS[name].needs_user for name in mix):
+            await prepare_user(session)
+
+        if warmup > 0:
+            deadline = time.perf_counter() + warmup
+            await asyncio.gather(*(client_loop(session, mix, deadline, Recorder()) for _ in range(concurrency)))
+
+        recorder = Recorder()
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(client_loop(session, mix, deadline, recorder) for _ in range(concurrency)))
+        return recorder.report(time.perf_counter() - start, concurrency, target)
+
+
+def format_report(report: dict) -> str:
+    header = f"{'scenario':10s} {'requests':>9s} {'errors':>7s} {'req/s':>9s}" + "".join(
+        f" {name:>9s}" for name in ("mean", *(f"p{pct:g}" for pct in PERCENTILES), "max")
+    )
+    lines = [
+        f"target {report['target']}, {report['concurrency']} clients, {report['duration_s']:.1f}s",
+        "",
+        header + "   (latency in ms)",
+    ]
+    rows = [*report["scenarios"].items(), ("total", report["total"])]
+    for name, summary in rows:
+        latency = summary["latency_ms"]
+        lines.append(
+            f"{name:10s} {summary['requests']:9d} {summary['errors']:7d} {summary['throughput_rps']:9.1f}"
+            + "".join(f" {value:9.2f}" for value in latency.values())
+        )
+    if report["errors"]:
+        lines += ["", "errors:"]
+        lines += [f"  {row['count']:7d}  {row['scenario']:10s} {row['error']}" for row in report["errors"]]
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="base URL of a running server (default: drive main.app in process)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of measured load")
+    parser.add_argument("--warmup", type=float, default=1.0, help="seconds of unmeasured load first")
+    parser.add_argument("--mix", default="add=4,subtract=1,multiply=1,divide=1,create=1,list=1")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, help="seed for the request mix and payloads")
+    parser.add_argument("--json", metavar="PATH", help="also write the report as JSON ('-' for stdout only)")
+    args = parser.parse_args(argv)
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    report = asyncio.run(run_load(mix, args.concurrency, args.duration, args.url, args.warmup, args.timeout, args.seed))
+
+    if args.json == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print(format_report(report))
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(report, f, indent=2)
+            print(f"\nreport written to {args.json}")
+    return 1 if report["total"]["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+"""
+Benchmark suite with JSON baselines.
+
+Times, in process:
+- operations.*     the four app.operations functions
+- get_result.*     Calculation.get_result per arithmetic subclass across
+                   input sizes, with the result cache off (the computation
+                   itself)
+- expression.*     compiling a formula, and evaluating it per row and over
+                   columns
+- schemas.*        CalculationCreate / CalculationRead validation and
+                   serialization, single rows and a 500-row page
+- routes.*         main.py routes through httpx.ASGITransport (no server,
+                   no database)
+
+Each case is timed in --repeat rounds of enough iterations to last about
+--min-time seconds; the median per-iteration time is the case's result.
+
+Usage:
+    python -m benchmarks.suite                                  # run and print
+    python -m benchmarks.suite --save benchmarks/baseline.json  # record a baseline
+    python -m benchmarks.suite --compare benchmarks/baseline.json [--threshold 0.2]
+    python -m benchmarks.suite --filter routes.
+
+--compare exits with status 1 when any case is slower than the baseline by
+more than --threshold (a fraction; 0.2 = 20%). Baselines are only
+comparable on the same machine and Python version, which the JSON records.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, get_args
+
+import httpx
+
+from app.models.calculation import CALCULATION_CLASSES
+from app.operations import add, divide, multiply, subtract
+from app.operations.expression import compile_expression
+from app.schemas.calculation import ArithmeticType, CalculationCreate, CalculationPage, CalculationRead
+from app.utils.cache import result_cache
+
+GET_RESULT_SIZES = (10, 1_000, 100_000)
+PAGE_ROWS = 500
+
+
+@dataclass
+class Case:
+    """A named benchmark; fn runs one iteration and may be a coroutine function"""
+    name: str
+    fn: Callable
+    is_async: bool = False
+
+
+CASES: List[Case] = []
+
+
+def case(name: str, is_async: bool = False):
+    """Register fn under name"""
+    def register(fn):
+        CASES.append(Case(name, fn, is_async))
+        return fn
+    return register
+
+
+# --- operations --------------------------------------------------------------
+
+for _name, _function in (("add", add), ("subtract", subtract), ("multiply", multiply), ("divide", divide)):
+    case(f"operations.{_name}")(lambda function=_function: function(7.5, 2.5))
+
+
+# --- get_result --------------------------------------------------------------
+
+def _get_result_case(model, size):
+    calculation = model(user_id=uuid.uuid4(), inputs=[1.0 + (i % 7) / 10 for i in range(size)])
+    return calculation.get_result
+
+
+for _type in get_args(ArithmeticType):
+    for _size in GET_RESULT_SIZES:
+        case(f"get_result.{_type}[{_size}]")(_get_result_case(CALCULATION_CLASSES[_type], _size))
+
+
+# --- expression --------------------------------------------------------------
+
+_FORMULA = "(a + b) * c / d - 2 * a"
+_FORMULA_VALUES = {"a": 1.5, "b": 2.5, "c": 4.0, "d": 3.0}
+_FORMULA_COLUMNS = {
+    name: [value + i % 10 for i in range(GET_RESULT_SIZES[-1])] for name, value in _FORMULA_VALUES.items()
+}
+
+case("expression.compile")(lambda: compile_expression.__wrapped__(_FORMULA))
+case("expression.compile_cached")(lambda: compile_expression(_FORMULA))
+case("expression.evaluate")(lambda: compile_expression(_FORMULA).evaluate(_FORMULA_VALUES))
+case(f"expression.columns[{GET_RESULT_SIZES[-1]}]")(lambda: compile_expression(_FORMULA).evaluate_columns(_FORMULA_COLUMNS))
+
+
+# --- schemas -----------------------------------------------------------------
+
+def _read_row(i: int = 0) -> dict:
+    created = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return {
+        "id": uuid.uuid4(), "user_id": uuid.UUID(int=1), "type": "addition", "inputs": [float(i), 2.0],
+        "result": i + 2.0, "created_at": created, "updated_at": created,
+    }
+
+
+_CREATE_PAYLOAD = {"type": "division", "inputs": [100.0, 2.0, 5.0]}
+_READ_ROW = _read_row()
+_READ_MODEL = CalculationRead.model_validate(_READ_ROW)
+_PAGE_ROWS = [_read_row(i) for i in range(PAGE_ROWS)]
+_PAGE_MODEL = CalculationPage(items=_PAGE_ROWS, next_cursor=None)
+
+case("schemas.create.validate")(lambda: CalculationCreate.model_validate(_CREATE_PAYLOAD))
+case("schemas.read.validate")(lambda: CalculationRead.model_validate(_READ_ROW))
+case("schemas.read.dump_json")(lambda: _READ_MODEL.model_dump_json())
+case(f"schemas.page[{PAGE_ROWS}].validate")(lambda: CalculationPage(items=_PAGE_ROWS, next_cursor=None))
+case(f"schemas.page[{PAGE_ROWS}].dump_json")(lambda: _PAGE_MODEL.model_dump_json())
+
+
+# --- routes ------------------------------------------------------------------
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _route_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        from main import app
+
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+        # routes.divide_by_zero would log a warning per iteration
+        logging.getLogger("main").setLevel(logging.ERROR)
+        _client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+    return _client
+
+
+def _route_case(name: str, method: str, path: str, json_body=None, expected_status: int = 200):
+    async def run():
+        response = await _route_client().request(method, path, json=json_body)
+        if response.status_code != expected_status:
+            raise RuntimeError(f"{method} {path} answered {response.status_code}")
+    case(f"routes.{name}", is_async=True)(run)
+
+
+_route_case("health", "GET", "/health")
+_route_case("calculate.add", "POST", "/calculate/add", {"a": 7.5, "b": 2.5})
+_route_case("alias.divide", "POST", "/divide", {"a": 7.5, "b": 2.5})
+_route_case("divide_by_zero", "POST", "/calculate/divide", {"a": 1, "b": 0}, expected_status=400)
+_route_case("batch[1000]", "POST", "/batch", {
+    "ops": ["add", "subtract", "multiply", "divide"] * 250,
+    "a": [float(i) for i in range(1000)],
+    "b": [float(i % 9 + 1) for i in range(1000)],
+})
+_route_case("batch.expression[1000]", "POST", "/batch/expression", {
+    "expression": _FORMULA,
+    "variables": {name: column[:1000] for name, column in _FORMULA_COLUMNS.items()},
+})
+
+
+# --- runner ------------------------------------------------------------------
+
+def _calibrate_number(run_round: Callable[[int], float], min_time: float) -> int:
+    """Iterations per round so that a round lasts at least min_time"""
+    number = 1
+    while True:
+        elapsed = run_round(number)
+        if elapsed >= min_time or number >= 10_000_000:
+            return number
+        number *= 10 if elapsed < min_time / 10 else 2
+
+
+def _timer_for(bench: Case, loop: asyncio.AbstractEventLoop) -> Callable[[int], float]:
+    if not bench.is_async:
+        def run_round(number: int) -> float:
+            fn = bench.fn
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            return time.perf_counter() - start
+        return run_round
+
+    async def run_async(number: int) -> float:
+        fn = bench.fn
+        start = time.perf_counter()
+        for _ in range(number):
+            await fn()
+        return time.perf_counter() - start
+    return lambda number: loop.run_until_complete(run_async(number))
+
+
+def run_cases(cases: List[Case], repeat: int = 5, min_time: float = 0.2) -> Dict[str, dict]:
+    """Time each case; returns name -> {median_ns, min_ns, number, repeat}"""
+    results = {}
+    loop = asyncio.new_event_loop()
+    cache_enabled = result_cache.enabled
+    result_cache.enabled = False
+    try:
+        for bench in cases:
+            run_round = _timer_for(bench, loop)
+            number = _calibrate_number(run_round, min_time)
+            per_call = [run_round(number) / number for _ in range(repeat)]
+            results[bench.name] = {
+                "median_ns": statistics.median(per_call) * 1e9,
+                "min_ns": min(per_call) * 1e9,
+                "number": number,
+                "repeat": repeat,
+            }
+    finally:
+        result_cache.enabled = cache_enabled
+        if _client is not None:
+            loop.run_until_complete(_client.aclose())
+        loop.close()
+    return results
+
+
+def compare(current: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[dict]:
+    """Per-case ratio of current to baseline median, flagging ratios above 1 + threshold"""
+    rows = []
+    for name, result in current.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        ratio = result["median_ns"] / reference["median_ns"]
+        rows.append({"name": name, "ratio": ratio, "regressed": ratio > 1 + threshold})
+    return rows
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def format_ns(ns: float) -> str:
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:8.2f} {unit}"
+    return f"{ns:8.1f} ns"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="", help="only run cases whose name starts with this prefix")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timing round")
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before flagging")
+    args = parser.parse_args(argv)
+
+    cases = [bench for bench in CASES if bench.name.startswith(args.filter)]
+    if not cases:
+        parser.error(f"no benchmark matches {args.filter!r}")
+    results = run_cases(cases, repeat=args.repeat, min_time=args.min_time)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline["environment"]["python"] != platform.python_version():
+            print(f"warning: baseline was recorded on Python {baseline['environment']['python']}", file=sys.stderr)
+    ratios = {row["name"]: row for row in compare(results, baseline["results"], args.threshold)} if baseline else {}
+
+    width = max(len(name) for name in results)
+    for name, result in results.items():
+        line = f"{name:{width}s} {format_ns(result['median_ns'])}"
+        if name in ratios:
+            row = ratios[name]
+            line += f"  {row['ratio']:5.2f}x baseline" + ("  REGRESSION" if row["regressed"] else "")
+        print(line)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2, sort_keys=True)
+        print(f"baseline written to {args.save}")
+
+    regressions = [row["name"] for row in ratios.values() if row["regressed"]]
+    if regressions:
+        print(f"{len(regressions)} case(s) slower than baseline by more than {args.threshold:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
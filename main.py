@@ -1,19 +1,53 @@
 # main.py
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
 from fastapi.templating import Jinja2Templates
-from pydantic import BaseModel, Field, field_validator  # Use @validator for Pydantic 1.x
+from typing import Annotated, Dict, List, Optional, Tuple
+from pydantic import BaseModel, Field, field_validator, model_validator  # Use @validator for Pydantic 1.x
 from fastapi.exceptions import RequestValidationError
-from app.operations import add, subtract, multiply, divide  # Ensure correct import path
+from sqlalchemy.exc import SQLAlchemyError
+from app.config import settings
+from app.database import init_db
+from app.operations.expression import MAX_EXPRESSION_LENGTH, compile_expression
+from app.operations.registry import OPERATIONS, Operation, OperationName
+from app.operations.vectorized import evaluate_batch
+from app.routers import calculations, health, monitoring, users
+from app.utils.cache import result_cache
+from app.utils.logging_config import configure_logging
+from app.utils.metrics import MetricsMiddleware, mark_worker_dead
+from app.utils.responses import default_response_class, model_response
+from app.utils.security import password_hash_pool, password_hasher
 import uvicorn
 import logging
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
+# Setup logging (queued, JSON, rate limited; see app.utils.logging_config)
+configure_logging()
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create database tables and calibrate the bcrypt cost on startup; stop the
+    hashing threads and retire this worker's live metrics on shutdown.
+    """
+    try:
+        init_db()
+    except SQLAlchemyError as e:
+        logger.warning("Database unavailable at startup, tables not created: %s", e)
+    if not password_hasher.calibrated:
+        await password_hash_pool.run(password_hasher.calibrate)
+    yield
+    password_hash_pool.shutdown()
+    mark_worker_dead()
+
+app = FastAPI(lifespan=lifespan, default_response_class=default_response_class())
+app.add_middleware(MetricsMiddleware)
+app.include_router(calculations.router)
+app.include_router(health.router)
+app.include_router(monitoring.router)
+app.include_router(users.router)
 
 # Setup templates directory
 templates = Jinja2Templates(directory="templates")
@@ -37,20 +71,70 @@ class OperationResponse(BaseModel):
 class ErrorResponse(BaseModel):
     error: str = Field(..., description="Error message")
 
+# Pydantic model for batch request data (row-wise items or columnar arrays)
+class BatchRequest(BaseModel):
+    items: Optional[List[Tuple[OperationName, float, float]]] = Field(
+        None, max_length=settings.BATCH_MAX_SIZE, description="Rows of (op, a, b)"
+    )
+    ops: Optional[List[OperationName]] = Field(
+        None, max_length=settings.BATCH_MAX_SIZE, description="Operation per row"
+    )
+    a: Optional[List[float]] = Field(None, max_length=settings.BATCH_MAX_SIZE, description="First numbers")
+    b: Optional[List[float]] = Field(None, max_length=settings.BATCH_MAX_SIZE, description="Second numbers")
+
+    @model_validator(mode='after')
+    def check_layout(self):
+        columnar = (self.ops, self.a, self.b)
+        if self.items is not None:
+            if any(column is not None for column in columnar):
+                raise ValueError('Provide either items or ops/a/b, not both.')
+        elif any(column is None for column in columnar):
+            raise ValueError('Provide items or all of ops, a and b.')
+        elif not (len(self.ops) == len(self.a) == len(self.b)):
+            raise ValueError('ops, a and b must have the same length.')
+        return self
+
+    def columns(self):
+        """Return the batch as (ops, a, b) columns."""
+        if self.items is None:
+            return self.ops, self.a, self.b
+        if not self.items:
+            return [], [], []
+        ops, a, b = zip(*self.items)
+        return ops, a, b
+
+# Pydantic model for batch response
+class BatchResponse(BaseModel):
+    results: List[Optional[float]] = Field(..., description="Result per row (null where the row failed)")
+    error_mask: List[bool] = Field(..., description="True where the row failed (division by zero)")
+    error_count: int = Field(..., description="Number of failed rows")
+
+# Pydantic model for evaluating one formula over columns of variable values
+class ExpressionBatchRequest(BaseModel):
+    expression: str = Field(
+        ..., min_length=1, max_length=MAX_EXPRESSION_LENGTH, description="Formula, e.g. (a + b) * c / d"
+    )
+    variables: Dict[str, Annotated[List[float], Field(max_length=settings.BATCH_MAX_SIZE)]] = Field(
+        default_factory=dict, description="Column of values per variable, all the same length"
+    )
+
 # Custom Exception Handlers
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
-    logger.error(f"HTTPException on {request.url.path}: {exc.detail}")
+    level = logging.ERROR if exc.status_code >= 500 else logging.WARNING
+    logger.log(level, "HTTPException on %s: %s", request.url.path, exc.detail,
+               extra={"status_code": exc.status_code})
     return JSONResponse(
         status_code=exc.status_code,
         content={"error": exc.detail},
+        headers=exc.headers,
     )
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     # Extracting error messages
     error_messages = "; ".join([f"{err['loc'][-1]}: {err['msg']}" for err in exc.errors()])
-    logger.error(f"ValidationError on {request.url.path}: {error_messages}")
+    logger.warning("ValidationError on %s: %s", request.url.path, error_messages)
     return JSONResponse(
         status_code=400,
         content={"error": error_messages},
@@ -63,56 +147,60 @@ async def read_root(request: Request):
     """
     return templates.TemplateResponse("index.html", {"request": request})
 
-@app.post("/add", response_model=OperationResponse, responses={400: {"model": ErrorResponse}})
-async def add_route(operation: OperationRequest):
-    """
-    Add two numbers.
-    """
+def _calculate(operation: Operation, request: OperationRequest) -> OperationResponse:
     try:
-        result = add(operation.a, operation.b)
-        return OperationResponse(result=result)
-    except Exception as e:
-        logger.error(f"Add Operation Error: {str(e)}")
-        raise HTTPException(status_code=400, detail=str(e))
-
-@app.post("/subtract", response_model=OperationResponse, responses={400: {"model": ErrorResponse}})
-async def subtract_route(operation: OperationRequest):
+        result = result_cache.get_or_compute(operation.calculation_type, (request.a, request.b), operation.compute)
+    except ValueError as e:
+        # Logged once, by the HTTPException handler
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return model_response(OperationResponse(result=result))
+
+@app.post("/calculate/{operation}", response_model=OperationResponse, responses={400: {"model": ErrorResponse}})
+async def calculate_route(operation: OperationName, request: OperationRequest):
     """
-    Subtract two numbers.
+    Apply an operation (add, subtract, multiply, divide) to two numbers.
     """
-    try:
-        result = subtract(operation.a, operation.b)
-        return OperationResponse(result=result)
-    except Exception as e:
-        logger.error(f"Subtract Operation Error: {str(e)}")
-        raise HTTPException(status_code=400, detail=str(e))
-
-@app.post("/multiply", response_model=OperationResponse, responses={400: {"model": ErrorResponse}})
-async def multiply_route(operation: OperationRequest):
+    return _calculate(OPERATIONS[operation], request)
+
+def _alias_route(operation: Operation):
+    async def alias(request: OperationRequest):
+        return _calculate(operation, request)
+    alias.__name__ = f"{operation.name}_route"
+    alias.__doc__ = f"Alias of POST /calculate/{operation.name}."
+    return alias
+
+# The original per-operation routes, kept as aliases of /calculate/{operation}
+for _operation in OPERATIONS.values():
+    app.add_api_route(
+        f"/{_operation.name}",
+        _alias_route(_operation),
+        methods=["POST"],
+        response_model=OperationResponse,
+        responses={400: {"model": ErrorResponse}},
+    )
+
+@app.post("/batch", response_model=BatchResponse, responses={400: {"model": ErrorResponse}})
+async def batch_route(batch: BatchRequest):
     """
-    Multiply two numbers.
+    Evaluate many operations in a single vectorized pass.
+
+    Rows that divide by zero are flagged in error_mask instead of failing the batch.
     """
-    try:
-        result = multiply(operation.a, operation.b)
-        return OperationResponse(result=result)
-    except Exception as e:
-        logger.error(f"Multiply Operation Error: {str(e)}")
-        raise HTTPException(status_code=400, detail=str(e))
-
-@app.post("/divide", response_model=OperationResponse, responses={400: {"model": ErrorResponse}})
-async def divide_route(operation: OperationRequest):
+    results, error_mask = evaluate_batch(*batch.columns())
+    return model_response(BatchResponse(results=results, error_mask=error_mask, error_count=sum(error_mask)))
+
+@app.post("/batch/expression", response_model=BatchResponse, responses={400: {"model": ErrorResponse}})
+async def expression_batch_route(batch: ExpressionBatchRequest):
     """
-    Divide two numbers.
+    Evaluate a formula for every row of the variable columns in a single vectorized pass.
+
+    Rows that divide by zero are flagged in error_mask instead of failing the batch.
     """
     try:
-        result = divide(operation.a, operation.b)
-        return OperationResponse(result=result)
+        results, error_mask = compile_expression(batch.expression).evaluate_columns(batch.variables)
     except ValueError as e:
-        logger.error(f"Divide Operation Error: {str(e)}")
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        logger.error(f"Divide Operation Internal Error: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal Server Error")
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return model_response(BatchResponse(results=results, error_mask=error_mask, error_count=sum(error_mask)))
 
 if __name__ == "__main__":
     uvicorn.run(app, host="127.0.0.1", port=8000)
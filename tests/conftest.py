@@ -5,18 +5,23 @@ Date: October 18, 2025
 """
 import pytest
 from faker import Faker
-from sqlalchemy import create_engine
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import NullPool
 from contextlib import contextmanager
-from app.database import Base
+from app.database import Base, enable_sqlite_foreign_keys, get_async_db, get_db
 from app.models.user import User
+from app.utils.security import hash_password
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Use SQLite for tests (NOT PostgreSQL)
+# Use SQLite for tests (NOT PostgreSQL). The fixtures below use a database
+# under pytest's basetemp; this URL is only used by managed_db_session
 TEST_DATABASE_URL = "sqlite:///./test.db"
 
 fake = Faker()
@@ -31,26 +36,113 @@ def create_fake_user():
     }
 
 
-@pytest.fixture(scope="function")
-def db_session():
-    """Create a fresh database session for each test"""
-    engine = create_engine(TEST_DATABASE_URL)
+def _enable_savepoints(engine):
+    """
+    Let pysqlite run SAVEPOINTs inside an outer transaction.
+
+    The driver otherwise begins and commits transactions on its own, which
+    releases the outer transaction a test runs in.
+    """
+    @event.listens_for(engine, "connect")
+    def _disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+
+@pytest.fixture(scope="session")
+def db_path(tmp_path_factory):
+    """Database file for this test session; each xdist worker has its own basetemp"""
+    return tmp_path_factory.mktemp("db") / "test.db"
+
+
+@pytest.fixture(scope="session")
+def db_engine(db_path):
+    """Engine on the session database, with the schema created once"""
+    engine = create_engine(f"sqlite:///{db_path}")
+    enable_sqlite_foreign_keys(engine)
     Base.metadata.create_all(bind=engine)
-    
-    SessionLocal = sessionmaker(bind=engine)
-    session = SessionLocal()
-    
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def savepoint_engine(db_engine, db_path):
+    """
+    Engine on the same database for tests rolled back at teardown.
+
+    Kept apart from db_engine because its explicit BEGIN also holds read
+    locks, which would block the app's async connection in db_client tests.
+    """
+    engine = create_engine(f"sqlite:///{db_path}")
+    enable_sqlite_foreign_keys(engine)
+    _enable_savepoints(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def db_session(request, db_engine, savepoint_engine):
+    """
+    Database session for one test, leaving the database empty afterwards.
+
+    Tests that only use this session run inside a transaction that is rolled
+    back at teardown; the session's commits become SAVEPOINT releases. Tests
+    that go through db_client commit for real, because the app's async
+    session uses a second connection that must see the data, and the tables
+    are emptied at teardown instead.
+    """
+    if "db_client" in request.fixturenames:
+        session = Session(bind=db_engine)
+        yield session
+        session.close()
+        with db_engine.begin() as connection:
+            for table in reversed(Base.metadata.sorted_tables):
+                connection.execute(table.delete())
+        return
+
+    connection = savepoint_engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
     yield session
-    
     session.close()
-    Base.metadata.drop_all(bind=engine)
+    transaction.rollback()
+    connection.close()
 
 
 @pytest.fixture
-def test_user(db_session):
+def db_client(db_session, db_path):
+    """TestClient whose sync and async database dependencies use the test database"""
+    from main import app
+
+    # NullPool: aiosqlite connections must not outlive the TestClient event loop
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool)
+    enable_sqlite_foreign_keys(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncSessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="session")
+def test_password_hash():
+    """bcrypt hash of the fixture users' password, computed once per session"""
+    return hash_password("TestPassword123")
+
+
+@pytest.fixture
+def test_user(db_session, test_password_hash):
     """Create a test user"""
-    user = User(username="testuser", email="test@example.com")
-    user.set_password("TestPassword123")
+    user = User(username="testuser", email="test@example.com", password_hash=test_password_hash)
     db_session.add(user)
     db_session.commit()
     db_session.refresh(user)
@@ -58,13 +150,24 @@ def test_user(db_session):
 
 
 @pytest.fixture
-def seed_users(db_session):
+def auth_client(db_client, test_user):
+    """db_client authenticated as test_user with a bearer token"""
+    from app.utils.tokens import create_access_token, token_cache
+
+    token_cache.clear()
+    access_token, _ = create_access_token(test_user.id)
+    db_client.headers["Authorization"] = f"Bearer {access_token}"
+    yield db_client
+    token_cache.clear()
+
+
+@pytest.fixture
+def seed_users(db_session, test_password_hash):
     """Seed multiple test users"""
     users = []
     for _ in range(3):
         user_data = create_fake_user()
-        user = User(username=user_data['username'], email=user_data['email'])
-        user.set_password(user_data['password'])
+        user = User(username=user_data['username'], email=user_data['email'], password_hash=test_password_hash)
         users.append(user)
         db_session.add(user)
     db_session.commit()
@@ -0,0 +1,122 @@
+"""
+Integration tests for login, bearer authentication and ownership checks.
+"""
+from app.models.calculation import Calculation
+from app.models.user import User
+from app.utils.security import PasswordHasher, hash_rounds, password_hasher
+from app.utils.tokens import create_access_token, token_cache
+
+
+def login(client, username='testuser', password='TestPassword123'):
+    return client.post('/users/login', json={'username': username, 'password': password})
+
+
+def test_login_issues_usable_token(db_client, test_user):
+    """Test a token from login authenticates calculation routes"""
+    token_cache.clear()
+    response = login(db_client)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body['token_type'] == 'bearer'
+    headers = {'Authorization': f"Bearer {body['access_token']}"}
+    created = db_client.post('/calculations', json={'type': 'addition', 'inputs': [1, 2]}, headers=headers)
+    assert created.status_code == 201
+    assert created.json()['user_id'] == str(test_user.id)
+
+
+def test_login_rejects_bad_credentials(db_client, test_user):
+    """Test wrong passwords and unknown users get the same 401"""
+    wrong_password = login(db_client, password='WrongPassword1')
+    unknown_user = login(db_client, username='nobody')
+
+    assert wrong_password.status_code == unknown_user.status_code == 401
+    assert wrong_password.json() == unknown_user.json()
+    assert wrong_password.headers['www-authenticate'] == 'Bearer'
+
+
+def test_routes_require_token(db_client, test_user):
+    """Test calculation routes reject missing and invalid tokens"""
+    assert db_client.post('/calculations', json={'type': 'addition', 'inputs': [1, 2]}).status_code == 401
+    response = db_client.get(f'/users/{test_user.id}/calculations', headers={'Authorization': 'Bearer nonsense'})
+    assert response.status_code == 401
+
+
+def test_verified_token_is_cached(auth_client, test_user):
+    """Test repeated requests reuse the verified token and user"""
+    auth_client.get(f'/users/{test_user.id}/calculations')
+    before = token_cache.stats()
+    auth_client.get(f'/users/{test_user.id}/calculations')
+    after = token_cache.stats()
+
+    assert after['hits'] == before['hits'] + 1
+    assert after['entries'] == 1
+
+
+def test_deleted_user_token_rejected_after_invalidation(db_client, db_session, test_user):
+    """Test a token of a deleted user stops working once its cache entry is gone"""
+    token_cache.clear()
+    token, _ = create_access_token(test_user.id)
+    headers = {'Authorization': f'Bearer {token}'}
+    assert db_client.get(f'/users/{test_user.id}/calculations', headers=headers).status_code == 200
+
+    db_session.delete(test_user)
+    db_session.commit()
+    token_cache.invalidate_user(test_user.id)
+
+    assert db_client.get(f'/users/{test_user.id}/calculations', headers=headers).status_code == 401
+
+
+def test_other_users_calculations_are_hidden(auth_client, db_session, test_user):
+    """Test users cannot read, change or create others' calculations"""
+    other = User(username='otheruser', email='other@example.com', password_hash='x')
+    db_session.add(other)
+    db_session.commit()
+    calc = Calculation.create('addition', other.id, [1.0, 2.0])
+    db_session.add(calc)
+    db_session.commit()
+
+    assert auth_client.get(f'/calculations/{calc.id}').status_code == 404
+    assert auth_client.put(f'/calculations/{calc.id}', json={'inputs': [3, 4]}).status_code == 404
+    assert auth_client.delete(f'/calculations/{calc.id}').status_code == 404
+    assert auth_client.post(
+        f'/calculations?user_id={other.id}', json={'type': 'addition', 'inputs': [1, 2]}
+    ).status_code == 403
+    assert auth_client.post('/calculations/bulk', json=[
+        {'type': 'addition', 'user_id': str(other.id), 'inputs': [1, 2]},
+    ]).status_code == 403
+    assert auth_client.get(f'/users/{other.id}/calculations').status_code == 403
+    assert auth_client.get(f'/users/{other.id}/calculations/stats').status_code == 403
+
+
+def test_token_cache_stats_endpoint(db_client):
+    """Test the token cache reports its counters"""
+    response = db_client.get('/auth/token-cache')
+    assert response.status_code == 200
+    assert {'entries', 'hits', 'misses', 'ttl_seconds'} <= set(response.json())
+
+
+def test_login_upgrades_outdated_hash(db_client, db_session, test_user, monkeypatch):
+    """Test a hash below the current cost is replaced on successful login"""
+    monkeypatch.setattr(password_hasher, 'rounds', 5)
+    test_user.password_hash = PasswordHasher(rounds=4).hash('TestPassword123')
+    db_session.commit()
+
+    assert login(db_client).status_code == 200
+
+    db_session.expire_all()
+    assert hash_rounds(test_user.password_hash) == 5
+    assert test_user.verify_password('TestPassword123') is True
+
+
+def test_failed_login_keeps_hash(db_client, db_session, test_user, monkeypatch):
+    """Test a wrong password never triggers a rehash"""
+    monkeypatch.setattr(password_hasher, 'rounds', 5)
+    old_hash = PasswordHasher(rounds=4).hash('TestPassword123')
+    test_user.password_hash = old_hash
+    db_session.commit()
+
+    assert login(db_client, password='WrongPassword1').status_code == 401
+
+    db_session.expire_all()
+    assert test_user.password_hash == old_hash
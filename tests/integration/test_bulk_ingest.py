@@ -0,0 +1,101 @@
+"""
+Integration tests for bulk calculation ingest.
+"""
+import uuid
+import pytest
+from app.config import settings
+from app.models.calculation import Calculation, Division
+from app.services.ingest import bulk_ingest
+
+
+def test_bulk_ingest_chunks_and_results(db_session, test_user):
+    """Test rows are written in chunks with computed results"""
+    rows = (
+        ('addition', test_user.id, [float(i), 1.0]) for i in range(25)
+    )
+    summary = bulk_ingest(db_session, rows, chunk_size=10)
+
+    assert summary.inserted == 25
+    assert summary.chunks == 3
+    calculations = db_session.query(Calculation).all()
+    assert len(calculations) == 25
+    assert sorted(calc.result for calc in calculations) == [float(i) + 1.0 for i in range(25)]
+
+
+def test_bulk_ingest_polymorphic_rows(db_session, test_user):
+    """Test ingested rows load as their ORM subclasses"""
+    bulk_ingest(db_session, [('division', test_user.id, [12.0, 3.0])])
+
+    calc = db_session.query(Calculation).one()
+    assert isinstance(calc, Division)
+    assert calc.result == 4.0
+
+
+def test_bulk_ingest_invalid_row_reports_position(db_session, test_user):
+    """Test an invalid row stops the ingest after committing earlier chunks"""
+    rows = [
+        ('addition', test_user.id, [1.0, 2.0]),
+        ('division', test_user.id, [1.0, 0.0]),
+    ]
+    with pytest.raises(ValueError, match="Row 1: Cannot divide by zero"):
+        bulk_ingest(db_session, rows, chunk_size=1)
+    assert db_session.query(Calculation).count() == 1
+
+
+def test_bulk_ingest_rejects_bad_chunk_size(db_session):
+    """Test chunk_size must be positive"""
+    with pytest.raises(ValueError, match="chunk_size"):
+        bulk_ingest(db_session, [], chunk_size=-1)
+
+
+def test_bulk_ingest_endpoint(auth_client, db_session, test_user):
+    """Test the bulk ingest endpoint"""
+    user_id = str(test_user.id)
+    response = auth_client.post('/calculations/bulk?chunk_size=2', json=[
+        {'type': 'addition', 'user_id': user_id, 'inputs': [1, 2]},
+        {'type': 'multiplication', 'user_id': user_id, 'inputs': [3, 4]},
+        {'type': 'subtraction', 'user_id': user_id, 'inputs': [9, 4]},
+    ])
+
+    assert response.status_code == 201
+    assert response.json() == {'inserted': 3, 'chunks': 2}
+    assert db_session.query(Calculation).count() == 3
+
+
+def test_bulk_ingest_endpoint_validation(auth_client):
+    """Test invalid rows are rejected before anything is written"""
+    response = auth_client.post('/calculations/bulk', json=[
+        {'type': 'division', 'user_id': str(uuid.uuid4()), 'inputs': [1, 0]},
+    ])
+    assert response.status_code == 400
+    assert 'error' in response.json()
+
+
+def test_bulk_ingest_endpoint_item_cap(auth_client, db_session, test_user):
+    """Test a body with more than BULK_MAX_ITEMS rows is rejected before anything is written"""
+    item = {'type': 'addition', 'user_id': str(test_user.id), 'inputs': [1, 2]}
+    response = auth_client.post('/calculations/bulk', json=[item] * (settings.BULK_MAX_ITEMS + 1))
+    assert response.status_code == 400
+    assert db_session.query(Calculation).count() == 0
+
+
+def test_bulk_ingest_rejects_references(auth_client, db_session, test_user):
+    """Test expressions with references are rejected before anything is written"""
+    base = auth_client.post('/calculations', json={'type': 'addition', 'inputs': [1, 2]}).json()
+    user_id = str(test_user.id)
+    response = auth_client.post('/calculations/bulk?chunk_size=1', json=[
+        {'type': 'addition', 'user_id': user_id, 'inputs': [1, 2]},
+        {'type': 'expression', 'user_id': user_id,
+         'inputs': {'expression': 'x + 1', 'references': {'x': base['id']}}},
+    ])
+
+    assert response.status_code == 400
+    assert 'Row 1' in response.json()['error']
+    assert db_session.query(Calculation).count() == 1
+
+
+def test_bulk_ingest_function_rejects_references(db_session, test_user):
+    """Test bulk_ingest itself refuses rows it could not store edges for"""
+    rows = [('expression', test_user.id, {'expression': 'x', 'references': {'x': uuid.uuid4()}})]
+    with pytest.raises(ValueError, match="Row 0: References"):
+        bulk_ingest(db_session, rows)
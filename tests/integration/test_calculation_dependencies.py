@@ -0,0 +1,201 @@
+"""
+Integration tests for dependent calculations and incremental recomputation.
+"""
+import uuid
+
+from sqlalchemy import func, select, update
+
+from app.models.calculation import Calculation
+from app.models.calculation_dependency import CalculationDependency
+from app.services.consistency import check_results
+from app.services.dependencies import downstream_edges, save_calculation
+from app.services.rollup import verify_rollup
+
+
+def create(client, type_, inputs):
+    """Create a calculation through the API and return its JSON"""
+    response = client.post('/calculations', json={'type': type_, 'inputs': inputs})
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def reference(expression, **references):
+    """Expression inputs whose variables all reference calculations by id"""
+    return {'expression': expression, 'references': {name: calc['id'] for name, calc in references.items()}}
+
+
+def test_create_with_references(auth_client, db_session):
+    """Test referenced results are copied into the variables and an edge is stored"""
+    base = create(auth_client, 'addition', [1.0, 2.0])
+    dependent = create(auth_client, 'expression', reference('x * 10', x=base))
+
+    assert dependent['result'] == 30.0
+    assert dependent['inputs']['variables'] == {'x': 3.0}
+    assert dependent['inputs']['references'] == {'x': base['id']}
+    edge = db_session.get(CalculationDependency, (uuid.UUID(dependent['id']), 'x'))
+    assert edge.dependency_id == uuid.UUID(base['id'])
+
+
+def test_update_recomputes_downstream_in_order(auth_client, db_session):
+    """Test an update reaches dependents of dependents, and a diamond sees both new inputs"""
+    base = create(auth_client, 'addition', [1.0, 1.0])
+    left = create(auth_client, 'expression', reference('a + 1', a=base))
+    right = create(auth_client, 'expression', reference('a * 2', a=base))
+    bottom = create(auth_client, 'expression', reference('l + r', l=left, r=right))
+    unrelated = create(auth_client, 'addition', [5.0, 5.0])
+    assert bottom['result'] == 7.0
+
+    response = auth_client.put(f"/calculations/{base['id']}", json={'inputs': [10.0, 0.0]})
+    assert response.status_code == 200
+
+    assert auth_client.get(f"/calculations/{left['id']}").json()['result'] == 11.0
+    assert auth_client.get(f"/calculations/{right['id']}").json()['result'] == 20.0
+    assert auth_client.get(f"/calculations/{bottom['id']}").json()['result'] == 31.0
+    assert auth_client.get(f"/calculations/{unrelated['id']}").json() == unrelated
+    assert verify_rollup(db_session).ok
+
+
+def test_update_failing_downstream_rolls_back(auth_client):
+    """Test a dependent that can no longer be computed rejects the whole update"""
+    base = create(auth_client, 'addition', [1.0, 1.0])
+    dependent = create(auth_client, 'expression', reference('1 / b', b=base))
+
+    response = auth_client.put(f"/calculations/{base['id']}", json={'inputs': [1.0, -1.0]})
+    assert response.status_code == 400
+    assert 'Cannot divide by zero' in response.json()['error']
+    assert auth_client.get(f"/calculations/{base['id']}").json()['result'] == 2.0
+    assert auth_client.get(f"/calculations/{dependent['id']}").json()['result'] == 0.5
+
+
+def test_cycle_rejected(auth_client):
+    """Test references that would form a cycle are rejected"""
+    first = create(auth_client, 'expression', {'expression': 'a', 'variables': {'a': 1.0}})
+    second = create(auth_client, 'expression', reference('a + 1', a=first))
+
+    response = auth_client.put(f"/calculations/{first['id']}", json={'inputs': reference('b * 2', b=second)})
+    assert response.status_code == 400
+    assert 'cycle' in response.json()['error']
+
+    response = auth_client.put(f"/calculations/{first['id']}", json={'inputs': reference('c', c=first)})
+    assert response.status_code == 400
+    assert 'itself' in response.json()['error']
+
+
+def test_reference_must_exist_for_user(auth_client):
+    """Test references to unknown calculations are rejected"""
+    missing = {'id': str(uuid.uuid4())}
+    response = auth_client.post('/calculations', json={'type': 'expression', 'inputs': reference('a', a=missing)})
+    assert response.status_code == 400
+    assert 'not found' in response.json()['error']
+
+
+def test_delete_referenced_calculation_conflicts(auth_client, db_session):
+    """Test a referenced calculation cannot be deleted until its dependents are"""
+    base = create(auth_client, 'addition', [1.0, 2.0])
+    dependent = create(auth_client, 'expression', reference('x', x=base))
+
+    assert auth_client.delete(f"/calculations/{base['id']}").status_code == 409
+    assert auth_client.delete(f"/calculations/{dependent['id']}").status_code == 204
+    assert auth_client.delete(f"/calculations/{base['id']}").status_code == 204
+    assert db_session.scalar(select(func.count()).select_from(CalculationDependency)) == 0
+
+
+def _expression(db_session, user, expression, **references):
+    calculation = Calculation.create('expression', user.id, {
+        'expression': expression, 'references': {name: calc.id for name, calc in references.items()},
+    })
+    save_calculation(db_session, calculation)
+    return calculation
+
+
+def test_wide_fan_out_recomputed_in_batches(db_session, test_user):
+    """Test every dependent of a wide fan-out is recomputed with small batches"""
+    base = Calculation.create('addition', test_user.id, [1.0, 1.0])
+    save_calculation(db_session, base)
+    dependents = [_expression(db_session, test_user, f'x + {i}', x=base) for i in range(25)]
+    total = _expression(db_session, test_user, 'a + b', a=dependents[0], b=dependents[-1])
+
+    base.inputs = [5.0, 5.0]
+    assert save_calculation(db_session, base, batch_size=4) == 26
+    db_session.expire_all()
+    assert [calc.result for calc in dependents] == [10.0 + i for i in range(25)]
+    assert total.result == 10.0 + 34.0
+
+
+def test_update_of_expired_calculation_recomputes(db_session, test_user):
+    """Test the old result is read before the change is flushed when the instance was expired"""
+    base = Calculation.create('addition', test_user.id, [1.0, 1.0])
+    save_calculation(db_session, base)
+    dependent = _expression(db_session, test_user, 'x * 3', x=base)
+
+    db_session.expire_all()
+    base.inputs = [2.0, 2.0]
+    assert save_calculation(db_session, base) == 1
+    assert dependent.result == 12.0
+
+
+def test_unchanged_result_recomputes_nothing(db_session, test_user):
+    """Test dependents are left alone when an update keeps the same result"""
+    base = Calculation.create('addition', test_user.id, [1.0, 2.0])
+    save_calculation(db_session, base)
+    _expression(db_session, test_user, 'x * 2', x=base)
+
+    base.inputs = [2.0, 1.0]
+    assert save_calculation(db_session, base) == 0
+
+
+def test_unchanged_dependent_stops_propagation(db_session, test_user):
+    """Test a dependent whose result does not change does not recompute its own dependents"""
+    base = Calculation.create('addition', test_user.id, [1.0, 2.0])
+    save_calculation(db_session, base)
+    flat = _expression(db_session, test_user, 'x * 0', x=base)
+    _expression(db_session, test_user, 'y + 1', y=flat)
+
+    base.inputs = [4.0, 4.0]
+    assert save_calculation(db_session, base) == 1
+    assert len(downstream_edges(db_session, base.id)) == 2
+
+
+def _corrupt_inputs(db_session, calculation, inputs):
+    """Change stored inputs behind the ORM, leaving the stored result stale"""
+    table = Calculation.__table__
+    db_session.execute(update(table).where(table.c.id == calculation.id).values(inputs=inputs))
+    db_session.commit()
+
+
+def test_consistency_repair_recomputes_dependents(db_session, test_user):
+    """Test a repaired result reaches dependents, which would otherwise still look consistent"""
+    base = Calculation.create('addition', test_user.id, [1.0, 2.0])
+    save_calculation(db_session, base)
+    middle = _expression(db_session, test_user, 'x * 10', x=base)
+    top = _expression(db_session, test_user, 'y + 1', y=middle)
+    db_session.commit()
+    _corrupt_inputs(db_session, base, [5.0, 5.0])
+
+    report = check_results(db_session, repair=True, chunk_size=1)
+
+    assert (report.stale, report.repaired, report.dependents_recomputed) == (1, 1, 2)
+    db_session.expire_all()
+    assert (base.result, middle.result, top.result) == (10.0, 100.0, 101.0)
+    assert middle.inputs['variables'] == {'x': 10.0}
+    assert check_results(db_session).stale == 0
+    assert verify_rollup(db_session).ok
+
+
+def test_consistency_repair_blocked_by_dependent(db_session, test_user):
+    """Test a repair whose dependent cannot be recomputed is skipped and reported"""
+    base = Calculation.create('addition', test_user.id, [1.0, 1.0])
+    save_calculation(db_session, base)
+    dependent = _expression(db_session, test_user, '1 / b', b=base)
+    other = Calculation.create('addition', test_user.id, [1.0, 1.0])
+    save_calculation(db_session, other)
+    db_session.commit()
+    _corrupt_inputs(db_session, base, [1.0, -1.0])
+    _corrupt_inputs(db_session, other, [2.0, 2.0])
+
+    report = check_results(db_session, repair=True)
+
+    assert report.blocked_ids == [str(base.id)]
+    assert report.repaired == 1
+    db_session.expire_all()
+    assert (base.result, dependent.result, other.result) == (2.0, 0.5, 4.0)
@@ -0,0 +1,72 @@
+"""
+Integration tests for streaming calculation export.
+"""
+import csv
+import gzip
+import io
+import json
+from datetime import datetime, timedelta
+from app.models.calculation import Calculation
+from app.services.export import iter_calculation_batches
+
+
+def seed_history(db_session, user, count=5):
+    """Insert calculations one minute apart"""
+    start = datetime(2025, 1, 1)
+    calcs = []
+    for i in range(count):
+        calc = Calculation.create('addition', user.id, [float(i), 1.0])
+        calc.created_at = start + timedelta(minutes=i)
+        calcs.append(calc)
+    db_session.add_all(calcs)
+    db_session.commit()
+    return calcs
+
+
+def test_batches_are_bounded(db_session, test_user):
+    """Test rows are read in batches of the requested size"""
+    seed_history(db_session, test_user, count=5)
+    batches = list(iter_calculation_batches(db_session.get_bind(), test_user.id, batch_size=2))
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+
+
+def test_export_ndjson(auth_client, db_session, test_user):
+    """Test NDJSON export returns every row oldest first"""
+    calcs = seed_history(db_session, test_user)
+    response = auth_client.get(f'/users/{test_user.id}/calculations/export')
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('application/x-ndjson')
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row['id'] for row in rows] == [str(calc.id) for calc in calcs]
+    assert rows[0]['result'] == 1.0
+    assert rows[0]['inputs'] == [0.0, 1.0]
+
+
+def test_export_csv_gzip(auth_client, db_session, test_user):
+    """Test gzip-compressed CSV export"""
+    seed_history(db_session, test_user, count=3)
+    response = auth_client.get(f'/users/{test_user.id}/calculations/export?format=csv&gzip=true')
+
+    assert response.status_code == 200
+    assert response.headers['content-disposition'].endswith('.csv.gz"')
+    rows = list(csv.DictReader(io.StringIO(gzip.decompress(response.content).decode())))
+    assert len(rows) == 3
+    assert json.loads(rows[2]['inputs']) == [2.0, 1.0]
+
+
+def test_export_resume_from_cursor(auth_client, db_session, test_user):
+    """Test resuming after a row's cursor skips everything up to it"""
+    calcs = seed_history(db_session, test_user)
+    url = f'/users/{test_user.id}/calculations/export'
+    first = [json.loads(line) for line in auth_client.get(url).text.splitlines()]
+
+    response = auth_client.get(url, params={'cursor': first[1]['cursor']})
+    resumed = [json.loads(line) for line in response.text.splitlines()]
+    assert [row['id'] for row in resumed] == [str(calc.id) for calc in calcs[2:]]
+
+
+def test_export_invalid_cursor(auth_client, test_user):
+    """Test a malformed cursor is rejected before streaming starts"""
+    response = auth_client.get(f'/users/{test_user.id}/calculations/export?cursor=bad')
+    assert response.status_code == 400
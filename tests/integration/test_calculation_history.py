@@ -0,0 +1,92 @@
+"""
+Integration tests for keyset-paginated calculation history.
+"""
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from app.config import settings
+from app.models.calculation import Calculation
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+def seed_history(db_session, user, count=5):
+    """Insert calculations one minute apart, alternating types"""
+    start = datetime(2025, 1, 1)
+    calcs = []
+    for i in range(count):
+        calc = Calculation.create('addition' if i % 2 == 0 else 'multiplication', user.id, [float(i), 2.0])
+        calc.created_at = start + timedelta(minutes=i)
+        calcs.append(calc)
+    db_session.add_all(calcs)
+    db_session.commit()
+    return calcs
+
+
+def test_cursor_round_trip(test_user):
+    """Test cursors decode to the position they encode"""
+    created_at = datetime(2025, 1, 1, 12, 30, 15, 123456)
+    assert decode_cursor(encode_cursor(created_at, test_user.id)) == (created_at, test_user.id)
+
+
+def test_pages_newest_first(auth_client, db_session, test_user):
+    """Test walking every page returns each calculation once, newest first"""
+    calcs = seed_history(db_session, test_user)
+    url = f'/users/{test_user.id}/calculations?limit=2'
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        response = auth_client.get(url + (f'&cursor={cursor}' if cursor else ''))
+        assert response.status_code == 200
+        page = response.json()
+        seen.extend(item['id'] for item in page['items'])
+        pages += 1
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert seen == [str(calc.id) for calc in reversed(calcs)]
+
+
+def test_type_filter(auth_client, db_session, test_user):
+    """Test filtering by calculation type"""
+    seed_history(db_session, test_user)
+    response = auth_client.get(f'/users/{test_user.id}/calculations?type=multiplication')
+
+    items = response.json()['items']
+    assert [item['type'] for item in items] == ['multiplication', 'multiplication']
+    assert response.json()['next_cursor'] is None
+
+
+def test_invalid_cursor(auth_client, test_user):
+    """Test a malformed cursor is rejected"""
+    response = auth_client.get(f'/users/{test_user.id}/calculations?cursor=not-a-cursor')
+    assert response.status_code == 400
+
+
+def test_keyset_query_uses_composite_index(db_session, test_user):
+    """Test the page query is served by the composite index, not a scan and sort"""
+    plan = db_session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT id FROM calculations "
+        "WHERE user_id = :user_id AND (created_at, id) < (:created_at, :id) "
+        "ORDER BY created_at DESC, id DESC LIMIT 10"
+    ), {"user_id": test_user.id.hex, "created_at": "2025-01-01 00:00:00", "id": test_user.id.hex}).all()
+    details = " ".join(row[-1] for row in plan)
+
+    assert "ix_calculations_user_created_id" in details
+    assert "TEMP B-TREE" not in details
+
+
+def test_history_fast_json_matches_default(auth_client, db_session, test_user, monkeypatch):
+    """Test the pre-serialized page is identical to FastAPI's encoding"""
+    for i in range(3):
+        db_session.add(Calculation.create('addition', test_user.id, [float(i), 1.0]))
+    db_session.commit()
+    url = f'/users/{test_user.id}/calculations?limit=2'
+
+    default = auth_client.get(url)
+    monkeypatch.setattr(settings, 'FAST_JSON_RESPONSES', True)
+    fast = auth_client.get(url)
+
+    assert fast.status_code == default.status_code == 200
+    assert fast.headers['content-type'] == 'application/json'
+    assert fast.json() == default.json()
@@ -0,0 +1,74 @@
+"""
+Integration tests for streaming NDJSON import.
+"""
+import asyncio
+import json
+from app.models.calculation import Calculation
+from app.services.imports import iter_lines
+
+
+async def collect_lines(chunks, max_line_bytes=100):
+    """Run iter_lines over a list of byte chunks"""
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+    return [line async for line in iter_lines(stream(), max_line_bytes)]
+
+
+def test_iter_lines_across_chunk_boundaries():
+    """Test lines split across chunks are reassembled"""
+    lines = asyncio.run(collect_lines([b'{"a"', b': 1}\n{"b": 2', b'}\n', b'last']))
+    assert lines == [b'{"a": 1}', b'{"b": 2}', b'last']
+
+
+def test_iter_lines_oversized_line():
+    """Test an oversized line is dropped without keeping it in memory"""
+    lines = asyncio.run(collect_lines([b'x' * 60, b'x' * 60, b'\nok\n'], max_line_bytes=100))
+    assert lines == [None, b'ok']
+
+
+def test_import_ndjson(auth_client, db_session, test_user):
+    """Test valid lines are inserted and invalid ones reported by line number"""
+    body = "\n".join([
+        '{"type": "addition", "inputs": [1, 2]}',
+        '',
+        '{"type": "division", "inputs": [1, 0]}',
+        'not json',
+        '{"type": "multiplication", "inputs": [3, 4]}',
+        '{"type": "subtraction", "inputs": [10, 4]}',
+    ])
+    response = auth_client.post(
+        f'/users/{test_user.id}/calculations/import?chunk_size=2',
+        content=body.encode(),
+        headers={'Content-Type': 'application/x-ndjson'},
+    )
+
+    assert response.status_code == 200
+    summary = response.json()
+    assert (summary['lines'], summary['inserted'], summary['failed']) == (5, 3, 2)
+    assert [error['line'] for error in summary['errors']] == [3, 4]
+    assert 'Cannot divide by zero' in summary['errors'][0]['error']
+
+    results = sorted(calc.result for calc in db_session.query(Calculation).all())
+    assert results == [3.0, 6.0, 12.0]
+
+
+def test_import_rejects_references(auth_client, db_session, test_user):
+    """Test expression lines with references are reported instead of stored without their edges"""
+    base = auth_client.post('/calculations', json={'type': 'addition', 'inputs': [1, 2]}).json()
+    body = "\n".join([
+        json.dumps({'type': 'expression', 'inputs': {'expression': 'x * 2', 'references': {'x': base['id']}}}),
+        json.dumps({'type': 'expression', 'inputs': {'expression': 'x * 2', 'variables': {'x': 3}}}),
+    ])
+    response = auth_client.post(
+        f'/users/{test_user.id}/calculations/import',
+        content=body.encode(),
+        headers={'Content-Type': 'application/x-ndjson'},
+    )
+
+    assert response.status_code == 200
+    summary = response.json()
+    assert (summary['inserted'], summary['failed']) == (1, 1)
+    assert summary['errors'][0]['line'] == 1
+    assert 'one at a time' in summary['errors'][0]['error']
+    assert db_session.query(Calculation).count() == 2
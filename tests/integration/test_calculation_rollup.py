@@ -0,0 +1,194 @@
+"""
+Integration tests for the calculation_stats rollup.
+"""
+from datetime import date, datetime
+import uuid
+import pytest
+from sqlalchemy import event, insert, update
+from app.models.calculation import Calculation
+from app.models.calculation_stats import CalculationStat, recompute_buckets, record_inserted_rows
+from app.services.consistency import check_results
+from app.services.ingest import bulk_ingest
+from app.services.rollup import rebuild_rollup, verify_rollup
+
+
+def _add(db_session, user_id, type_, inputs, created_at):
+    calc = Calculation.create(type_, user_id, inputs)
+    calc.created_at = created_at
+    db_session.add(calc)
+    return calc
+
+
+def _bucket(db_session, user_id, type_, day):
+    db_session.expire_all()
+    return db_session.get(CalculationStat, (user_id, type_, day))
+
+
+def test_insert_increments_bucket(db_session, test_user):
+    """Test inserts in separate flushes accumulate into one bucket per day"""
+    _add(db_session, test_user.id, 'addition', [1.0, 2.0], datetime(2025, 1, 1, 9))
+    db_session.commit()
+    _add(db_session, test_user.id, 'addition', [10.0, 20.0], datetime(2025, 1, 1, 17))
+    _add(db_session, test_user.id, 'addition', [0.5, 0.5], datetime(2025, 1, 2, 8))
+    db_session.commit()
+
+    bucket = _bucket(db_session, test_user.id, 'addition', date(2025, 1, 1))
+    assert (bucket.count, bucket.sum_result, bucket.min_result, bucket.max_result) == (2, 33.0, 3.0, 30.0)
+    assert bucket.last_activity == datetime(2025, 1, 1, 17)
+    assert _bucket(db_session, test_user.id, 'addition', date(2025, 1, 2)).count == 1
+    assert verify_rollup(db_session).ok
+
+
+def test_update_recomputes_bucket(db_session, test_user):
+    """Test changing inputs can shrink the bucket's max"""
+    _add(db_session, test_user.id, 'addition', [1.0, 2.0], datetime(2025, 1, 1))
+    calc = _add(db_session, test_user.id, 'addition', [10.0, 20.0], datetime(2025, 1, 1))
+    db_session.commit()
+
+    calc.inputs = [1.0, 1.0]
+    db_session.commit()
+
+    bucket = _bucket(db_session, test_user.id, 'addition', date(2025, 1, 1))
+    assert (bucket.count, bucket.sum_result, bucket.max_result) == (2, 5.0, 3.0)
+
+
+def test_moving_calculation_between_days(db_session, test_user):
+    """Test an update of created_at moves the row to the other bucket"""
+    calc = _add(db_session, test_user.id, 'addition', [1.0, 2.0], datetime(2025, 1, 1))
+    db_session.commit()
+
+    calc.created_at = datetime(2025, 1, 5)
+    db_session.commit()
+
+    assert _bucket(db_session, test_user.id, 'addition', date(2025, 1, 1)) is None
+    assert _bucket(db_session, test_user.id, 'addition', date(2025, 1, 5)).count == 1
+
+
+def test_delete_recomputes_and_drops_empty_bucket(db_session, test_user):
+    """Test deletes shrink buckets and remove them when empty"""
+    first = _add(db_session, test_user.id, 'division', [9.0, 3.0], datetime(2025, 1, 1))
+    second = _add(db_session, test_user.id, 'division', [8.0, 2.0], datetime(2025, 1, 1))
+    db_session.commit()
+
+    db_session.delete(first)
+    db_session.commit()
+    bucket = _bucket(db_session, test_user.id, 'division', date(2025, 1, 1))
+    assert (bucket.count, bucket.min_result, bucket.max_result) == (1, 4.0, 4.0)
+
+    db_session.delete(second)
+    db_session.commit()
+    assert _bucket(db_session, test_user.id, 'division', date(2025, 1, 1)) is None
+
+
+def test_recompute_upserts_bucket(db_session, test_user):
+    """Test a recompute writes non-empty buckets with an upsert, creating or overwriting the row"""
+    _add(db_session, test_user.id, 'addition', [1.0, 2.0], datetime(2025, 1, 1))
+    db_session.commit()
+    table = CalculationStat.__table__
+    key = (test_user.id, 'addition', date(2025, 1, 1))
+    statements = []
+    connection = db_session.connection()
+    event.listen(connection, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    db_session.execute(table.update().values(count=7, sum_result=0.0))
+    recompute_buckets(connection, [key])
+    db_session.execute(table.delete())
+    recompute_buckets(connection, [key])
+
+    assert not any(sql.lstrip().upper().startswith("DELETE FROM CALCULATION_STATS WHERE") for sql in statements)
+    bucket = _bucket(db_session, *key)
+    assert (bucket.count, bucket.result_count, bucket.sum_result) == (1, 1, 3.0)
+    assert verify_rollup(db_session).ok
+
+
+def test_bulk_ingest_updates_rollup(db_session, test_user):
+    """Test Core bulk writes are reflected in the rollup"""
+    rows = [('multiplication', test_user.id, [float(i), 2.0]) for i in range(1, 6)]
+    bulk_ingest(db_session, rows, chunk_size=2)
+
+    today = db_session.query(Calculation).first().created_at.date()
+    bucket = _bucket(db_session, test_user.id, 'multiplication', today)
+    assert (bucket.count, bucket.sum_result, bucket.min_result, bucket.max_result) == (5, 30.0, 2.0, 10.0)
+    assert verify_rollup(db_session).ok
+
+
+def _insert_without_result(db_session, user_id, type_, created_at):
+    row = {
+        'id': uuid.uuid4(), 'user_id': user_id, 'type': type_, 'inputs': [1.0, 2.0],
+        'result': None, 'created_at': created_at, 'updated_at': created_at,
+    }
+    db_session.execute(insert(Calculation.__table__), [row])
+    record_inserted_rows(db_session.connection(), [row])
+
+
+def test_rows_without_result(db_session, test_user):
+    """Test rows without a result count towards count but not result_count, and keep the sum NULL"""
+    _insert_without_result(db_session, test_user.id, 'addition', datetime(2025, 1, 1, 9))
+    db_session.commit()
+    bucket = _bucket(db_session, test_user.id, 'addition', date(2025, 1, 1))
+    assert (bucket.count, bucket.result_count, bucket.sum_result) == (1, 0, None)
+    assert verify_rollup(db_session).ok
+
+    _add(db_session, test_user.id, 'addition', [2.0, 3.0], datetime(2025, 1, 1, 10))
+    db_session.commit()
+    bucket = _bucket(db_session, test_user.id, 'addition', date(2025, 1, 1))
+    assert (bucket.count, bucket.result_count, bucket.sum_result) == (2, 1, 5.0)
+    assert verify_rollup(db_session).ok
+
+
+def test_verify_tells_null_sum_from_zero(db_session, test_user):
+    """Test a zero sum stored for a bucket without results is a mismatch"""
+    _insert_without_result(db_session, test_user.id, 'addition', datetime(2025, 1, 1))
+    db_session.execute(update(CalculationStat.__table__).values(sum_result=0.0))
+    db_session.commit()
+
+    assert verify_rollup(db_session).mismatched == 1
+
+
+def test_consistency_repair_updates_rollup(db_session, test_user):
+    """Test repaired results are reflected in the rollup"""
+    _add(db_session, test_user.id, 'addition', [1.0, 2.0], datetime(2025, 1, 1))
+    db_session.commit()
+    db_session.execute(update(Calculation.__table__).values(result=100.0))
+    db_session.commit()
+    assert not verify_rollup(db_session).ok
+
+    check_results(db_session, repair=True)
+
+    assert _bucket(db_session, test_user.id, 'addition', date(2025, 1, 1)).sum_result == 3.0
+    assert verify_rollup(db_session).ok
+
+
+def test_verify_reports_drift_and_rebuild_fixes_it(db_session, test_user):
+    """Test verification finds missing, extra and wrong buckets"""
+    _add(db_session, test_user.id, 'addition', [1.0, 2.0], datetime(2025, 1, 1))
+    _add(db_session, test_user.id, 'subtraction', [5.0, 2.0], datetime(2025, 1, 1))
+    db_session.commit()
+    table = CalculationStat.__table__
+    db_session.execute(table.delete().where(table.c.type == 'addition'))
+    db_session.execute(table.update().values(count=7))
+    db_session.execute(table.insert().values(
+        user_id=test_user.id, type='division', day=date(2025, 1, 3), count=1
+    ))
+    db_session.commit()
+
+    diff = verify_rollup(db_session)
+    assert (diff.missing, diff.extra, diff.mismatched) == (1, 1, 1)
+    assert not diff.ok
+
+    assert rebuild_rollup(db_session) == 2
+    diff = verify_rollup(db_session)
+    assert diff.ok
+    assert diff.buckets_checked == 2
+
+
+@pytest.mark.parametrize('inputs, expected', [([1.0, 2.0], 3.0), ([0.1, 0.2], 0.30000000000000004)])
+def test_rebuild_matches_incremental(db_session, test_user, inputs, expected):
+    """Test a rebuild reproduces what incremental maintenance wrote"""
+    _add(db_session, test_user.id, 'addition', inputs, datetime(2025, 2, 1))
+    db_session.commit()
+    before = _bucket(db_session, test_user.id, 'addition', date(2025, 2, 1)).sum_result
+
+    rebuild_rollup(db_session)
+
+    assert before == _bucket(db_session, test_user.id, 'addition', date(2025, 2, 1)).sum_result == expected
@@ -0,0 +1,98 @@
+"""
+Integration tests for the async calculation CRUD routes.
+"""
+import uuid
+
+
+def create_calculation(client, user_id, type_='addition', inputs=(1.0, 2.0)):
+    """Create a calculation through the API and return the response"""
+    return client.post(
+        f'/calculations?user_id={user_id}',
+        json={'type': type_, 'inputs': list(inputs)},
+    )
+
+
+def test_create_calculation(auth_client, test_user):
+    """Test creating a calculation stores its result"""
+    response = create_calculation(auth_client, test_user.id, 'multiplication', [2.0, 3.0, 4.0])
+
+    assert response.status_code == 201
+    body = response.json()
+    assert body['type'] == 'multiplication'
+    assert body['result'] == 24.0
+    assert body['user_id'] == str(test_user.id)
+
+
+def test_create_expression_calculation(auth_client, test_user):
+    """Test creating an expression calculation evaluates its formula"""
+    inputs = {'expression': '(a + b) * c / d', 'variables': {'a': 1.0, 'b': 2.0, 'c': 4.0, 'd': 3.0}}
+    response = auth_client.post('/calculations', json={'type': 'expression', 'inputs': inputs})
+
+    assert response.status_code == 201
+    assert response.json()['inputs'] == inputs
+    assert response.json()['result'] == 4.0
+
+
+def test_create_expression_missing_variable(auth_client):
+    """Test a formula using a variable without a value is rejected"""
+    inputs = {'expression': 'a + b', 'variables': {'a': 1.0}}
+    response = auth_client.post('/calculations', json={'type': 'expression', 'inputs': inputs})
+
+    assert response.status_code == 400
+    assert 'No value for variable(s): b' in response.json()['error']
+
+
+def test_update_expression_calculation(auth_client):
+    """Test replacing an expression's variables recomputes the result"""
+    created = auth_client.post('/calculations', json={
+        'type': 'expression', 'inputs': {'expression': 'x * y', 'variables': {'x': 2.0, 'y': 3.0}},
+    }).json()
+
+    response = auth_client.put(f"/calculations/{created['id']}", json={
+        'inputs': {'expression': 'x * y', 'variables': {'x': 5.0, 'y': 3.0}},
+    })
+    assert response.status_code == 200
+    assert response.json()['result'] == 15.0
+
+
+def test_read_calculation(auth_client, test_user):
+    """Test reading a calculation by ID"""
+    created = create_calculation(auth_client, test_user.id).json()
+
+    response = auth_client.get(f"/calculations/{created['id']}")
+    assert response.status_code == 200
+    assert response.json() == created
+
+
+def test_read_missing_calculation(auth_client):
+    """Test reading an unknown calculation returns 404"""
+    response = auth_client.get(f'/calculations/{uuid.uuid4()}')
+    assert response.status_code == 404
+    assert response.json() == {'error': 'Calculation not found'}
+
+
+def test_update_calculation(auth_client, test_user):
+    """Test updating inputs recomputes the result"""
+    created = create_calculation(auth_client, test_user.id, 'subtraction', [10.0, 3.0]).json()
+
+    response = auth_client.put(f"/calculations/{created['id']}", json={'inputs': [20.0, 5.0, 5.0]})
+    assert response.status_code == 200
+    assert response.json()['inputs'] == [20.0, 5.0, 5.0]
+    assert response.json()['result'] == 10.0
+
+
+def test_update_calculation_divide_by_zero(auth_client, test_user):
+    """Test an update that cannot be computed is rejected and not saved"""
+    created = create_calculation(auth_client, test_user.id, 'division', [10.0, 2.0]).json()
+
+    response = auth_client.put(f"/calculations/{created['id']}", json={'inputs': [10.0, 0.0]})
+    assert response.status_code == 400
+    assert auth_client.get(f"/calculations/{created['id']}").json()['result'] == 5.0
+
+
+def test_delete_calculation(auth_client, test_user):
+    """Test deleting a calculation"""
+    created = create_calculation(auth_client, test_user.id).json()
+
+    assert auth_client.delete(f"/calculations/{created['id']}").status_code == 204
+    assert auth_client.get(f"/calculations/{created['id']}").status_code == 404
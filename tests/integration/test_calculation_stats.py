@@ -0,0 +1,70 @@
+"""
+Integration tests for per-user calculation statistics.
+"""
+import uuid
+from datetime import datetime
+import pytest
+from sqlalchemy import insert
+from app.models.calculation import Calculation
+from app.models.calculation_stats import record_inserted_rows
+from app.models.user import User
+
+
+def test_user_stats(auth_client, db_session, test_user):
+    """Test aggregates per type are computed in the database"""
+    other = User(username="otheruser", email="other@example.com", password_hash="x")
+    db_session.add(other)
+    inputs = [
+        ('addition', [1.0, 2.0]),
+        ('addition', [10.0, 20.0]),
+        ('division', [9.0, 3.0]),
+    ]
+    for i, (type_, values) in enumerate(inputs):
+        calc = Calculation.create(type_, test_user.id, values)
+        calc.created_at = datetime(2025, 1, 1 + i)
+        db_session.add(calc)
+    db_session.commit()
+    db_session.add(Calculation.create('addition', other.id, [100.0, 100.0]))
+    db_session.commit()
+
+    response = auth_client.get(f'/users/{test_user.id}/calculations/stats')
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body['total_count'] == 3
+    assert body['last_activity'] == '2025-01-03T00:00:00'
+    addition, division = body['types']
+    assert addition['type'] == 'addition'
+    assert addition['count'] == 2
+    assert (addition['min_result'], addition['max_result'], addition['sum_result']) == (3.0, 30.0, 33.0)
+    assert addition['avg_result'] == pytest.approx(16.5)
+    assert addition['last_activity'] == '2025-01-02T00:00:00'
+    assert division['count'] == 1
+    assert division['sum_result'] == 3.0
+
+
+def test_user_stats_skip_rows_without_result(auth_client, db_session, test_user):
+    """Test avg and sum ignore rows without a result, as AVG/SUM(result) do"""
+    db_session.add(Calculation.create('addition', test_user.id, [1.0, 3.0]))
+    db_session.commit()
+    table = Calculation.__table__
+    rows = [
+        {'id': uuid.uuid4(), 'user_id': test_user.id, 'type': type_, 'inputs': [1.0, 2.0],
+         'result': None, 'created_at': datetime(2025, 1, 1), 'updated_at': datetime(2025, 1, 1)}
+        for type_ in ('addition', 'division')
+    ]
+    db_session.execute(insert(table), rows)
+    record_inserted_rows(db_session.connection(), rows)
+    db_session.commit()
+
+    addition, division = auth_client.get(f'/users/{test_user.id}/calculations/stats').json()['types']
+    assert (addition['count'], addition['avg_result'], addition['sum_result']) == (2, 4.0, 4.0)
+    assert (division['count'], division['avg_result'], division['sum_result']) == (1, None, None)
+
+
+def test_user_stats_empty(auth_client, test_user):
+    """Test a user without calculations"""
+    response = auth_client.get(f'/users/{test_user.id}/calculations/stats')
+    assert response.json()['total_count'] == 0
+    assert response.json()['types'] == []
+    assert response.json()['last_activity'] is None
@@ -152,3 +152,141 @@ def test_divide_by_zero_api(client):
     # Assert that the 'error' field contains the correct error message
     assert "Cannot divide by zero!" in response.json()['error'], \
         f"Expected error message 'Cannot divide by zero!', got '{response.json()['error']}'"
+
+# ---------------------------------------------
+# Test Function: test_batch_api_items
+# ---------------------------------------------
+
+def test_batch_api_items(client):
+    """
+    Test the Batch API Endpoint with row-wise items.
+
+    Steps:
+    1. Send a POST request to `/batch` with a list of `[op, a, b]` rows, one of which divides by zero.
+    2. Assert that the response status code is `200 OK`.
+    3. Assert that the failing row is flagged in the error mask and the others are computed.
+    """
+    response = client.post('/batch', json={'items': [['add', 10, 5], ['divide', 1, 0], ['multiply', 2, 4]]})
+
+    assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+    body = response.json()
+    assert body['results'] == [15, None, 8]
+    assert body['error_mask'] == [False, True, False]
+    assert body['error_count'] == 1
+
+# ---------------------------------------------
+# Test Function: test_batch_api_columns
+# ---------------------------------------------
+
+def test_batch_api_columns(client):
+    """
+    Test the Batch API Endpoint with columnar ops/a/b arrays.
+
+    Steps:
+    1. Send a POST request to `/batch` with `ops`, `a` and `b` arrays.
+    2. Assert that the response status code is `200 OK` and the results are correct.
+    """
+    response = client.post('/batch', json={'ops': ['subtract', 'divide'], 'a': [10, 9], 'b': [4, 3]})
+
+    assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+    assert response.json()['results'] == [6, 3]
+
+# ---------------------------------------------
+# Test Function: test_batch_api_invalid_layout
+# ---------------------------------------------
+
+def test_batch_api_invalid_layout(client):
+    """
+    Test the Batch API Endpoint rejects mismatched columns.
+
+    Steps:
+    1. Send a POST request to `/batch` with `a` and `b` arrays of different lengths.
+    2. Assert that the response status code is `400 Bad Request` with an 'error' field.
+    """
+    response = client.post('/batch', json={'ops': ['add'], 'a': [1, 2], 'b': [3]})
+
+    assert response.status_code == 400, f"Expected status code 400, got {response.status_code}"
+    assert 'error' in response.json(), "Response JSON does not contain 'error' field"
+
+# ---------------------------------------------
+# Test Function: test_expression_batch_api
+# ---------------------------------------------
+
+def test_expression_batch_api(client):
+    """
+    Test the Expression Batch API Endpoint.
+
+    Steps:
+    1. Send a POST request to `/batch/expression` with a formula and a column per variable.
+    2. Assert that the response status code is `200 OK`.
+    3. Assert that each row is computed and the row dividing by zero is flagged.
+    """
+    response = client.post('/batch/expression', json={
+        'expression': '(a + b) / c',
+        'variables': {'a': [1, 2, 3], 'b': [3, 2, 1], 'c': [2, 0, 8]},
+    })
+
+    assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+    body = response.json()
+    assert body['results'] == [2.0, None, 0.5]
+    assert body['error_mask'] == [False, True, False]
+    assert body['error_count'] == 1
+
+# ---------------------------------------------
+# Test Function: test_expression_batch_api_invalid
+# ---------------------------------------------
+
+def test_expression_batch_api_invalid(client):
+    """
+    Test the Expression Batch API Endpoint rejects a malformed formula.
+
+    Steps:
+    1. Send a POST request to `/batch/expression` with an unbalanced parenthesis.
+    2. Assert that the response status code is `400 Bad Request` with an 'error' field.
+    """
+    response = client.post('/batch/expression', json={'expression': '(a + b', 'variables': {'a': [1], 'b': [2]}})
+
+    assert response.status_code == 400, f"Expected status code 400, got {response.status_code}"
+    assert 'parenthesis' in response.json()['error']
+
+# ---------------------------------------------
+# Test Function: test_calculate_api
+# ---------------------------------------------
+
+@pytest.mark.parametrize("operation, expected", [
+    ('add', 15), ('subtract', 5), ('multiply', 50), ('divide', 2),
+])
+def test_calculate_api(client, operation, expected):
+    """
+    Test the generic Calculate API Endpoint for every operation.
+
+    Steps:
+    1. Send a POST request to `/calculate/{operation}` with `{'a': 10, 'b': 5}`.
+    2. Assert that the result matches the one from the alias route `/{operation}`.
+    """
+    response = client.post(f'/calculate/{operation}', json={'a': 10, 'b': 5})
+    alias = client.post(f'/{operation}', json={'a': 10, 'b': 5})
+
+    assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+    assert response.json()['result'] == expected
+    assert alias.json() == response.json()
+
+# ---------------------------------------------
+# Test Function: test_calculate_api_errors
+# ---------------------------------------------
+
+def test_calculate_api_errors(client):
+    """
+    Test the generic Calculate API Endpoint rejects unknown operations and division by zero.
+
+    Steps:
+    1. Send a POST request to `/calculate/power` and assert `400 Bad Request`.
+    2. Send a POST request to `/calculate/divide` with `b` = 0 and assert the error message.
+    """
+    unknown = client.post('/calculate/power', json={'a': 2, 'b': 3})
+    assert unknown.status_code == 400, f"Expected status code 400, got {unknown.status_code}"
+    assert 'operation' in unknown.json()['error']
+
+    response = client.post('/calculate/divide', json={'a': 10, 'b': 0})
+    assert response.status_code == 400, f"Expected status code 400, got {response.status_code}"
+    assert "Cannot divide by zero!" in response.json()['error']
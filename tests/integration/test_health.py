@@ -0,0 +1,48 @@
+"""
+Integration tests for the liveness and readiness endpoints.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.routers.health import readiness_check
+from main import app
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def readiness_engine(tmp_path, monkeypatch):
+    """Point the readiness check at a scratch database"""
+    def use(path):
+        monkeypatch.setattr(readiness_check, "engine", create_async_engine(f"sqlite+aiosqlite:///{path}"))
+        monkeypatch.setattr(readiness_check, "other_engines", [])
+        readiness_check.invalidate()
+    yield use
+    readiness_check.invalidate()
+
+
+def test_health(client):
+    """Test liveness always answers ok"""
+    response = client.get('/health')
+    assert response.status_code == 200
+    assert response.json() == {'status': 'ok'}
+
+
+def test_ready(client, readiness_engine, tmp_path):
+    """Test readiness with a reachable database"""
+    readiness_engine(tmp_path / 'ready.db')
+    response = client.get('/ready')
+    assert response.status_code == 200
+    assert response.json()['database'] == 'ok'
+
+
+def test_not_ready(client, readiness_engine, tmp_path):
+    """Test readiness answers 503 when the database is unreachable"""
+    readiness_engine(tmp_path / 'missing' / 'ready.db')
+    response = client.get('/ready')
+    assert response.status_code == 503
+    assert response.json()['ready'] is False
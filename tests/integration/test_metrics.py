@@ -0,0 +1,67 @@
+"""
+Integration tests for request metrics and the /metrics endpoint.
+"""
+import os
+import subprocess
+import sys
+from fastapi.testclient import TestClient
+from prometheus_client.parser import text_string_to_metric_families
+from app.utils.metrics import render_metrics
+from main import app
+
+
+def sample_value(text, name, **labels):
+    """Value of the sample with this name and labels, or 0.0 if absent"""
+    for family in text_string_to_metric_families(text):
+        for sample in family.samples:
+            if sample.name == name and all(sample.labels.get(k) == v for k, v in labels.items()):
+                return sample.value
+    return 0.0
+
+
+def test_requests_are_counted_by_route_template():
+    """Test counts and latencies use route templates and response status"""
+    client = TestClient(app)
+    before = client.get('/metrics').text
+
+    client.post('/add', json={'a': 1, 'b': 2})
+    client.post('/calculate/divide', json={'a': 1, 'b': 0})
+    client.get('/no-such-route')
+    after = client.get('/metrics')
+
+    assert after.headers['content-type'].startswith('text/plain')
+    text = after.text
+    for labels, increase in (
+        ({'method': 'POST', 'route': '/add', 'status': '200'}, 1),
+        ({'method': 'POST', 'route': '/calculate/{operation}', 'status': '400'}, 1),
+        ({'method': 'GET', 'route': '<unmatched>', 'status': '404'}, 1),
+    ):
+        assert sample_value(text, 'http_requests_total', **labels) - \
+            sample_value(before, 'http_requests_total', **labels) == increase
+        assert sample_value(text, 'http_request_duration_seconds_count', **labels) - \
+            sample_value(before, 'http_request_duration_seconds_count', **labels) == increase
+    assert sample_value(text, 'http_requests_in_progress', method='POST') == 0
+
+
+WORKER_SCRIPT = """
+from fastapi.testclient import TestClient
+from main import app
+client = TestClient(app)
+for _ in range({requests}):
+    client.post('/add', json={{'a': 1, 'b': 2}})
+"""
+
+
+def test_multiprocess_metrics_aggregate_workers(tmp_path, monkeypatch):
+    """Test /metrics in multiprocess mode sums the requests of every worker"""
+    env = {'PROMETHEUS_MULTIPROC_DIR': str(tmp_path)}
+    for requests in (2, 3):
+        subprocess.run(
+            [sys.executable, '-c', WORKER_SCRIPT.format(requests=requests)],
+            env={**os.environ, **env}, check=True, capture_output=True,
+        )
+
+    monkeypatch.setenv('PROMETHEUS_MULTIPROC_DIR', str(tmp_path))
+    body, _ = render_metrics()
+
+    assert sample_value(body.decode(), 'http_requests_total', method='POST', route='/add', status='200') == 5
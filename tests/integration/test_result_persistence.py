@@ -0,0 +1,57 @@
+"""
+Integration tests for results stored at write time and the consistency checker.
+"""
+import pytest
+from sqlalchemy import update
+from app.models.calculation import Calculation
+from app.services.consistency import check_results
+
+
+def add_calculation(db_session, user, type_, inputs):
+    """Insert a calculation through the ORM"""
+    calc = Calculation.create(type_, user.id, inputs)
+    db_session.add(calc)
+    db_session.commit()
+    return calc
+
+
+def test_result_stored_on_insert(db_session, test_user):
+    """Test the result column is filled when the row is inserted"""
+    calc = add_calculation(db_session, test_user, 'multiplication', [2.0, 5.0])
+    assert calc.result == 10.0
+
+
+def test_result_recomputed_when_inputs_change(db_session, test_user):
+    """Test reassigning inputs updates the stored result"""
+    calc = add_calculation(db_session, test_user, 'addition', [1.0, 2.0])
+    calc.inputs = [10.0, 20.0, 30.0]
+    db_session.commit()
+    db_session.expire_all()
+    assert db_session.get(Calculation, calc.id).result == 60.0
+
+
+def test_invalid_inputs_rejected_on_insert(db_session, test_user):
+    """Test a result that cannot be computed blocks the insert"""
+    db_session.add(Calculation.create('division', test_user.id, [1.0, 0.0]))
+    with pytest.raises(ValueError, match="Cannot divide by zero"):
+        db_session.commit()
+
+
+def test_check_results_finds_and_repairs(db_session, test_user):
+    """Test NULL and stale results are detected and repaired in chunks"""
+    ok = add_calculation(db_session, test_user, 'addition', [1.0, 2.0])
+    missing = add_calculation(db_session, test_user, 'subtraction', [5.0, 2.0])
+    stale = add_calculation(db_session, test_user, 'division', [8.0, 2.0])
+    table = Calculation.__table__
+    db_session.execute(update(table).where(table.c.id == missing.id).values(result=None))
+    db_session.execute(update(table).where(table.c.id == stale.id).values(result=99.0))
+    db_session.commit()
+
+    report = check_results(db_session, chunk_size=2)
+    assert (report.checked, report.null, report.stale, report.repaired) == (3, 1, 1, 0)
+
+    report = check_results(db_session, repair=True, chunk_size=2)
+    assert report.repaired == 2
+    db_session.expire_all()
+    assert [db_session.get(Calculation, c.id).result for c in (ok, missing, stale)] == [3.0, 3.0, 4.0]
+    assert check_results(db_session).stale == 0
@@ -1,7 +1,11 @@
 """
 Integration tests for User model with database.
 """
+import asyncio
 import pytest
+from sqlalchemy import func, select
+from app.models.calculation import Calculation
+from app.models.calculation_stats import CalculationStat
 from app.models.user import User
 
 
@@ -72,3 +76,36 @@ def test_invalid_email_format(db_session):
     # Pydantic schema will catch it at API level
     db_session.commit()
     assert user.email == "invalid-email"
+
+
+def test_async_password_methods(db_session):
+    """Test the async password helpers agree with the sync ones"""
+    user = User(username="asyncuser", email="async@example.com")
+    asyncio.run(user.set_password_async("TestPassword123"))
+
+    assert user.verify_password("TestPassword123") is True
+    assert asyncio.run(user.verify_password_async("TestPassword123")) is True
+    assert asyncio.run(user.verify_password_async("WrongPassword")) is False
+
+
+def test_delete_user_deletes_calculations(db_session, test_user):
+    """Test a user's calculations and stats are deleted with them (foreign keys are on in SQLite)"""
+    other = User(username="keeper", email="keeper@example.com", password_hash="x")
+    db_session.add(other)
+    db_session.flush()
+    db_session.add_all([
+        Calculation.create('addition', test_user.id, [1.0, 2.0]),
+        Calculation.create('division', test_user.id, [8.0, 2.0]),
+        Calculation.create('addition', other.id, [1.0, 1.0]),
+    ])
+    db_session.commit()
+
+    db_session.delete(test_user)
+    db_session.commit()
+
+    def count(model, user_id):
+        return db_session.scalar(select(func.count()).select_from(model).where(model.user_id == user_id))
+
+    assert count(Calculation, test_user.id) == 0
+    assert count(CalculationStat, test_user.id) == 0
+    assert count(Calculation, other.id) == 1
@@ -0,0 +1,48 @@
+"""
+Integration tests for the user account routes.
+"""
+from app.models.user import User
+from app.utils.security import PasswordHasherBusy, password_hash_pool
+
+
+def test_register_user(db_client, db_session):
+    """Test registration stores a verifiable bcrypt hash"""
+    response = db_client.post('/users/register', json={
+        'username': 'newuser', 'email': 'new@example.com', 'password': 'Password123',
+    })
+
+    assert response.status_code == 201
+    body = response.json()
+    assert body['username'] == 'newuser'
+    assert 'password_hash' not in body
+    user = db_session.query(User).filter_by(username='newuser').one()
+    assert user.verify_password('Password123') is True
+
+
+def test_register_duplicate_user(db_client, test_user):
+    """Test a taken username or email is rejected"""
+    response = db_client.post('/users/register', json={
+        'username': 'someoneelse', 'email': test_user.email, 'password': 'Password123',
+    })
+    assert response.status_code == 400
+
+
+def test_register_when_hashing_pool_full(db_client, monkeypatch):
+    """Test a saturated hashing pool answers 503 with Retry-After"""
+    def busy(*args):
+        raise PasswordHasherBusy("Too many password hashing requests in progress")
+
+    monkeypatch.setattr(password_hash_pool, 'submit', busy)
+    response = db_client.post('/users/register', json={
+        'username': 'newuser', 'email': 'new@example.com', 'password': 'Password123',
+    })
+
+    assert response.status_code == 503
+    assert response.headers['retry-after'] == '1'
+
+
+def test_hash_pool_stats_endpoint(db_client):
+    """Test the hashing pool reports its counters"""
+    response = db_client.get('/auth/hash-pool')
+    assert response.status_code == 200
+    assert {'workers', 'queued', 'in_flight', 'rejected', 'max_wait_ms'} <= set(response.json())
@@ -0,0 +1,107 @@
+"""
+Unit tests for the calculation result cache.
+"""
+import uuid
+import pytest
+from fastapi.testclient import TestClient
+from app.config import Settings
+from app.models.calculation import Addition, Division
+from app.utils.cache import ResultCache, result_cache
+from main import app
+
+
+def make_cache(**overrides):
+    """Create a cache with generous defaults"""
+    options = {"max_entries": 100, "max_bytes": 1_000_000, "max_inputs": 100}
+    options.update(overrides)
+    return ResultCache(**options)
+
+
+@pytest.fixture(autouse=True)
+def clear_shared_cache(monkeypatch):
+    """Isolate tests that use the shared cache, which is off by default"""
+    monkeypatch.setattr(result_cache, "enabled", True)
+    result_cache.clear()
+    yield
+    result_cache.clear()
+
+
+def test_hit_after_miss():
+    """Test a repeated key is computed once"""
+    cache = make_cache()
+    calls = []
+
+    def compute(inputs):
+        calls.append(inputs)
+        return sum(inputs)
+
+    assert cache.get_or_compute("addition", [1, 2], compute) == 3
+    assert cache.get_or_compute("addition", (1.0, 2.0), compute) == 3
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_operation_is_part_of_key():
+    """Test different operations with the same inputs do not collide"""
+    cache = make_cache()
+    assert cache.get_or_compute("addition", [3, 2], sum) == 5
+    assert cache.get_or_compute("subtraction", [3, 2], lambda v: v[0] - v[1]) == 1
+
+
+def test_lru_eviction_by_entries():
+    """Test the least recently used entry is evicted first"""
+    cache = make_cache(max_entries=2)
+    cache.get_or_compute("addition", [1, 1], sum)
+    cache.get_or_compute("addition", [2, 2], sum)
+    cache.get_or_compute("addition", [1, 1], sum)  # refresh [1, 1]
+    cache.get_or_compute("addition", [3, 3], sum)  # evicts [2, 2]
+
+    assert cache.stats()["evictions"] == 1
+    cache.get_or_compute("addition", [1, 1], sum)
+    assert cache.stats()["hits"] == 2
+
+
+def test_eviction_by_memory_ceiling():
+    """Test entries are evicted to stay under max_bytes"""
+    cache = make_cache(max_bytes=1000)
+    for i in range(20):
+        cache.get_or_compute("addition", [i, i, i, i], sum)
+
+    stats = cache.stats()
+    assert 0 < stats["bytes"] <= 1000
+    assert stats["evictions"] == 20 - stats["entries"]
+
+
+def test_long_inputs_not_cached():
+    """Test inputs above max_inputs bypass the cache"""
+    cache = make_cache(max_inputs=3)
+    cache.get_or_compute("addition", [1, 2, 3, 4], sum)
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["misses"] == 0
+
+
+def test_errors_not_cached():
+    """Test a failing computation is retried on the next call"""
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Cannot divide by zero"):
+            Division(user_id=uuid.uuid4(), inputs=[1.0, 0.0]).get_result()
+    assert result_cache.stats()["entries"] == 0
+    assert result_cache.stats()["misses"] == 2
+
+
+def test_disabled_by_default():
+    """Test the shared cache is off unless RESULT_CACHE_ENABLED is set"""
+    assert Settings().RESULT_CACHE_ENABLED is False
+
+
+def test_models_and_routes_share_cache():
+    """Test a model result is reused by the matching route"""
+    Addition(user_id=uuid.uuid4(), inputs=[4.0, 5.0]).get_result()
+    with TestClient(app) as client:
+        response = client.post('/add', json={'a': 4, 'b': 5})
+        stats = client.get('/cache/stats').json()
+
+    assert response.json()['result'] == 9
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
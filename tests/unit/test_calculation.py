@@ -11,7 +11,8 @@ from app.models.calculation import (
     Addition,
     Subtraction,
     Multiplication,
-    Division
+    Division,
+    Expression
 )
 
 
@@ -47,6 +48,13 @@ class TestCalculationFactory:
         assert isinstance(calc, Division)
         assert calc.type == 'division'
     
+    def test_create_expression(self):
+        """Test creating an expression calculation"""
+        user_id = uuid.uuid4()
+        calc = Calculation.create('expression', user_id, {'expression': 'a * b', 'variables': {'a': 2, 'b': 3}})
+        assert isinstance(calc, Expression)
+        assert calc.type == 'expression'
+
     def test_create_invalid_type(self):
         """Test creating calculation with invalid type raises error"""
         user_id = uuid.uuid4()
@@ -89,6 +97,12 @@ class TestAddition:
         calc = Addition(user_id=user_id, inputs=[1.5, 2.3, 3.7])
         assert calc.get_result() == pytest.approx(7.5)
     
+    def test_addition_large_magnitudes(self):
+        """Test addition keeps small terms next to large ones"""
+        user_id = uuid.uuid4()
+        calc = Addition(user_id=user_id, inputs=[1e16, 1.0, -1e16])
+        assert calc.get_result() == 1.0
+
     def test_addition_invalid_inputs_not_list(self):
         """Test addition with non-list inputs raises error"""
         user_id = uuid.uuid4()
@@ -229,6 +243,37 @@ class TestDivision:
             calc.get_result()
 
 
+class TestExpression:
+    """Test Expression calculation logic"""
+
+    def test_expression_with_variables(self):
+        """Test evaluating a formula with named variables"""
+        user_id = uuid.uuid4()
+        inputs = {'expression': '(a + b) * c / d', 'variables': {'a': 1.0, 'b': 2.0, 'c': 4.0, 'd': 3.0}}
+        calc = Expression(user_id=user_id, inputs=inputs)
+        assert calc.get_result() == 4.0
+
+    def test_expression_without_variables(self):
+        """Test a constant formula needs no variables entry"""
+        user_id = uuid.uuid4()
+        calc = Expression(user_id=user_id, inputs={'expression': '1 + 2 * 3'})
+        assert calc.get_result() == 7.0
+
+    def test_expression_list_inputs_rejected(self):
+        """Test a list of numbers is not valid expression input"""
+        user_id = uuid.uuid4()
+        calc = Expression(user_id=user_id, inputs=[1.0, 2.0])
+        with pytest.raises(ValueError, match="expression and variables"):
+            calc.get_result()
+
+    def test_expression_division_by_zero(self):
+        """Test division by zero in a formula raises ValueError"""
+        user_id = uuid.uuid4()
+        calc = Expression(user_id=user_id, inputs={'expression': 'a / b', 'variables': {'a': 1.0, 'b': 0.0}})
+        with pytest.raises(ValueError, match="Cannot divide by zero"):
+            calc.get_result()
+
+
 class TestCalculationModel:
     """Test general Calculation model behavior"""
     
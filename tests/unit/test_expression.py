@@ -0,0 +1,100 @@
+"""
+Unit tests for expression parsing, compiling and evaluation.
+"""
+import pytest
+from app.operations import expression
+from app.operations.expression import ExpressionError, compile_expression
+
+
+@pytest.mark.parametrize("source, values, expected", [
+    ("(a + b) * c / d", {"a": 1, "b": 2, "c": 4, "d": 3}, 4.0),
+    ("a + b * c", {"a": 1, "b": 2, "c": 3}, 7.0),
+    ("a - b - c", {"a": 10, "b": 3, "c": 2}, 5.0),
+    ("a / b / c", {"a": 24, "b": 2, "c": 3}, 4.0),
+    ("-a - -b", {"a": 1, "b": 2}, 1.0),
+    ("2.5e1 + .5", {}, 25.5),
+])
+def test_evaluate(source, values, expected):
+    """Test precedence, left-to-right evaluation, unary minus and number formats"""
+    assert compile_expression(source).evaluate(values) == expected
+
+
+def test_variables_in_order_of_appearance():
+    """Test a compiled expression lists each variable once"""
+    assert compile_expression("rate * (x + rate) - y").variables == ("rate", "x", "y")
+
+
+@pytest.mark.parametrize("source, message", [
+    ("", "empty"),
+    ("a +", "ends unexpectedly"),
+    ("(a + b", "Missing closing parenthesis"),
+    ("a b", "Unexpected 'b'"),
+    ("a ** b", "Unexpected '\\*'"),
+    ("__import__('os')", "Unexpected character"),
+    ("(" * 60 + "1" + ")" * 60, "nests deeper"),
+    ("a" + " + a" * 300, "longer than"),
+])
+def test_malformed_expressions_rejected(source, message):
+    """Test malformed, unsafe or oversized formulas raise ExpressionError"""
+    with pytest.raises(ExpressionError, match=message):
+        compile_expression(source)
+
+
+def test_long_flat_expression():
+    """Test long runs of one operator evaluate without deep recursion"""
+    assert compile_expression(" + ".join(["a"] * 240)).evaluate({"a": 0.5}) == 120.0
+
+
+def test_missing_variable():
+    """Test evaluating without a value for every variable"""
+    with pytest.raises(ExpressionError, match="No value for variable\\(s\\): c"):
+        compile_expression("a + b + c").evaluate({"a": 1, "b": 2})
+
+
+def test_divide_by_zero():
+    """Test scalar division by zero raises like divide()"""
+    with pytest.raises(ValueError, match="Cannot divide by zero"):
+        compile_expression("a / (b - b)").evaluate({"a": 1, "b": 2})
+
+
+def test_compiled_expressions_are_cached():
+    """Test the same source text is parsed once"""
+    compile_expression.cache_clear()
+    first = compile_expression("x * y + 1")
+    assert compile_expression("x * y + 1") is first
+    assert expression.expression_cache_stats()["hits"] == 1
+    assert expression.expression_cache_stats()["misses"] == 1
+
+
+def test_evaluate_columns():
+    """Test column evaluation matches per-row evaluation and masks zero divisors"""
+    compiled = compile_expression("(a + b) / c")
+    columns = {"a": [1, 2, 3], "b": [1, 2, 3], "c": [2, 0, 4]}
+    results, error_mask = compiled.evaluate_columns(columns)
+    assert results == [1.0, None, 1.5]
+    assert error_mask == [False, True, False]
+
+
+def test_evaluate_columns_constant_division_by_zero():
+    """Test a zero divisor that does not depend on the row fails every row"""
+    assert compile_expression("a / 0").evaluate_columns({"a": [1, 2]}) == ([None, None], [True, True])
+
+
+def test_evaluate_columns_without_variables():
+    """Test a constant formula evaluates as one row"""
+    assert compile_expression("6 * 7").evaluate_columns({}) == ([42.0], [False])
+
+
+def test_evaluate_columns_length_mismatch():
+    """Test columns of different lengths are rejected"""
+    with pytest.raises(ExpressionError, match="same length"):
+        compile_expression("a + b").evaluate_columns({"a": [1, 2], "b": [3]})
+
+
+def test_evaluate_columns_python_fallback(monkeypatch):
+    """Test the pure-Python path gives the same results without NumPy"""
+    compiled = compile_expression("a * b - a / b")
+    columns = {"a": [4.0, 1.0, -3.0], "b": [2.0, 0.0, 0.5]}
+    expected = compiled.evaluate_columns(columns)
+    monkeypatch.setattr(expression, "np", None)
+    assert compiled.evaluate_columns(columns) == expected == ([6.0, None, 4.5], [False, True, False])
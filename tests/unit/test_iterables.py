@@ -0,0 +1,23 @@
+"""
+Unit tests for iterable helpers.
+"""
+from app.utils.iterables import chunked
+
+
+def test_chunked():
+    """Test items are split into lists of at most size, the last one shorter"""
+    assert list(chunked(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(chunked([], 3)) == []
+
+
+def test_chunked_is_lazy():
+    """Test only the items of the current chunk are consumed"""
+    consumed = []
+
+    def items():
+        for i in range(10):
+            consumed.append(i)
+            yield i
+
+    assert next(chunked(items(), 4)) == [0, 1, 2, 3]
+    assert consumed == [0, 1, 2, 3]
@@ -0,0 +1,109 @@
+"""
+Unit tests for the queue-based JSON logging pipeline.
+"""
+import io
+import json
+import logging
+import queue
+import sys
+import pytest
+from fastapi.testclient import TestClient
+from app.config import Settings
+from app.utils.logging_config import (
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    RateLimitFilter,
+    configure_logging,
+    shutdown_logging,
+)
+from main import app
+
+
+def make_record(msg="Cannot divide by %s", args=(0,), level=logging.WARNING, **extra):
+    record = logging.LogRecord("calc", level, "main.py", 10, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+@pytest.fixture
+def restore_logging():
+    """Reinstall the default pipeline after a test replaces it"""
+    yield
+    configure_logging()
+
+
+def test_json_formatter_fields():
+    """Test records become one JSON object with extras included"""
+    entry = json.loads(JsonFormatter().format(make_record(status_code=400)))
+
+    assert entry["level"] == "WARNING"
+    assert entry["logger"] == "calc"
+    assert entry["message"] == "Cannot divide by 0"
+    assert entry["status_code"] == 400
+    assert entry["time"].endswith("+00:00")
+
+
+def test_json_formatter_exception():
+    """Test exception tracebacks are included as text"""
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.LogRecord("calc", logging.ERROR, "main.py", 1, "failed", (), sys.exc_info())
+    assert "ValueError: boom" in json.loads(JsonFormatter().format(record))["exc_info"]
+
+
+def test_rate_limit_per_call_site():
+    """Test repeats beyond the burst are dropped and reported after the window"""
+    now = [0.0]
+    rate_limit = RateLimitFilter(burst=2, window=10, clock=lambda: now[0])
+
+    passed = [rate_limit.filter(make_record(args=(i,))) for i in range(5)]
+    assert passed == [True, True, False, False, False]
+    assert rate_limit.filter(make_record(msg="other message")) is True
+
+    now[0] = 10.0
+    record = make_record()
+    assert rate_limit.filter(record) is True
+    assert record.suppressed == 3
+    assert rate_limit.suppressed == 3
+
+
+def test_rate_limit_disabled():
+    """Test a burst of 0 lets everything through"""
+    rate_limit = RateLimitFilter(burst=0, window=10)
+    assert all(rate_limit.filter(make_record()) for _ in range(100))
+
+
+def test_queue_handler_defers_formatting_and_drops_when_full():
+    """Test records are queued unformatted and overflow is counted"""
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    first, second = make_record(), make_record()
+    handler.handle(first)
+    handler.handle(second)
+
+    queued = handler.queue.get_nowait()
+    assert queued is first
+    assert (queued.msg, queued.args) == ("Cannot divide by %s", (0,))
+    assert handler.dropped == 1
+
+
+def test_configure_logging_writes_json(restore_logging):
+    """Test the installed pipeline writes JSON lines from its listener thread"""
+    stream = io.StringIO()
+    configure_logging(Settings(LOG_FORMAT="json", LOG_RATE_LIMIT_BURST=1), stream=stream)
+
+    for _ in range(3):
+        logging.getLogger("calc.test").warning("repeated %s", "error")
+    shutdown_logging()
+
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])["message"] == "repeated error"
+
+
+def test_logging_stats_endpoint():
+    """Test the pipeline reports its counters"""
+    with TestClient(app) as client:
+        response = client.get('/logging/stats')
+    assert response.status_code == 200
+    assert set(response.json()) == {"queued", "dropped", "suppressed"}
@@ -0,0 +1,76 @@
+"""
+Unit tests for connection pool sizing and telemetry.
+"""
+import pytest
+from sqlalchemy import create_engine, exc, text
+from fastapi.testclient import TestClient
+from app.config import Settings
+from app.database import engine_options, pool_sizing
+from app.utils.pool_stats import InstrumentedQueuePool, pool_status
+from main import app
+
+
+def test_pool_sizing_defaults():
+    """Test configured pool size and overflow are used without a budget"""
+    config = Settings(DB_POOL_SIZE=7, DB_MAX_OVERFLOW=3)
+    assert pool_sizing(config) == (7, 3)
+
+
+def test_pool_sizing_from_connection_budget():
+    """Test the budget is split across workers and engines"""
+    config = Settings(DB_MAX_CONNECTIONS=100, WEB_CONCURRENCY=4)
+    pool_size, max_overflow = pool_sizing(config)
+    assert (pool_size, max_overflow) == (6, 6)
+    assert (pool_size + max_overflow) * 4 * 2 <= 100
+
+
+def test_pool_sizing_budget_too_small():
+    """Test a budget smaller than one connection per engine is rejected"""
+    with pytest.raises(ValueError, match="too small"):
+        pool_sizing(Settings(DB_MAX_CONNECTIONS=4, WEB_CONCURRENCY=4))
+
+
+def test_engine_options_postgresql():
+    """Test PostgreSQL engines get the instrumented pool and settings"""
+    config = Settings(DB_POOL_TIMEOUT=5, DB_POOL_RECYCLE=60, DB_POOL_PRE_PING=False)
+    options = engine_options("postgresql://u:p@db/app", config)
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_timeout"] == 5
+    assert options["pool_recycle"] == 60
+    assert options["pool_pre_ping"] is False
+
+
+def test_engine_options_sqlite():
+    """Test SQLite keeps SQLAlchemy's default pool"""
+    assert engine_options("sqlite:///./test.db") == {}
+
+
+def test_instrumented_pool_records_checkouts_and_timeouts(tmp_path):
+    """Test checkouts, waits and timeouts are counted"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.01,
+    )
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+        status = pool_status(engine.pool)
+        assert status["checked_out"] == 1
+
+    status = pool_status(engine.pool)
+    assert status["checkouts"] == 1
+    assert status["timeouts"] == 1
+    assert status["waits"] == 1
+    assert status["checked_out"] == 0
+    assert sum(status["checkout_latency_histogram"].values()) == 1
+    engine.dispose()
+
+
+def test_pool_stats_endpoint():
+    """Test the pool stats endpoint reports both engines"""
+    with TestClient(app) as client:
+        response = client.get('/db/pool')
+    assert response.status_code == 200
+    assert set(response.json()) == {"sync", "async"}
+    assert "checked_out" in response.json()["sync"]
@@ -0,0 +1,94 @@
+"""
+Unit tests for the cached readiness check.
+"""
+import asyncio
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.services.readiness import ReadinessCheck
+
+
+class Clock:
+    """Manually advanced monotonic clock"""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path):
+    return create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'ready.db'}")
+
+
+def test_ready_result_is_cached(sqlite_engine):
+    """Test probes within the ttl reuse one database check"""
+    clock = Clock()
+    check = ReadinessCheck(sqlite_engine, ttl=2.0, clock=clock)
+
+    async def scenario():
+        first = await check.status()
+        clock.now = 1.0
+        second = await check.status()
+        clock.now = 2.5
+        await check.status()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first["ready"] is True
+    assert first["database"] == "ok"
+    assert second["age_seconds"] == 1.0
+    assert check.probes == 2
+
+
+def test_concurrent_probes_share_one_check(sqlite_engine):
+    """Test a burst of probes after expiry runs the check once"""
+    check = ReadinessCheck(sqlite_engine, ttl=60)
+
+    async def scenario():
+        return await asyncio.gather(*(check.status() for _ in range(20)))
+
+    results = asyncio.run(scenario())
+    assert all(result["ready"] for result in results)
+    assert check.probes == 1
+
+
+def test_unreachable_database_not_ready(tmp_path):
+    """Test connection errors report not ready"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'ready.db'}")
+    result = asyncio.run(ReadinessCheck(engine).status())
+
+    assert result["ready"] is False
+    assert result["database"] == "unavailable"
+
+
+def test_slow_database_times_out(sqlite_engine, monkeypatch):
+    """Test the check is bounded by its timeout"""
+    check = ReadinessCheck(sqlite_engine, timeout=0.01)
+
+    async def slow_ping():
+        await asyncio.sleep(1)
+    monkeypatch.setattr(check, "_ping", slow_ping)
+
+    result = asyncio.run(check.status())
+    assert result["ready"] is False
+    assert result["reason"] == "Database check timed out"
+
+
+def test_saturated_pool_skips_database(tmp_path):
+    """Test a fully checked-out pool reports not ready without waiting for a connection"""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'ready.db'}",
+        poolclass=AsyncAdaptedQueuePool, pool_size=1, max_overflow=0, pool_timeout=5,
+    )
+    check = ReadinessCheck(engine, timeout=10)
+
+    async def scenario():
+        async with engine.connect():
+            return await check.status()
+
+    result = asyncio.run(scenario())
+    assert result["ready"] is False
+    assert result["database"] == "skipped"
+    assert result["pool_saturation"]["async"] == 1.0
@@ -0,0 +1,30 @@
+"""
+Unit tests for the operation registry.
+"""
+from typing import get_args
+from app.models.calculation import CALCULATION_CLASSES, Addition, Division
+from app.operations import add, divide
+from app.operations.registry import OPERATIONS, OPERATIONS_BY_TYPE
+from app.schemas.calculation import ArithmeticType, CalculationType
+
+
+def test_registry_entries():
+    """Test each operation maps to its function, type and model"""
+    assert OPERATIONS['add'].function is add
+    assert OPERATIONS['add'].model is Addition
+    assert OPERATIONS['divide'].calculation_type == 'division'
+    assert OPERATIONS_BY_TYPE['division'].function is divide
+
+
+def test_registry_matches_schema_and_models():
+    """Test the registry covers every arithmetic type exactly once and every type has a model"""
+    types = sorted(operation.calculation_type for operation in OPERATIONS.values())
+    assert types == sorted(get_args(ArithmeticType))
+    assert sorted(get_args(CalculationType)) == sorted(CALCULATION_CLASSES)
+    assert 'expression' in CALCULATION_CLASSES
+
+
+def test_compute_pair():
+    """Test compute applies the operation to an (a, b) pair"""
+    assert OPERATIONS['subtract'].compute((10.0, 4.0)) == 6.0
+    assert OPERATIONS_BY_TYPE['division'].model is Division
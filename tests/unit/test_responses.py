@@ -0,0 +1,51 @@
+"""
+Unit tests for the fast JSON response helpers.
+"""
+import json
+import uuid
+from datetime import datetime
+from fastapi.responses import JSONResponse
+from app.config import settings
+from app.schemas.calculation import CalculationPage, CalculationRead
+from app.utils.responses import FastJSONResponse, ModelResponse, default_response_class, model_response
+
+
+def make_page(rows=3):
+    """A history page with UUIDs and datetimes on every row"""
+    user_id = uuid.uuid4()
+    return CalculationPage(next_cursor="abc", items=[
+        CalculationRead(
+            id=uuid.uuid4(), user_id=user_id, type='addition', inputs=[float(i), 1.0], result=i + 1.0,
+            created_at=datetime(2025, 1, 1, 12, 0, i), updated_at=datetime(2025, 1, 1, 12, 0, i),
+        )
+        for i in range(rows)
+    ])
+
+
+def test_model_response_matches_default_encoding():
+    """Test pydantic-core output decodes to what FastAPI would send"""
+    page = make_page()
+    response = ModelResponse(page)
+
+    assert response.media_type == 'application/json'
+    assert json.loads(response.body) == page.model_dump(mode='json')
+
+
+def test_fast_json_response_encodes_like_json_response():
+    """Test the orjson-backed class produces equivalent JSON"""
+    content = make_page().model_dump(mode='json')
+    assert json.loads(FastJSONResponse(content).body) == json.loads(JSONResponse(content).body)
+
+
+def test_model_response_is_opt_in(monkeypatch):
+    """Test models pass through unchanged unless FAST_JSON_RESPONSES is set"""
+    page = make_page(1)
+    monkeypatch.setattr(settings, 'FAST_JSON_RESPONSES', False)
+    assert model_response(page) is page
+    assert default_response_class() is JSONResponse
+
+    monkeypatch.setattr(settings, 'FAST_JSON_RESPONSES', True)
+    response = model_response(page, status_code=201)
+    assert isinstance(response, ModelResponse)
+    assert response.status_code == 201
+    assert default_response_class() is FastJSONResponse
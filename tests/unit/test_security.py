@@ -1,8 +1,23 @@
 """
 Unit tests for password hashing functions.
 """
+import asyncio
+import threading
+import time
+import bcrypt
 import pytest
-from app.utils.security import hash_password, verify_password
+from app.config import Settings
+from app.utils.security import (
+    PasswordHasher,
+    PasswordHashPool,
+    PasswordHasherBusy,
+    hash_password,
+    calibrate_rounds,
+    hash_password_async,
+    hash_rounds,
+    verify_password,
+    verify_password_async,
+)
 
 
 def test_hash_password():
@@ -41,3 +56,116 @@ def test_different_passwords_different_hashes():
     assert hash1 != hash2
     assert verify_password(password, hash1) is True
     assert verify_password(password, hash2) is True
+
+
+def test_async_hash_and_verify():
+    """Test the async variants produce and check ordinary bcrypt hashes"""
+    async def roundtrip():
+        hashed = await hash_password_async("TestPassword123")
+        return hashed, await verify_password_async("TestPassword123", hashed)
+
+    hashed, ok = asyncio.run(roundtrip())
+    assert ok is True
+    assert verify_password("TestPassword123", hashed) is True
+
+
+def test_hash_pool_caps_concurrency_and_queue():
+    """Test calls beyond workers + max_queue are rejected and counted"""
+    pool = PasswordHashPool(workers=1, max_queue=1)
+    release = threading.Event()
+    try:
+        running = pool.submit(release.wait)
+        waiting = pool.submit(lambda: "done")
+        with pytest.raises(PasswordHasherBusy):
+            pool.submit(lambda: "rejected")
+
+        stats = pool.stats()
+        assert stats["in_flight"] + stats["queued"] == 2
+        assert stats["rejected"] == 1
+
+        release.set()
+        assert running.result(timeout=5) is True
+        assert waiting.result(timeout=5) == "done"
+        stats = pool.stats()
+        assert (stats["queued"], stats["in_flight"], stats["completed"]) == (0, 0, 2)
+        assert stats["peak_queued"] >= 1
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_hash_pool_does_not_block_event_loop():
+    """Test other coroutines keep running while a hash is in progress"""
+    pool = PasswordHashPool(workers=1, max_queue=0)
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        task = asyncio.create_task(ticker())
+        await pool.run(time.sleep, 0.1)
+        task.cancel()
+        return ticks
+
+    try:
+        assert asyncio.run(scenario()) > 10
+    finally:
+        pool.shutdown()
+
+
+def test_hash_pool_rejects_bad_sizes():
+    """Test the pool needs at least one worker"""
+    with pytest.raises(ValueError, match="workers"):
+        PasswordHashPool(workers=0, max_queue=1)
+
+
+def test_hash_rounds():
+    """Test the cost is read from a bcrypt hash"""
+    assert hash_rounds(bcrypt.hashpw(b"x", bcrypt.gensalt(rounds=5)).decode()) == 5
+    assert hash_rounds("not-a-hash") is None
+
+
+def fake_timer(step):
+    """A clock that advances step seconds per reading, so every hash takes step"""
+    now = [0.0]
+
+    def timer():
+        now[0] += step
+        return now[0]
+    return timer
+
+
+def test_calibrate_rounds_picks_highest_cost_under_target():
+    """Test each extra round is assumed to double the time"""
+    # 10 ms at cost 4: 5 -> 20 ms, 6 -> 40 ms, 7 -> 80 ms, 8 -> 160 ms
+    assert calibrate_rounds(100, 4, 31, timer=fake_timer(0.010)) == 7
+    assert calibrate_rounds(100, 4, 6, timer=fake_timer(0.010)) == 6
+
+
+def test_calibrate_rounds_keeps_minimum_on_slow_hosts():
+    """Test the minimum cost is a floor even above the target"""
+    assert calibrate_rounds(1, 4, 8, timer=fake_timer(0.010)) == 4
+
+
+def test_calibrate_rounds_rejects_bad_range():
+    """Test impossible round ranges are rejected"""
+    with pytest.raises(ValueError, match="rounds"):
+        calibrate_rounds(100, 8, 6)
+
+
+def test_hasher_pinned_rounds_and_rehash():
+    """Test BCRYPT_ROUNDS pins the cost and lower-cost hashes need a rehash"""
+    hasher = PasswordHasher()
+    assert hasher.calibrate(Settings(BCRYPT_ROUNDS=5)) == 5
+    old_hash = PasswordHasher(rounds=4).hash("TestPassword123")
+    new_hash = hasher.hash("TestPassword123")
+
+    assert hash_rounds(new_hash) == 5
+    assert hasher.needs_rehash(old_hash) is True
+    assert hasher.needs_rehash(new_hash) is False
+    assert hasher.verify("TestPassword123", old_hash) is True
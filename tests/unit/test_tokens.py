@@ -0,0 +1,94 @@
+"""
+Unit tests for JWT access tokens and the verified-token cache.
+"""
+import time
+import uuid
+from datetime import timedelta
+import jwt
+import pytest
+from app.config import settings
+from app.utils.tokens import (
+    InvalidTokenError,
+    VerifiedTokenCache,
+    create_access_token,
+    decode_access_token,
+)
+
+
+def test_token_roundtrip():
+    """Test a fresh token decodes to its user id"""
+    user_id = uuid.uuid4()
+    token, expires_at = create_access_token(user_id)
+
+    claims = decode_access_token(token)
+    assert claims["sub"] == user_id
+    assert claims["exp"] == int(expires_at.timestamp())
+
+
+def test_expired_token_rejected():
+    """Test tokens past exp are rejected"""
+    token, _ = create_access_token(uuid.uuid4(), expires_delta=timedelta(seconds=-1))
+    with pytest.raises(InvalidTokenError):
+        decode_access_token(token)
+
+
+def test_wrongly_signed_token_rejected():
+    """Test tokens signed with another key are rejected"""
+    token = jwt.encode({"sub": str(uuid.uuid4()), "exp": time.time() + 60}, "other-key", algorithm=settings.ALGORITHM)
+    with pytest.raises(InvalidTokenError):
+        decode_access_token(token)
+
+
+def test_token_without_valid_subject_rejected():
+    """Test a token whose sub is not a user id is rejected"""
+    token = jwt.encode({"sub": "admin", "exp": time.time() + 60}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    with pytest.raises(InvalidTokenError):
+        decode_access_token(token)
+
+
+def test_cache_entry_expires_with_token():
+    """Test the cache never outlives the token's exp"""
+    cache = VerifiedTokenCache(max_entries=10, ttl=3600)
+    claims = {"sub": uuid.uuid4(), "exp": 1010}
+    cache.put("token", claims, "user", now=1000)
+
+    assert cache.get("token", now=1009) == (claims, "user")
+    assert cache.get("token", now=1010) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_cache_entry_expires_with_ttl():
+    """Test the ttl bounds entries of long-lived tokens"""
+    cache = VerifiedTokenCache(max_entries=10, ttl=60)
+    cache.put("token", {"sub": uuid.uuid4(), "exp": 100_000}, "user", now=1000)
+
+    assert cache.get("token", now=1059) is not None
+    assert cache.get("token", now=1060) is None
+
+
+def test_cache_evicts_least_recently_used():
+    """Test the entry ceiling evicts the oldest token"""
+    cache = VerifiedTokenCache(max_entries=2, ttl=60)
+    for token in ("a", "b"):
+        cache.put(token, {"sub": uuid.uuid4(), "exp": 100_000}, token, now=0)
+    cache.get("a", now=1)
+    cache.put("c", {"sub": uuid.uuid4(), "exp": 100_000}, "c", now=1)
+
+    assert cache.get("b", now=2) is None
+    assert cache.get("a", now=2) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_invalidate_user():
+    """Test all tokens of one user can be dropped"""
+    cache = VerifiedTokenCache(max_entries=10, ttl=60)
+    user_id, other_id = uuid.uuid4(), uuid.uuid4()
+    cache.put("a", {"sub": user_id, "exp": 100_000}, "u", now=0)
+    cache.put("b", {"sub": user_id, "exp": 100_000}, "u", now=0)
+    cache.put("c", {"sub": other_id, "exp": 100_000}, "o", now=0)
+
+    cache.invalidate_user(user_id)
+
+    assert cache.get("a", now=1) is None
+    assert cache.get("b", now=1) is None
+    assert cache.get("c", now=1) is not None
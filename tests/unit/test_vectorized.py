@@ -0,0 +1,91 @@
+"""
+Unit tests for vectorized batch evaluation.
+"""
+import numpy as np
+import pytest
+from app.operations import vectorized
+from app.operations.vectorized import (
+    evaluate_batch,
+    sum_inputs,
+    subtract_inputs,
+    multiply_inputs,
+    divide_inputs,
+)
+
+
+def test_evaluate_batch_all_operations():
+    """Test each operation matches its scalar function"""
+    results, error_mask = evaluate_batch(
+        ["add", "subtract", "multiply", "divide"],
+        [10, 10, 10, 10],
+        [5, 5, 5, 4],
+    )
+    assert results == [15.0, 5.0, 50.0, 2.5]
+    assert error_mask == [False, False, False, False]
+
+
+def test_evaluate_batch_divide_by_zero_masked():
+    """Test division by zero only fails its own row"""
+    results, error_mask = evaluate_batch(["divide", "add", "divide"], [1, 2, 0], [0, 3, 0])
+    assert results == [None, 5.0, None]
+    assert error_mask == [True, False, True]
+
+
+def test_evaluate_batch_empty():
+    """Test an empty batch"""
+    assert evaluate_batch([], [], []) == ([], [])
+
+
+def test_evaluate_batch_length_mismatch():
+    """Test columns of different lengths are rejected"""
+    with pytest.raises(ValueError, match="same length"):
+        evaluate_batch(["add"], [1, 2], [3])
+
+
+def test_evaluate_batch_unknown_operation():
+    """Test unknown operation names are rejected"""
+    with pytest.raises(ValueError, match="Unsupported operation"):
+        evaluate_batch(["power"], [2], [3])
+
+
+def test_evaluate_batch_python_fallback(monkeypatch):
+    """Test the pure-Python path gives the same results as NumPy"""
+    ops = ["add", "subtract", "multiply", "divide", "divide"]
+    a = [1.5, -2.0, 3.0, 7.0, 1.0]
+    b = [2.5, 4.0, -1.5, 2.0, 0.0]
+    expected = evaluate_batch(ops, a, b)
+
+    monkeypatch.setattr(vectorized, "np", None)
+    assert evaluate_batch(ops, a, b) == expected
+
+
+def test_sum_inputs_is_correctly_rounded():
+    """Test compensated summation does not lose small terms"""
+    assert sum_inputs([1e16, 1.0, -1e16]) == 1.0
+    assert sum_inputs([0.1] * 10) == 1.0
+
+
+def test_subtract_inputs_is_correctly_rounded():
+    """Test compensated subtraction does not lose small terms"""
+    assert subtract_inputs([1e16, -1.0, 1e16]) == 1.0
+    assert subtract_inputs([1.0, 0.1, 0.2]) == 0.7
+
+
+def test_divide_inputs_overflowing_divisor_product():
+    """Test division falls back to the sequential fold when the divisor product overflows"""
+    assert divide_inputs([1e300, 1e200, 1e200]) == pytest.approx(1e-100)
+
+
+def test_divide_inputs_by_zero():
+    """Test division by zero raises for lists and arrays"""
+    with pytest.raises(ValueError, match="Cannot divide by zero"):
+        divide_inputs([1.0, 2.0, 0.0])
+    with pytest.raises(ValueError, match="Cannot divide by zero"):
+        divide_inputs(np.array([1.0, 2.0, 0.0]))
+
+
+@pytest.mark.parametrize("fold", [sum_inputs, subtract_inputs, multiply_inputs, divide_inputs])
+def test_folds_accept_arrays(fold):
+    """Test NumPy arrays give the same results as lists"""
+    values = [24.0, 2.0, 3.0, 0.5]
+    assert fold(np.array(values)) == pytest.approx(fold(values))